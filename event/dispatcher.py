@@ -18,12 +18,12 @@
 import os
 import logging
 import pygame
-import time
 
 from util.config import *
 from util.keys import *
 from event.gpiobutton import GpioButton
 from event.i2cbuttons import I2CButtons
+from event.scheduler import InputWatcher
 
 # Maps IR remote control keys to keyboard keys
 lirc_keyboard_map = {"options": pygame.K_m,
@@ -74,6 +74,8 @@ class EventDispatcher(object):
         """
         self.screensaver_dispatcher = screensaver_dispatcher
         self.config = util.config
+        self.compositor = util.compositor
+        self.scheduler = util.scheduler
         self.volume_control = volume_control
         self.frame_rate = self.config[SCREEN_INFO][FRAME_RATE]
         self.screen_width = self.config[SCREEN_INFO][WIDTH]
@@ -96,7 +98,8 @@ class EventDispatcher(object):
         self.mts_state = [False for _ in range(10)]
         self.move_enabled = False
         self.poweroff_flag = 0
-        self.frame_refresh_period = 1 / self.frame_rate
+        self.input_watcher = None
+        self.poll_lirc = False
 
     def set_current_screen(self, current_screen):
         """ Set current screen. 
@@ -314,10 +317,12 @@ class EventDispatcher(object):
         if not self.screensaver_was_running:
             self.current_screen.handle_event(event)
 
-    def handle_single_touch(self):
-        """ Handle single touch events """
-        
-        events = pygame.event.get()
+    def handle_single_touch(self, events=[]):
+        """ Handle single touch events
+
+        :param events: events received while waiting for the next frame
+        """
+        events = events + pygame.event.get()
 
         for event in events:
             source = getattr(event, "source", None)
@@ -362,8 +367,11 @@ class EventDispatcher(object):
         event.button = 1
         return event
 
-    def handle_multi_touch(self):
-        """ Handle multi-touch events """
+    def handle_multi_touch(self, events=[]):
+        """ Handle multi-touch events
+
+        :param events: events received while waiting for the next frame
+        """
 
         for touch in self.multi_touch_screen.poll():
             if self.mts_state[touch.slot] != touch.valid:
@@ -378,7 +386,10 @@ class EventDispatcher(object):
                 if self.move_enabled and touch.valid: # move
                     self.handle_event(self.get_event(pygame.MOUSEMOTION, touch.x, touch.y))
 
-        for event in pygame.event.get():
+        if self.multi_touch_screen.has_pending_events():
+            self.scheduler.request_frame()
+
+        for event in events + pygame.event.get():
             s = str(event)
             source = getattr(event, "source", None)
 
@@ -463,10 +474,32 @@ class EventDispatcher(object):
         else:
             return handler
 
+    def start_input_watcher(self):
+        """ Start thread which wakes up the main loop when LIRC or multi-touch screen have data.
+        LIRC connection without file descriptor is polled on every frame.
+        """
+        files = []
+
+        if self.lirc != None:
+            if getattr(self.lirc, "fileno", None) != None:
+                files.append(self.lirc)
+            else:
+                self.poll_lirc = True
+
+        if self.multi_touch_screen != None:
+            files.append(self.multi_touch_screen)
+
+        if files:
+            self.input_watcher = InputWatcher(self.scheduler, files)
+            self.input_watcher.start()
+
     def dispatch(self, player, shutdown):
         """ Dispatch events.  
               
         Runs the main event loop. Redirects events to corresponding handler.
+        The loop sleeps until the next input event, deadline (e.g. screensaver start)
+        or redraw request instead of polling with the fixed frame rate.
+        Animations and running screensaver are refreshed with the configured frame rate.
         Distinguishes four types of events:
         - Quit event - when user closes window (Windows only)
         - Keyboard events
@@ -479,26 +512,40 @@ class EventDispatcher(object):
         self.player = player
         self.shutdown = shutdown
         handler = self.get_handler()
+        self.start_input_watcher()
         pygame.event.clear()
+        self.compositor.start()
+        events = []
 
         while self.run_dispatcher:
-            handler()
+            handler(events)
             if self.lirc != None:
                 code = self.lirc.readline()
                 if code != None:
                     self.handle_lirc_event(code)
+                    self.scheduler.request_frame()
+            if self.input_watcher != None:
+                self.input_watcher.set_consumed()
 
             area = self.screensaver_dispatcher.refresh()
             if self.screensaver_dispatcher.saver_running:
                 if area:
-                    pygame.display.update(area)
+                    self.compositor.add_damage(area)
                 else:
                     areas = self.screensaver_dispatcher.update()
                     if areas:
-                        pygame.display.update(areas)
+                        self.compositor.add_damage(areas)
             else:
                 area = self.current_screen.refresh()
                 if area:
                     self.current_screen.clean_draw_update(area)
 
-            time.sleep(self.frame_refresh_period)
+            updated = self.compositor.flush()
+            if updated or self.screensaver_dispatcher.saver_running or self.poll_lirc:
+                self.scheduler.request_next_frame()
+
+            deadline = self.screensaver_dispatcher.get_deadline()
+            if deadline != None:
+                self.scheduler.add_deadline(deadline)
+
+            events = self.scheduler.wait()
@@ -183,6 +183,12 @@ class Touchscreen(object):
     def close(self):
         self._f_device.close()
 
+    def fileno(self):
+        return self._f_device.fileno()
+
+    def has_pending_events(self):
+        return not self._event_queue.empty()
+
     def __enter__(self):
         return self
 
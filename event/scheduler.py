@@ -0,0 +1,179 @@
+# Copyright 2026 Peppy Player peppy.player@gmail.com
+#
+# This file is part of Peppy Player.
+#
+# Peppy Player is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Peppy Player is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Peppy Player. If not, see <http://www.gnu.org/licenses/>.
+
+import time
+import select
+import logging
+import pygame
+
+from threading import Thread, RLock, Event
+from util.keys import WAKE_EVENT_TYPE
+
+class Scheduler(object):
+    """ Decides when the main loop renders the next frame.
+    The main loop sleeps in pygame.event.wait() until the nearest deadline, an input event
+    or a redraw request from another thread (e.g. a component which has to be redrawn).
+    Deadlines are valid for one wait only, the main loop adds them again on every frame.
+    """
+
+    def __init__(self, frame_rate):
+        """ Initializer
+
+        :param frame_rate: maximum number of frames per second
+        """
+        self.frame_period = 1 / frame_rate
+        self.lock = RLock()
+        self.deadline = None
+        self.frame_requested = True
+        self.waiting = False
+        self.wake_posted = False
+        self.last_frame = 0
+
+    def add_deadline(self, deadline):
+        """ Add the time when the next frame should be rendered
+
+        :param deadline: time in seconds (time.time())
+        """
+        with self.lock:
+            if self.deadline != None and self.deadline <= deadline:
+                return
+            self.deadline = deadline
+            if self.waiting:
+                self.post_wake_event()
+
+    def request_frame(self):
+        """ Render the next frame as soon as possible. Can be called from any thread. """
+
+        with self.lock:
+            self.frame_requested = True
+            if self.waiting:
+                self.post_wake_event()
+
+    def request_next_frame(self):
+        """ Render the next frame after the frame period (e.g. for animation) """
+
+        self.add_deadline(self.last_frame + self.frame_period)
+
+    def post_wake_event(self):
+        """ Interrupt waiting for events """
+
+        if self.wake_posted:
+            return
+        self.wake_posted = True
+        try:
+            pygame.event.post(pygame.event.Event(WAKE_EVENT_TYPE))
+        except Exception as e:
+            logging.debug(e)
+
+    def get_timeout(self, now):
+        """ Get waiting time until the next frame.
+        Frames are never rendered more often than the frame rate allows.
+
+        :param now: current time
+
+        :return: timeout in seconds, None - wait for the next event
+        """
+        with self.lock:
+            if self.frame_requested:
+                deadline = now
+            else:
+                deadline = self.deadline
+            if deadline == None:
+                return None
+            return max(deadline, self.last_frame + self.frame_period) - now
+
+    def wait(self):
+        """ Wait for the next frame. Called by the main loop.
+
+        :return: list of input events received while waiting
+        """
+        events = []
+        with self.lock:
+            timeout = self.get_timeout(time.time())
+            self.waiting = True
+            self.wake_posted = False
+
+        while timeout == None or timeout > 0:
+            if timeout == None:
+                e = pygame.event.wait()
+            else:
+                e = pygame.event.wait(max(1, int(timeout * 1000)))
+
+            if e.type != pygame.NOEVENT and e.type != WAKE_EVENT_TYPE:
+                events.append(e)
+                break
+
+            with self.lock:
+                timeout = self.get_timeout(time.time())
+                self.wake_posted = False
+
+        with self.lock:
+            self.waiting = False
+            self.frame_requested = False
+            self.deadline = None
+            self.last_frame = time.time()
+        return events
+
+class InputWatcher(object):
+    """ Wakes up the main loop when input devices which are read by the main loop
+    (e.g. LIRC socket, multi-touch screen) have data.
+    """
+
+    def __init__(self, scheduler, files):
+        """ Initializer
+
+        :param scheduler: frame scheduler
+        :param files: list of objects with fileno() method
+        """
+        self.scheduler = scheduler
+        self.files = files
+        self.consumed = Event()
+        self.running = False
+
+    def start(self):
+        """ Start watching thread """
+
+        if self.running or not self.files:
+            return
+        self.running = True
+        Thread(target=self.watch_thread, daemon=True).start()
+
+    def watch_thread(self):
+        """ Thread method. Waits until one of the files becomes readable. """
+
+        while self.running:
+            try:
+                readable, _, _ = select.select(self.files, [], [])
+            except Exception as e:
+                logging.debug(e)
+                self.running = False
+                return
+            if readable:
+                self.consumed.clear()
+                self.scheduler.request_frame()
+                self.consumed.wait()
+
+    def set_consumed(self):
+        """ Let the watcher wait for the new data. Called by the main loop after reading devices. """
+
+        self.consumed.set()
+
+    def stop(self):
+        """ Stop watching """
+
+        self.running = False
+        self.consumed.set()
@@ -51,6 +51,7 @@ from ui.screen.screen import PERCENT_TOP_HEIGHT, PERCENT_TITLE_FONT
 from util.config import *
 from util.util import Util, LABELS, PLAYER_RUNNING, PLAYER_SLEEPING
 from util.keys import *
+from util.screenmanager import ScreenManager
 from ui.player.bookplayer import BookPlayer
 from ui.screen.booktrack import BookTrack
 from ui.screen.bookgenre import BookGenre
@@ -169,6 +170,10 @@ class Peppy(object):
 
         self.util.samba_util.start_sharing()
 
+        self.collection_watcher = None
+        if self.config[COLLECTION][WATCH_CHANGES]:
+            self.start_collection_watcher()
+
         if self.config[DSI_DISPLAY_BACKLIGHT][USE_DSI_DISPLAY] and self.config[BACKLIGHTER]:
             screen_brightness = int(self.config[DSI_DISPLAY_BACKLIGHT][SCREEN_BRIGHTNESS])
             self.config[BACKLIGHTER].brightness = screen_brightness
@@ -212,7 +217,10 @@ class Peppy(object):
         
         about = AboutScreen(self.util)
         about.add_listener(self.go_home)
-        self.screens = {KEY_ABOUT : about}
+        self.screens = ScreenManager(self.config[CACHE][SCREEN_CACHE_SIZE], self.config[CACHE][SCREEN_CACHE_MEMORY] * 1024 * 1024, 
+            self.util.image_util.memory_cache)
+        self.screens[KEY_ABOUT] = about
+        self.add_screen_builders()
         self.current_player_screen = None
         self.initial_player_name = self.config[AUDIO][PLAYER_NAME]
         self.current_audio_file = None
@@ -568,7 +576,7 @@ class Peppy(object):
         self.player_state = PLAYER_RUNNING
         self.player.resume_playback()
         self.set_current_screen(self.previous_screen_name)
-        self.screensaver_dispatcher.delay_counter = 0
+        self.screensaver_dispatcher.reset_delay()
         self.screensaver_dispatcher.current_delay = self.screensaver_dispatcher.get_delay()
         if self.use_web:
             self.web_server.redraw_web_ui()
@@ -675,6 +683,42 @@ class Peppy(object):
         else:
             self.go_radio_browser_player(state)
 
+    def add_screen_builders(self):
+        """ Register the screens which can be evicted from the screen cache and rebuilt later """
+
+        builders = {
+            KEY_SWITCH: self.go_switch,
+            PODCASTS: self.go_podcasts,
+            KEY_CATALOG: self.go_catalog,
+            EQUALIZER: self.go_equalizer,
+            TIMER: self.go_timer,
+            WIFI: self.go_wifi,
+            BLUETOOTH: self.go_bluetooth,
+            SCREENSAVER: self.go_savers,
+            KEY_GENRES: self.go_genres,
+            LANGUAGE: self.go_language
+        }
+        for name, builder in builders.items():
+            self.screens.add_builder(name, builder)
+
+        self.screens.add_builder(AUDIO_FILES, self.go_file_browser, self.release_file_browser)
+
+    def release_file_browser(self, file_browser_screen):
+        """ Remove listeners of the evicted File Browser Screen
+
+        :param file_browser_screen: file browser screen
+        """
+        file_menu = file_browser_screen.file_menu
+        self.player.remove_player_listener(file_menu.update_playlist_menu)
+
+        file_player = self.screens.get(KEY_PLAY_FILE, None)
+        if file_player == None:
+            return
+
+        file_player.remove_play_listener(file_menu.select_item)
+        if file_player.recursive_notifier == file_menu.change_folder:
+            file_player.recursive_notifier = None
+
     def get_current_screen(self, key, state=None):
         """ Return current screen by name
         
@@ -752,7 +796,7 @@ class Peppy(object):
 
             self.config[AUDIOBOOKS][BROWSER_BOOK_URL] = ""
             self.config[AUDIOBOOKS][BROWSER_IMAGE_URL] = ""
-            self.screens = {k : v for k, v in self.screens.items() if k == KEY_ABOUT}
+            self.screens.retain([KEY_ABOUT])
             self.current_screen = None
             
             if self.config[USAGE][USE_VOICE_ASSISTANT]:
@@ -3710,6 +3754,9 @@ class Peppy(object):
         :param name: screen name
         """
         with self.lock:
+            if name not in self.screens and self.screens.rebuild(name, state):
+                return
+
             self.previous_screen_name = self.current_screen
             if self.current_screen:
                 ps = self.screens[self.current_screen]
@@ -3758,6 +3805,8 @@ class Peppy(object):
 
             if p: 
                 self.current_player_screen = name
+
+            self.screens.set_current(name, self.previous_screen_name)
     
     def go_back(self, state):
         """ Go to the previous screen
@@ -3921,6 +3970,7 @@ class Peppy(object):
                 logging.debug(e)
 
         self.event_dispatcher.run_dispatcher = False
+        self.util.scheduler.request_frame()
         time.sleep(0.4)
         
         title_screen_name = self.get_title_screen_name()
@@ -3950,9 +4000,36 @@ class Peppy(object):
         if self.config[USAGE][USE_VOICE_ASSISTANT] and self.voice_assistant:
             self.voice_assistant.stop()
 
+        if self.collection_watcher:
+            self.collection_watcher.stop()
+
         if not reboot and self.config[DSI_DISPLAY_BACKLIGHT][USE_DSI_DISPLAY] and self.config[BACKLIGHTER]:
             self.config[BACKLIGHTER].power = False    
 
+    def start_collection_watcher(self):
+        """ Start background service which applies changes in the collection folder to the database """
+
+        base_folder = self.config[COLLECTION][BASE_FOLDER]
+        dbutil = self.util.get_db_util()
+        if not base_folder or not os.path.isdir(base_folder) or not dbutil.conn:
+            logging.debug("Collection watcher cannot be started")
+            return
+
+        from util.collectionwatcher import CollectionWatcher
+        self.collection_watcher = CollectionWatcher(base_folder, dbutil, folder_images=self.config[FOLDER_IMAGES])
+        self.collection_watcher.add_listener(self.refresh_collection_screens)
+        self.collection_watcher.start()
+
+    def refresh_collection_screens(self):
+        """ Notify the collection screens about collection change. Called by the collection watcher thread,
+        the screens are redrawn by the main loop.
+        """
+        with self.lock:
+            for name in [COLLECTION_TOPIC, TOPIC_DETAIL]:
+                screen = self.screens.get(name, None)
+                if screen:
+                    screen.refresh_collection()
+
     def get_title_screen_name(self):
         """ Get current player screen name
 
@@ -160,7 +160,7 @@ class ShairportPipeConnector(object):
             if picture == None or len(picture) == 0:
                 state["picture"] = None
             else:
-                self.image_util.image_cache_base64["current_shairport_image"] = picture
+                self.image_util.image_cache_base64.put("current_shairport_image", picture, True)
                 data = base64.b64decode(picture)
                 buffer = BytesIO(data)
                 state["picture"] = pygame.image.load(buffer).convert_alpha()
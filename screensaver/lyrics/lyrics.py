@@ -320,7 +320,7 @@ class Lyrics(Container, Screensaver):
 
         self.clean()
         super(Lyrics, self).draw()
-        pygame.display.update(self.bounding_box)
+        self.update_display(self.bounding_box)
 
     def set_util(self, util):
         """ Set utility object
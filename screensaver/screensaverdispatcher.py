@@ -17,6 +17,7 @@
 
 import pygame
 import logging
+import time
 
 from ui.component import Component
 from ui.container import Container
@@ -55,9 +56,9 @@ class ScreensaverDispatcher(Component):
         self.current_delay = self.get_delay()
         self.current_screen = None
         self.saver_running = False
-        self.one_cycle_period = 1000 / self.config[SCREEN_INFO][FRAME_RATE]
-        self.counter = 0
-        self.delay_counter = 0
+        self.last_refresh = 0
+        self.last_activity = time.time()
+        self.delay_expired = False
         self.previous_saver = None
         self.internally_refreshed = [VUMETER, SPECTRUM]
 
@@ -152,9 +153,9 @@ class ScreensaverDispatcher(Component):
             return
 
         a = self.current_screensaver.refresh(init=True)
-        pygame.display.update(a)
-        self.counter = 0
-        self.delay_counter = 0    
+        self.util.compositor.add_damage(a)
+        self.last_refresh = time.time()
+        self.reset_delay()
         self.saver_running = True
 
         self.notify_start_listeners(s)
@@ -185,6 +186,7 @@ class ScreensaverDispatcher(Component):
         self.current_screen.set_visible(True)
         self.current_screen.clean_draw_update()
         self.saver_running = False
+        self.reset_delay()
         self.notify_stop_listeners(None)
 
         if self.previous_saver != None and self.config[SCREENSAVER][NAME] != self.previous_saver:
@@ -245,6 +247,26 @@ class ScreensaverDispatcher(Component):
             delay = DELAY_3
         return delay
     
+    def reset_delay(self):
+        """ Start counting the delay before screensaver starts from the current time """
+
+        self.last_activity = time.time()
+        self.delay_expired = False
+
+    def get_deadline(self):
+        """ Get the time when the dispatcher should be refreshed next time
+
+        :return: time in seconds, None - no refresh required
+        """
+        if self.saver_running:
+            if self.current_screensaver.name in self.internally_refreshed:
+                return None
+            return self.last_refresh + self.update_period
+        elif self.current_delay == 0 or self.delay_expired:
+            return None
+        else:
+            return self.last_activity + self.current_delay
+
     def update(self):
         """ Update screensaver """
 
@@ -255,15 +277,15 @@ class ScreensaverDispatcher(Component):
 
         a = None
 
-        if self.saver_running:
-            self.counter = self.counter + 1
+        now = time.time()
 
+        if self.saver_running:
             if self.current_screensaver.name in self.internally_refreshed:
                 return self.current_screensaver.refresh()
             else:
-                if int(self.counter * self.one_cycle_period) == self.update_period * 1000:
+                if now - self.last_refresh >= self.update_period:
                     a = self.current_screensaver.refresh()
-                    self.counter = 0
+                    self.last_refresh = now
                     if self.config[SCREENSAVER][NAME] in WEB_SAVERS:
                         s = State()
                         if isinstance(self.current_screensaver, Component):
@@ -280,8 +302,8 @@ class ScreensaverDispatcher(Component):
         else:
             if self.current_delay == 0:
                 return a
-            self.delay_counter = self.delay_counter + 1
-            if int(self.delay_counter * self.one_cycle_period) == self.current_delay * 1000:
+            if not self.delay_expired and now - self.last_activity >= self.current_delay:
+                self.delay_expired = True
                 self.start_screensaver()
         return a                
         
@@ -343,7 +365,7 @@ class ScreensaverDispatcher(Component):
             if self.saver_running:               
                 self.cancel_screensaver(event)
             else:
-                self.delay_counter = 0                
+                self.reset_delay()
                 
     def add_start_listener(self, listener):
         """ Add start screensaver event listener
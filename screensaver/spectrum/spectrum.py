@@ -475,7 +475,7 @@ class Spectrum(Container, ScreensaverSpectrum):
 
         bgr = self.components[0]
         bgr.draw()
-        pygame.display.update(self.bounding_box)
+        self.update_display(self.bounding_box)
 
     def init_variables(self):
         """ Init variables for new spectrum """
@@ -698,10 +698,21 @@ class Spectrum(Container, ScreensaverSpectrum):
             if c: c.draw()
 
         # update
-        pygame.display.update(self.update_boxes)
+        self.update_display(self.update_boxes)
 
         return None
 
+    def update_display(self, area):
+        """ Update display directly in standalone mode or through the player compositor
+
+        :param area: rectangle or list of rectangles
+        """
+        compositor = getattr(self.util, "compositor", None)
+        if compositor != None:
+            compositor.add_damage(area)
+        else:
+            pygame.display.update(area)
+
     def exit(self):
         """ Exit program """
 
@@ -15,6 +15,7 @@
 # You should have received a copy of the GNU General Public License
 # along with Peppy Player. If not, see <http://www.gnu.org/licenses/>.
 
+import os
 import math
 import logging
 
@@ -28,8 +29,8 @@ from ui.menu.menu import Menu, ALIGN_LEFT
 from ui.navigator.catalogbase import CatalogBaseNavigator
 from copy import copy
 from util.serviceutil import MENU_PAGE_SIZE, MENU_COLUMNS, MENU_ROWS
-from multiprocessing.dummy import Pool
 from util.streamingservice import ALBUM_IMAGE_SMALL, ALBUM_IMAGE_LARGE
+from util.imageutil import FOLDER_ICONS, DEFAULT_CD_IMAGE
 
 # 480x320
 PERCENT_TOP_HEIGHT = 14.0625
@@ -242,10 +243,9 @@ class CatalogBase(MenuScreen):
         d = self.album_menu.make_dict(page)
         self.album_menu.set_items(d, 0, self.change_item, False, lazy_load_images=True)
 
-        pool = Pool(processes=MENU_PAGE_SIZE)
-        pool.map(self.set_image, self.album_menu.buttons.values())
-        pool.close()
-        pool.join()
+        for b in self.album_menu.buttons.values():
+            self.set_placeholder(b)
+        self.album_menu.load_images(self.load_image, self.set_loaded_image)
 
         if self.navigator and self.total_pages > 1:
             self.left_button.change_label(str(self.current_page - 1))
@@ -270,46 +270,76 @@ class CatalogBase(MenuScreen):
         self.draw()
         self.update_component = True
 
-    def set_image(self, b):
-        """ Set button image
+    def get_image_url(self, b):
+        """ Get button image URL
 
         :param b: button
-        """
-        img_rect = b.layout.image_rectangle
-        x = img_rect.x
-        y = img_rect.y
-        url = None
 
+        :return: image URL
+        """
         if hasattr(b.state, ALBUM_IMAGE_SMALL):
-            url = getattr(b.state, ALBUM_IMAGE_SMALL, None)
+            return getattr(b.state, ALBUM_IMAGE_SMALL, None)
         elif hasattr(b.state, ALBUM_IMAGE_LARGE):
-            url = getattr(b.state, ALBUM_IMAGE_LARGE, None)
+            return getattr(b.state, ALBUM_IMAGE_LARGE, None)
+        return None
+
+    def set_placeholder(self, b):
+        """ Set button image from cache or placeholder image until the image is loaded
 
+        :param b: button
+        """
+        if b.components[1] == None:
+            c = Component(self.util)
+            b.components[1] = c
+            c.name = GENERATED_IMAGE + str(b.state.index)
+            c.image_filename = c.name
+
+        img_rect = b.layout.image_rectangle
+        url = self.get_image_url(b)
         img = self.get_image_from_cache(url)
-        if img:
-            if b.components[1] == None:
-                c = Component(self.util)
-                b.components[1] = c
-                c.name = GENERATED_IMAGE + str(b.state.index)
-                c.image_filename = c.name
-            self.set_button_image(b, img, x, y)
+
+        if not img:
+            if not url:
+                return
+            path = os.path.join(FOLDER_ICONS, DEFAULT_CD_IMAGE)
+            placeholder = self.image_util.load_image(path, False, (img_rect.w, img_rect.h))
+            if not placeholder:
+                return
+            img = placeholder[1]
+
+        self.set_button_image(b, img, img_rect.x, img_rect.y)
+
+    def load_image(self, b):
+        """ Load button image. Called in the image loader thread.
+
+        :param b: button
+
+        :return: image or None if the image is already set or not available
+        """
+        img_rect = b.layout.image_rectangle
+        url = self.get_image_url(b)
+
+        if not url or self.get_image_from_cache(url):
+            return None
+
+        if url.startswith("http"):
+            img = self.image_util.load_menu_screen_image(url, img_rect.w, img_rect.h)
         else:
-            if url:
-                c = Component(self.util)
-                b.components[1] = c
-                c.name = GENERATED_IMAGE + str(b.state.index)
-                c.image_filename = c.name
-                if url.startswith("http"):
-                    img = self.image_util.load_menu_screen_image(url, img_rect.w, img_rect.h)
-                else:
-                    img = self.image_util.load_icon_main(url, img_rect, 0.7)
-                    if img:
-                        img = img[1]
-                if img:
-                    self.set_button_image(b, img, x, y)
-                    self.put_image_to_cache(url, img)
-        b.clean()
-        b.draw()
+            img = self.image_util.load_icon_main(url, img_rect, 0.7)
+            if img:
+                img = img[1]
+        if img:
+            self.put_image_to_cache(url, img)
+        return img
+
+    def set_loaded_image(self, b, img):
+        """ Set image loaded in the background
+
+        :param b: button
+        :param img: image
+        """
+        img_rect = b.layout.image_rectangle
+        self.set_button_image(b, img, img_rect.x, img_rect.y)
 
     def set_button_image(self, b, icon, x, y):
         """ Set button image
@@ -320,6 +350,8 @@ class CatalogBase(MenuScreen):
         :param y: image Y coordinate
         """
         c = b.components[1]
+        if c == None or icon == None:
+            return
         c.content = icon            
         c.content_x = x + int((b.bounding_box.w / 100) * self.config[PADDING])
         c.content_y = y + (b.bounding_box.h/2 - icon.get_size()[1]/2)
@@ -28,6 +28,7 @@ from util.keys import USER_EVENT_TYPE, SUB_TYPE_KEYBOARD, SELECT_EVENT_TYPE, \
 
 from util.config import USAGE, USE_LONG_PRESS_TIME, ALIGN_BUTTON_CONTENT_X, CENTER
 from ui.layout.buttonlayout import ButtonLayout
+from ui.spatialindex import invalidate_layout
 
 ELLIPSES = "..."
 
@@ -57,6 +58,30 @@ class Button(Container):
         self.enter_y = None
         self.ignore_enter_y = True
     
+    @property
+    def state(self):
+        """ Button state
+
+        :return: state
+        """
+        return self._state
+
+    @state.setter
+    def state(self, state):
+        """ Set button state. Outdates spatial indexes which use the button area.
+
+        :param state: new state
+        """
+        self._state = state
+        invalidate_layout()
+
+    def get_hit_area(self):
+        """ Get the area outside of which the button ignores pointer events
+
+        :return: state bounding box
+        """
+        return getattr(self.state, "bounding_box", None)
+
     def set_state(self, state):
         """ Set new button state
         
@@ -173,7 +198,7 @@ class Button(Container):
 
     def create_one_line_label(self, state, bb, font, font_size, text, padding):
         state.l_name = text
-        s = font.size(text)
+        s = self.util.get_text_size(font, text)
         size = (s[0], font_size)
 
         if getattr(self, "selected", False):
@@ -181,7 +206,7 @@ class Button(Container):
         else:
             color = state.text_color_normal
 
-        label = font.render(text, 1, color)
+        label = self.util.render_text(font, text, color)
         c = Component(self.util, label)
         c.name = state.name + ".label"
         c.text = text
@@ -224,8 +249,8 @@ class Button(Container):
         y_first_line = bb.y + (bb.h - two_lines_text_height)/2 - adjustment_y
         y_second_line = y_first_line + first_line_height + between_lines_gap - adjustment_y + adjustment_y_second_line
 
-        size = font_first.size(first_line)
-        label = font_first.render(first_line, 1, state.text_color_normal)
+        size = self.util.get_text_size(font_first, first_line)
+        label = self.util.render_text(font_first, first_line, state.text_color_normal)
 
         c = Component(self.util, label)
         c.name = state.name + ".label.1"
@@ -244,7 +269,7 @@ class Button(Container):
             self.components[2] = c
         x = c.content_x
 
-        label = font_second.render(second_line, 1, state.text_color_disabled)
+        label = self.util.render_text(font_second, second_line, state.text_color_disabled)
 
         c = Component(self.util, label)
         c.name = state.name + ".label.2"
@@ -453,12 +478,12 @@ class Button(Container):
         # Selected
         if num == 4:
             font = self.util.get_font(self.components[2].text_size)
-            self.components[2].content = font.render(self.components[2].text, 1, self.components[2].text_color_current)
+            self.components[2].content = self.util.render_text(font, self.components[2].text, self.components[2].text_color_current)
             font = self.util.get_font(self.components[num - 2].text_size)
-            self.components[2].content = font.render(self.components[2].text, 1, self.components[2].text_color_current)
+            self.components[2].content = self.util.render_text(font, self.components[2].text, self.components[2].text_color_current)
         else:
             font = self.util.get_font(self.components[2].text_size)
-            self.components[2].content = font.render(self.state.l_name, 1, self.components[2].text_color_current)
+            self.components[2].content = self.util.render_text(font, self.state.l_name, self.components[2].text_color_current)
                     
     def handle_event(self, event):
         """ Handle button event
@@ -690,7 +715,8 @@ class Button(Container):
         self.notify_label_listeners(self.state)
     
     def truncate_long_labels(self, text, bb, font, truncated=False):
-        """ Truncate long labels
+        """ Truncate long labels. The longest prefix which fits with ellipses is found
+        using the cached prefix widths.
         
         :param text: label text
         :param bb: bounding box
@@ -700,21 +726,21 @@ class Button(Container):
         """
         if len(text) < 5:
             return text
-        
-        size = font.size(text)
-        ellipses_size = font.size(ELLIPSES)
-        text_width = size[0]
-        
-        if text_width >= bb.w:
-            return self.truncate_long_labels(text[0 : -1], bb, font, True)
+
+        ellipses_width = self.util.get_text_size(font, ELLIPSES)[0]
+        if not truncated:
+            if self.util.get_text_size(font, text)[0] < bb.w:
+                return text
+            n = len(text) - 1
         else:
-            if truncated:
-                if size[0] + ellipses_size[0] >= bb.w:
-                    return self.truncate_long_labels(text[0 : -1], bb, font, True)
-                else:
-                    return text + ELLIPSES
-            else:
-                return text 
+            n = len(text)
+
+        while n >= 5:
+            if self.util.get_prefix_width(font, text, n) + ellipses_width < bb.w:
+                return text[0 : n] + ELLIPSES
+            n -= 1
+
+        return text[0 : n]
 
     def refresh(self):
         """ Return bounding box for screen update """
@@ -117,6 +117,13 @@ class ImageButton(Button):
         self.components[1].content = self.state.icon_base
         self.clean_draw_update()
 
+    def get_hit_area(self):
+        """ The button handles release events outside of its area
+
+        :return: None - button gets all pointer events
+        """
+        return None
+
     def mouse_action(self, event):
         """ Mouse event handler
         
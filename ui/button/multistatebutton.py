@@ -63,6 +63,13 @@ class MultiStateButton(Button):
         elif event.type == SELECT_EVENT_TYPE:
             self.select_action(event.x, event.y)
         
+    def get_hit_area(self):
+        """ The button handles release events outside of its area
+
+        :return: None - button gets all pointer events
+        """
+        return None
+
     def mouse_action(self, event):
         """ Mouse event handler
         
@@ -55,8 +55,8 @@ class PodcastButton(Button):
         font = self.util.get_font(font_size)
         text = self.truncate_long_labels(state.l_name, bb, font)
         state.l_name = text
-        size = font.size(text)
-        label = font.render(text, 1, state.text_color_normal)
+        size = self.util.get_text_size(font, text)
+        label = self.util.render_text(font, text, state.text_color_normal)
         c = Component(self.util, label)
         c.name = state.name + ".label"
         c.text = text
@@ -37,6 +37,8 @@ class Component(object):
         """
         self.screen = None
         self.screen = util.pygame_screen
+        self.compositor = getattr(util, "compositor", None)
+        self.scheduler = getattr(util, "scheduler", None)
         self.content = c
         self.content_x = x
         self.content_y = y
@@ -54,6 +56,25 @@ class Component(object):
         self.border_thickness = t
         self.update_component = True
 
+    @property
+    def update_component(self):
+        """ Flag which tells the main loop to redraw the component
+
+        :return: True - component should be redrawn, False - component is up to date
+        """
+        return getattr(self, "_update_component", False)
+
+    @update_component.setter
+    def update_component(self, flag):
+        """ Set redraw flag. Wakes up the main loop if the flag was set from another thread.
+
+        :param flag: True - component should be redrawn
+        """
+        self._update_component = flag
+        scheduler = getattr(self, "scheduler", None)
+        if flag and scheduler != None:
+            scheduler.request_frame()
+
     def clean(self):
         """ Clean component by filling its bounding box by background color """
         
@@ -151,15 +172,27 @@ class Component(object):
         if not self.visible: return
 
         if update_area:
-            pygame.display.update(update_area)
+            self.update_display(update_area)
         else:
-            pygame.display.update(self.bounding_box)
+            self.update_display(self.bounding_box)
         
     def update_rectangle(self, r):
         """ Update Pygame Screen """
         
         if not self.visible: return
-        pygame.display.update(r)      
+        self.update_display(r)
+
+    def update_display(self, area):
+        """ Update the area of the display. The area is passed to the compositor 
+        which updates all areas damaged during the frame at once. Components created with
+        utility objects without compositor (e.g. in screensaver plug-ins) update the display directly.
+
+        :param area: rectangle or list of rectangles
+        """
+        if self.compositor != None:
+            self.compositor.add_damage(area)
+        else:
+            pygame.display.update(area)
         
     def set_visible(self, flag):
         """ Set component visibility 
@@ -168,6 +201,14 @@ class Component(object):
         """
         self.visible = flag
         
+    def get_hit_area(self):
+        """ Get the area outside of which the component ignores pointer events.
+        Used by the spatial index of the container.
+
+        :return: rectangle, None - component handles pointer events everywhere
+        """
+        return None
+
     def refresh(self):
         """ Refresh component. Used for periodical updates  animation. """
         
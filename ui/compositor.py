@@ -0,0 +1,152 @@
+# Copyright 2026 Peppy Player peppy.player@gmail.com
+#
+# This file is part of Peppy Player.
+#
+# Peppy Player is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Peppy Player is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Peppy Player. If not, see <http://www.gnu.org/licenses/>.
+
+import time
+import pygame
+
+from threading import RLock
+from pygame import Rect
+
+MAX_FRAME_DELAY = 0.1
+DAMAGE_COLOR = (255, 0, 0)
+DAMAGE_DISPLAY_PERIOD = 0.5
+
+def merge_rects(rects):
+    """ Merge overlapping rectangles
+
+    :param rects: list of rectangles
+
+    :return: list of rectangles which don't overlap
+    """
+    merged = []
+    for r in rects:
+        r = Rect(r)
+        if r.w <= 0 or r.h <= 0:
+            continue
+        i = r.collidelist(merged)
+        while i != -1:
+            r.union_ip(merged.pop(i))
+            i = r.collidelist(merged)
+        merged.append(r)
+    return merged
+
+class Compositor(object):
+    """ Collects damaged screen areas during the frame and updates the display once per frame.
+    Before the event loop starts and when the event loop doesn't flush the frame for longer than
+    MAX_FRAME_DELAY (e.g. the main thread is busy) the display is updated immediately.
+    """
+
+    def __init__(self, show_damage=False, listener=None):
+        """ Initializer
+
+        :param show_damage: True - outline damaged areas on the screen (for debugging)
+        :param listener: function which is called when the damage is deferred till the next frame
+        """
+        self.show_damage = show_damage
+        self.listener = listener
+        self.lock = RLock()
+        self.damage = []
+        self.deferred = False
+        self.last_flush = 0
+        self.overlays = []
+
+    def start(self):
+        """ Start collecting damage. Called when the event loop starts. """
+
+        self.last_flush = time.time()
+        self.deferred = True
+
+    def stop(self):
+        """ Stop collecting damage, update pending areas """
+
+        self.deferred = False
+        self.flush()
+
+    def add_damage(self, area):
+        """ Add damaged area
+
+        :param area: rectangle or list of rectangles
+        """
+        if not area:
+            return
+
+        if isinstance(area, (list, tuple)) and len(area) > 0 and not isinstance(area[0], (int, float)):
+            rects = list(area)
+        else:
+            rects = [area]
+
+        with self.lock:
+            self.damage.extend(rects)
+
+        if not self.deferred or time.time() - self.last_flush > MAX_FRAME_DELAY:
+            self.flush()
+        elif self.listener:
+            self.listener()
+
+    def flush(self):
+        """ Update all damaged areas of the display using one call
+
+        :return: True - display was updated or damage outlines are still shown, False - nothing to update
+        """
+
+        with self.lock:
+            self.last_flush = time.time()
+            rects = merge_rects(self.damage)
+            self.damage = []
+
+            if self.show_damage:
+                rects = self.draw_damage(rects)
+
+            if rects:
+                pygame.display.update(rects)
+
+            return len(rects) > 0 or len(self.overlays) > 0
+
+    def draw_damage(self, rects):
+        """ Outline damaged areas. Outlines are removed after DAMAGE_DISPLAY_PERIOD
+        if the area was not drawn again.
+
+        :param rects: damaged areas
+
+        :return: areas to update including the areas where outlines were removed
+        """
+        screen = pygame.display.get_surface()
+        if screen == None:
+            return rects
+
+        now = time.time()
+        overlays = []
+        restored = []
+        for r, image, t in self.overlays:
+            if r.collidelist(rects) != -1:
+                continue
+            if now - t < DAMAGE_DISPLAY_PERIOD:
+                overlays.append((r, image, t))
+            else:
+                screen.blit(image, r.topleft)
+                restored.append(r)
+
+        screen_rect = screen.get_rect()
+        for r in rects:
+            r = r.clip(screen_rect)
+            if r.w <= 0 or r.h <= 0:
+                continue
+            overlays.append((r, screen.subsurface(r).copy(), now))
+            pygame.draw.rect(screen, DAMAGE_COLOR, r, 1)
+
+        self.overlays = overlays
+        return merge_rects(rects + restored)
@@ -15,7 +15,12 @@
 # You should have received a copy of the GNU General Public License
 # along with Peppy Player. If not, see <http://www.gnu.org/licenses/>.
 
+import pygame
+
 from ui.component import Component
+from ui.spatialindex import SpatialIndex
+
+POINTER_EVENTS = [pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP, pygame.MOUSEMOTION]
 
 class Container(Component):
     """ This container class keeps the list of components and executes group methods on them """
@@ -35,6 +40,7 @@ class Container(Component):
             
         Component.__init__(self, util, c=cnt, bb=bounding_box, bgr=background, v=visible)
         self.components = list()
+        self.spatial_index = None
         if image_filename:
             self.image_filename = image_filename
 
@@ -89,14 +95,30 @@ class Container(Component):
         self.draw()
         self.update(update_area)
             
+    def get_spatial_index(self):
+        """ Get spatial index of the components. The index is rebuilt if the components or their layout changed.
+
+        :return: spatial index
+        """
+        index = getattr(self, "spatial_index", None)
+        if index == None or not index.is_valid(self.components):
+            index = self.spatial_index = SpatialIndex(self.components)
+        return index
+
     def handle_event(self, event):
         """ Handle container event. Don't handle event if container is invisible.
+        Pointer events are sent only to the components which can handle them at the event position.
         
         :param event: the event to handle
         """
         if not self.visible or len(self.components) == 0: return
 
-        for i in range(len(self.components) - 1, -1, -1):
+        if event.type in POINTER_EVENTS and hasattr(event, "pos"):
+            indexes = self.get_spatial_index().get_candidates(event.pos)
+        else:
+            indexes = range(len(self.components) - 1, -1, -1)
+
+        for i in indexes:
             try:
                 comp = self.components[i]
 
@@ -79,6 +79,7 @@ class Menu(Container):
         self.press = False
         self.release = False
         self.in_motion = False
+        self.set_loaded_image = None
 
         if bgr_component:
             self.add_component(bgr_component)
@@ -104,6 +105,8 @@ class Menu(Container):
         :param append_right: None - don't append to existing buttons, True - append to the right side, False - to the left
         :param lazy_load_images: True - load images after menu creation, False - don't lazy load
         """
+        self.cancel_image_loading()
+
         if not it:
             return
 
@@ -184,6 +187,53 @@ class Menu(Container):
         self.notify_menu_loaded_listeners()
         self.column_width = self.bb.w / self.cols
 
+    def load_images(self, load_image, set_image):
+        """ Load images of the menu buttons in the background. 
+        Loaded images are set in the UI thread by the refresh method.
+        
+        :param load_image: function which takes the button and returns its image, called in the worker thread
+        :param set_image: function which takes the button and the image and sets the image, called in the UI thread
+        """
+        loader = getattr(self.util, "image_loader", None)
+        if loader == None:
+            for b in self.buttons.values():
+                img = load_image(b)
+                if img:
+                    set_image(b, img)
+            return
+
+        loader.cancel(self)
+        self.set_loaded_image = set_image
+        for b in self.buttons.values():
+            loader.load(self, b, load_image)
+
+    def cancel_image_loading(self):
+        """ Cancel loading of the images which were requested for the current menu page """
+
+        loader = getattr(self.util, "image_loader", None)
+        if loader != None:
+            loader.cancel(self)
+
+    def refresh(self):
+        """ Set the images loaded in the background and refresh menu components
+        
+        :return: list of areas to update
+        """
+        areas = Container.refresh(self)
+        loader = getattr(self.util, "image_loader", None)
+        if loader == None or self.set_loaded_image == None or not self.visible:
+            return areas
+
+        results = loader.get_results(self)
+        for button, image in results:
+            self.set_loaded_image(button, image)
+            areas.append(button.bounding_box)
+
+        if results and self.redraw_observer:
+            self.redraw_observer()
+
+        return areas
+
     def get_layout(self, items):
         """ Create menu layout for provided items
         
@@ -278,7 +328,7 @@ class Menu(Container):
                     icon_max_width = max(w, icon_max_width)
             
         font = self.util.get_font(font_size)
-        label_size = font.size(longest_string)
+        label_size = self.util.get_text_size(font, longest_string)
 
         if label_size[0] >= b.bounding_box.w:
             final_size = (b.bounding_box.w, label_size[1])
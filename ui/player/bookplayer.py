@@ -80,16 +80,16 @@ class BookPlayer(FilePlayerScreen):
         self.current_playlist = self.parser.get_book_audio_files_by_url(state.book_url, img_url)
         state.url = self.parser.book_parser.img_url
         
+        bb = self.center_button.bounding_box
+        w = bb.w
+        h = bb.h
         img = self.cache.get_image(state.url)
         if img == None:
-            i = self.image_util.load_image_from_url(state.url)
+            i = self.image_util.load_image_from_url(state.url, (w, h))
             if i:
                 self.cache.cache_image(i[1], state.url)
                 img = i[1]
         
-        bb = self.center_button.bounding_box
-        w = bb.w
-        h = bb.h
         self.cover_image = self.image_util.scale_image_with_padding(w, h, img, padding=1)        
         
         self.screen_title.set_text(state.name)
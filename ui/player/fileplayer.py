@@ -64,6 +64,7 @@ class FilePlayerScreen(PlayerScreen):
         self.audio_files = self.get_audio_files()
         self.play_listeners = []
         self.add_play_listener(self.get_listener(listeners, KEY_PLAY))
+        self.recursive_notifier = None
         
         self.current_folder = self.config[FILE_PLAYBACK][CURRENT_FOLDER]
         self.center_button.state.cover_art_folder = self.util.file_util.get_cover_art_folder(self.current_folder)
@@ -104,20 +105,21 @@ class FilePlayerScreen(PlayerScreen):
         else:
             self.center_button.components[1].content_y = self.layout.CENTER.y
 
-        self.set_background(full_screen_image)
+        self.set_background(full_screen_image, img_tuple[0])
 
         self.center_button.selected = True
         self.link_borders()
 
-    def set_background(self, image):
+    def set_background(self, image, source=None):
         """ Set album art as a screen background
 
         :param image: image to set as a background
+        :param source: image source (file path or URL)
         """
         if image == None or self.config[BACKGROUND][BGR_TYPE] != USE_ALBUM_ART:
             return
 
-        i = self.image_util.get_album_art_bgr(image)
+        i = self.image_util.get_album_art_bgr(image, source)
         if i != self.content:
             self.content = i
 
@@ -650,7 +652,8 @@ class FilePlayerScreen(PlayerScreen):
         self.current_track_index = 0
         state.dont_notify = True
         self.audio_files = self.get_audio_files()
-        self.recursive_notifier(f[0])
+        if self.recursive_notifier != None:
+            self.recursive_notifier(f[0])
         return True
             
     def end_of_track(self):
@@ -738,6 +741,14 @@ class FilePlayerScreen(PlayerScreen):
         """
         if listener not in self.play_listeners:
             self.play_listeners.append(listener)
+
+    def remove_play_listener(self, listener):
+        """ Remove play listener
+        
+        :param listener: event listener
+        """
+        if listener in self.play_listeners:
+            self.play_listeners.remove(listener)
             
     def notify_play_listeners(self, state):
         """ Notify all play listeners
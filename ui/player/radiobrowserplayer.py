@@ -240,7 +240,8 @@ class RadioBrowserPlayerScreen(RadioPlayerScreen):
             else:
                 image_path = state.image_path
 
-            if self.image_util.image_cache.get(image_path, None) == None:
+            cached_image = self.image_util.image_cache.get(image_path, None)
+            if cached_image == None:
                 img = self.image_util.load_image_from_url(image_path)
                 if img:
                     self.image_util.image_cache[image_path] = img[1]
@@ -248,7 +249,7 @@ class RadioBrowserPlayerScreen(RadioPlayerScreen):
                 else:
                     self.util.add_icon(state)       
             else:
-                img = (image_path, self.image_util.image_cache[image_path])
+                img = (image_path, cached_image)
         else:
             self.util.add_icon(state)
         
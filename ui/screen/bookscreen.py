@@ -20,7 +20,6 @@ from ui.menu.bookmenu import BookMenu
 from ui.page import Page
 from ui.layout.multilinebuttonlayout import LINES
 from ui.state import State
-from multiprocessing.dummy import Pool
 from websiteparser.siteparser import TOTAL_PAGES, BOOK_SUMMARIES, AUTHOR_NAME, IMG_URL, BOOK_URL, \
     GENRE_NAME, BOOK_TITLE
 from util.keys import KEY_BACK, KEY_PAGE_DOWN, KEY_PAGE_UP
@@ -90,10 +89,7 @@ class BookScreen(MenuScreen):
             b.parent_screen = self
             b.state.index = (self.current_page - 1) * (self.rows * self.columns) + i
         
-        pool = Pool(size)
-        pool.map(self.set_image, buttons.values()) 
-        pool.close() 
-        pool.join()
+        self.book_menu.load_images(self.load_image, self.set_loaded_image)
 
         if self.book_menu.get_selected_item() != None:
             self.navigator.unselect()
@@ -105,26 +101,31 @@ class BookScreen(MenuScreen):
         self.book_menu.clean_draw_update()
         self.link_borders()
     
-    def set_image(self, b):
-        """ Set button image
+    def load_image(self, b):
+        """ Load button image. Called in the image loader thread.
         
         :param b: button
+
+        :return: image
         """
-        self.menu_button_layout.create_layout(b.bounding_box)
-        img_rect = self.menu_button_layout.image_rectangle
-        img_y = img_rect.y
-        
-        comps = b.components
-        im = comps[1]
-        url = im.image_filename
+        url = b.components[1].image_filename
         img = self.get_image_from_cache(url)
         if img:
-            self.set_button_image(b, img, img_y)
-        else:
-            img = self.image_util.load_menu_screen_image(url, img_rect.w, img_rect.h)
-            if img:
-                self.set_button_image(b, img, img_y)
-                self.put_image_to_cache(url, img)
+            return img
+
+        img = self.image_util.load_menu_screen_image(url, self.img_rect.w, self.img_rect.h)
+        if img:
+            self.put_image_to_cache(url, img)
+        return img
+
+    def set_loaded_image(self, b, img):
+        """ Set image loaded in the background
+        
+        :param b: button
+        :param img: image
+        """
+        self.menu_button_layout.create_layout(b.bounding_box)
+        self.place_button_image(b, img, self.menu_button_layout.image_rectangle.y)
 
     def set_books(self, page_index, books):
         """ Set books  
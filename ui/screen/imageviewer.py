@@ -184,6 +184,8 @@ class ImageViewer(Screen):
         self.image_previous_box = self.viewport.copy()
         self.image_component.content = pygame.transform.smoothscale(base, self.window_size)
         self.update_screen = True
+        if self.scheduler != None:
+            self.scheduler.request_frame()
 
     def move_left(self, state):
         """ Move image left """
@@ -60,7 +60,7 @@ class MenuScreen(Screen):
         self.page_in_title = page_in_title
         self.show_loading = show_loading
         
-        self.cache = Cache(self.util)
+        self.cache = Cache(self.util, disk_spill=True)
         self.layout = BorderLayout(self.bounding_box)
         self.layout.set_percent_constraints(PERCENT_TOP_HEIGHT, PERCENT_BOTTOM_HEIGHT, 0, 0)              
         Screen.__init__(self, util, "", PERCENT_TOP_HEIGHT, "menu_screen_screen_title", True, self.layout.TOP)
@@ -219,6 +219,17 @@ class MenuScreen(Screen):
     def set_button_image(self, b, icon, img_y=None):
         """ Set button image
         
+        :param b: button
+        :param icon: image
+        :param img_y: image Y coordinate
+        """
+        self.place_button_image(b, icon, img_y)
+        self.components[1].clean_draw_update()
+        self.update_component = True 
+
+    def place_button_image(self, b, icon, img_y=None):
+        """ Set button image and its position without redrawing
+        
         :param b: button
         :param icon: image
         :param img_y: image Y coordinate
@@ -236,8 +247,6 @@ class MenuScreen(Screen):
             img_y = bb.y + (img_area_height - h)/2
         
         im.content_y = img_y
-        self.components[1].clean_draw_update()
-        self.update_component = True 
     
     def set_loading(self, name=None, text=None):
         """ Show Loading... sign
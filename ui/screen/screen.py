@@ -202,6 +202,7 @@ class Screen(Container):
             self.menu.buttons = {}
             self.menu.components = []
         self.clean_draw_update()
+        self.util.compositor.flush()
         self.notify_loading_listeners()
         self.update_component = True
 
@@ -41,6 +41,32 @@ MINUTES_INCREMENT_WAKE_UP = 5
 HOURS_DECREMENT_WAKE_UP = 6
 MINUTES_DECREMENT_WAKE_UP = 7
 
+def get_clock_grid(screen_rect):
+    """ Prepare the screen layout and the grid for two clocks
+
+    :param screen_rect: screen rectangle
+
+    :return: tuple (screen layout, clock grid)
+    """
+    screen_layout = BorderLayout(screen_rect)
+    screen_layout.set_percent_constraints(PERCENT_TITLE, PERCENT_NAV_HEIGHT, 0, 0)
+    grid = GridLayout(screen_layout.CENTER)
+    grid.set_pixel_constraints(2, 1)
+    return (screen_layout, grid)
+
+def get_digit_layout(bb):
+    """ Prepare the layout of the clock with the digits bounding box
+
+    :param bb: clock bounding box
+
+    :return: tuple (clock layout, gap)
+    """
+    layout = BorderLayout(bb)
+    layout.set_percent_constraints(0, 0, PERCENT_CLOCK, 100 - PERCENT_CLOCK)
+    gap = layout.h * 0.1
+    layout.LEFT.w -= gap * 3
+    layout.LEFT.h -= gap
+    return (layout, gap)
 
 class TimerScreen(Screen):
     """ Timer Screen """
@@ -57,8 +83,7 @@ class TimerScreen(Screen):
         self.timer_lock = timer_lock
         self.start_timer_thread = start_timer_thread
         self.config = util.config
-        self.screen_layout = BorderLayout(util.screen_rect)
-        self.screen_layout.set_percent_constraints(PERCENT_TITLE, PERCENT_NAV_HEIGHT, 0, 0)
+        self.screen_layout, c = get_clock_grid(util.screen_rect)
         Screen.__init__(self, util, "", PERCENT_NAV_HEIGHT, "timer_title", title_layout=self.screen_layout.TOP)
         self.bounding_box = util.screen_rect
         label = self.config[LABELS][TIMER]
@@ -69,13 +94,7 @@ class TimerScreen(Screen):
         except:
             self.config[TIMER] = {}
 
-        c = GridLayout(self.screen_layout.CENTER)
-        c.set_pixel_constraints(2, 1)
-        layout = BorderLayout(c.get_next_constraints())
-        layout.set_percent_constraints(0, 0, PERCENT_CLOCK, 100 - PERCENT_CLOCK)
-        gap = layout.h * 0.1
-        layout.LEFT.w -= gap * 3
-        layout.LEFT.h -= gap
+        layout, gap = get_digit_layout(c.get_next_constraints())
         digits = util.image_util.get_flipclock_digits(layout.LEFT)
 
         change_codes = [HOURS_INCREMENT_SLEEP, MINUTES_INCREMENT_SLEEP, HOURS_DECREMENT_SLEEP, MINUTES_DECREMENT_SLEEP]
@@ -83,6 +83,7 @@ class TopicScreen(MenuScreen):
         self.source = None
         self.mode = KEY_LIST
         self.animated_title = True
+        self.collection_changed = False
 
     def set_current(self, state):
         """ Set current state
@@ -206,6 +207,49 @@ class TopicScreen(MenuScreen):
             
         return total_pages
 
+    def refresh_collection(self):
+        """ Mark the collection as changed. Called by the collection watcher thread,
+        the page is reloaded by the main loop in the refresh method.
+        """
+        if not self.collection_topic:
+            return
+
+        self.collection_changed = True
+        self.update_component = True
+
+    def refresh(self):
+        """ Reload the page after collection change and refresh the screen """
+
+        if self.collection_changed:
+            self.collection_changed = False
+            self.reload_page()
+
+        return MenuScreen.refresh(self)
+
+    def reload_page(self):
+        """ Update page count and reload the current page after collection change. 
+        If the current page doesn't exist anymore the last page is loaded.
+        """
+        topic = self.collection_topic
+        if topic == KEY_AUDIO_FOLDER:
+            topic = FOLDER
+        elif topic == KEY_FILE:
+            topic = FILENAME
+
+        if self.mode == KEY_ABC and self.search_string:
+            self.total_pages = self.selector.get_page_count_by_char(topic, self.search_string.strip(), PAGE_SIZE)
+        elif self.mode == KEY_SEARCH and self.search_string:
+            self.total_pages = self.selector.get_page_count_by_pattern(topic, self.search_string.strip(), PAGE_SIZE)
+        else:
+            self.total_pages = self.selector.get_page_count(topic, PAGE_SIZE)
+
+        self.current_page = max(1, min(self.current_page, self.total_pages))
+        self.previous_page = self.current_page
+        self.turn_page()
+
+        self.navigator.left_button.change_label(str(self.current_page - 1))
+        self.navigator.right_button.change_label(str(max(0, self.total_pages - self.current_page)))
+
     def turn_page(self):
         """ Turn page """
 
@@ -84,6 +84,7 @@ class TopicDetailScreen(MenuScreen):
         self.selection = None
         self.prev_page = 1
         self.animated_title = True
+        self.collection_changed = False
 
     def set_current(self, state):
         """ Set current state
@@ -211,6 +212,44 @@ class TopicDetailScreen(MenuScreen):
                 self.collection_list_menu.select_by_index(b.state.index)
                 return
 
+    def refresh_collection(self):
+        """ Mark the collection as changed. Called by the collection watcher thread,
+        the page is reloaded by the main loop in the refresh method.
+        """
+        if not self.collection_topic or self.selection == None:
+            return
+
+        self.collection_changed = True
+        self.update_component = True
+
+    def refresh(self):
+        """ Reload the page after collection change and refresh the screen """
+
+        if self.collection_changed:
+            self.collection_changed = False
+            self.reload_page()
+
+        return MenuScreen.refresh(self)
+
+    def reload_page(self):
+        """ Update page count and reload the current page after collection change. 
+        If the current page doesn't exist anymore the last page is loaded.
+        """
+        self.total_pages = self.selector.get_page_count_by_column(self.get_topic(), self.selection, PAGE_SIZE)
+
+        if self.total_pages == 0:
+            self.current_page = 1
+            self.current_page_items = []
+            self.collection_list_menu.set_items({}, 0, self.select_item, False)
+            self.link_borders()
+        else:
+            self.current_page = min(self.current_page, self.total_pages)
+            self.prev_page = self.current_page
+            self.turn_page()
+
+        self.left_button.change_label(str(self.current_page - 1))
+        self.right_button.change_label(str(max(0, self.total_pages - self.current_page)))
+
     def get_topic(self):
         """ Get topic
 
@@ -0,0 +1,105 @@
+# Copyright 2026 Peppy Player peppy.player@gmail.com
+#
+# This file is part of Peppy Player.
+#
+# Peppy Player is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Peppy Player is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Peppy Player. If not, see <http://www.gnu.org/licenses/>.
+
+import logging
+
+CELL_SIZE = 64
+
+layout_version = 0
+
+def invalidate_layout():
+    """ Mark all spatial indexes as outdated. Called when the hit area of any component changes. """
+
+    global layout_version
+    layout_version += 1
+
+class SpatialIndex(object):
+    """ Uniform grid over the hit areas of the container components.
+    The grid returns the components which can handle the pointer event at the specified position.
+    Components without hit area (e.g. popups, sliders, nested containers) are returned for all positions.
+    """
+
+    def __init__(self, components):
+        """ Initializer
+
+        :param components: list of components
+        """
+        self.ids = tuple(map(id, components))
+        self.version = layout_version
+        self.cells = {}
+        self.default = []
+
+        self.areas = [self.get_hit_area(comp) for comp in components]
+
+        for i in range(len(components) - 1, -1, -1):
+            area = self.areas[i]
+            if area == None:
+                self.default.append(i)
+                for cell in self.cells.values():
+                    cell.append(i)
+                continue
+
+            for col in range(area.left // CELL_SIZE, (area.right - 1) // CELL_SIZE + 1):
+                for row in range(area.top // CELL_SIZE, (area.bottom - 1) // CELL_SIZE + 1):
+                    cell = self.cells.get((col, row))
+                    if cell == None:
+                        cell = self.cells[(col, row)] = list(self.default)
+                    cell.append(i)
+
+    def get_hit_area(self, comp):
+        """ Get the area where the component handles pointer events
+
+        :param comp: component
+
+        :return: rectangle, None - component should get all pointer events
+        """
+        if getattr(comp, "popup", None) == True:
+            return None
+
+        try:
+            area = comp.get_hit_area()
+        except Exception as e:
+            logging.debug(e)
+            return None
+
+        if area == None or area.w <= 0 or area.h <= 0:
+            return None
+        return area.copy()
+
+    def is_valid(self, components):
+        """ Check if the index was built for the current components and layout
+
+        :param components: list of components
+
+        :return: True - index can be used, False - index should be rebuilt
+        """
+        return self.version == layout_version and self.ids == tuple(map(id, components))
+
+    def get_candidates(self, pos):
+        """ Get indexes of the components which can handle the pointer event at the position
+
+        :param pos: pointer position
+
+        :return: list of component indexes in the reverse order (top component first)
+        """
+        key = (int(pos[0] // CELL_SIZE), int(pos[1] // CELL_SIZE))
+        cell = self.cells.get(key)
+        if cell == None:
+            return self.default
+
+        areas = self.areas
+        return [i for i in cell if areas[i] == None or areas[i].collidepoint(pos)]
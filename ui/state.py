@@ -15,7 +15,24 @@
 # You should have received a copy of the GNU General Public License
 # along with Peppy Player. If not, see <http://www.gnu.org/licenses/>.
 
+from ui.spatialindex import invalidate_layout
+
 class State(object):
     """ Button State class. It's populated dynamically. """
-    
-    pass
+
+    @property
+    def bounding_box(self):
+        """ Button bounding box
+
+        :return: bounding box
+        """
+        return self._bounding_box
+
+    @bounding_box.setter
+    def bounding_box(self, bb):
+        """ Set bounding box. Outdates spatial indexes which use the button area.
+
+        :param bb: new bounding box
+        """
+        self._bounding_box = bb
+        invalidate_layout()
@@ -136,9 +136,9 @@ class OutputText(Container):
         if self.font == None:
             return
 
-        s = self.font.size(text)
+        s = self.util.get_text_size(self.font, text)
         size = (s[0], self.default_font_size)
-        label = self.font.render(text, 1, self.fgr)
+        label = self.util.render_text(self.font, text, self.fgr)
         comp = Component(self.util, label)
         comp.name = self.name + ".text"
         text_length = size[0]
@@ -168,21 +168,21 @@ class OutputText(Container):
                 self.current_cursor_position = cursor_position
                 if not overflow:
                     txt = text[: self.current_cursor_position]
-                    size = self.font.size(txt)
+                    size = self.util.get_text_size(self.font, txt)
                     self.components[2].content.x = self.bounding_box.x + self.shift_x + size[0]
                 else:
                     txt = text[: self.current_cursor_position]
-                    size = self.font.size(txt)
+                    size = self.util.get_text_size(self.font, txt)
                     self.components[2].content.x = text_x + size[0]
             else:
                 if not overflow:
                     self.current_cursor_position += 1
                     txt = text[: self.current_cursor_position]
-                    size = self.font.size(txt)
+                    size = self.util.get_text_size(self.font, txt)
                     self.components[2].content.x = self.bounding_box.x + self.shift_x + size[0]
                 else:
                     txt = text[: self.current_cursor_position]
-                    size = self.font.size(txt)
+                    size = self.util.get_text_size(self.font, txt)
                     self.components[2].content.x = comp.content_x + text_length
             
     def set_state(self, state):
@@ -340,7 +340,7 @@ class OutputText(Container):
 
         if self.show_cursor and self.visible and event.type == pygame.MOUSEBUTTONUP and getattr(self, "text", None):
             txt = getattr(self, "text", None)
-            size = self.font.size(txt)
+            size = self.util.get_text_size(self.font, txt)
             delta = (size[0] + self.shift_x + 2) - self.bounding_box.w
             text_x = self.bounding_box.w - size[0] - self.shift_x
 
@@ -353,11 +353,11 @@ class OutputText(Container):
             if event.pos[0] > cursor_x:
                 prev_x = 0
                 for n in range(len(txt) + 1):
-                    size = self.font.size(txt[0 : n])
+                    width = self.util.get_prefix_width(self.font, txt, n)
                     if overflow:
-                        eol = text_x + size[0]
+                        eol = text_x + width
                     else:
-                        eol = self.bounding_box.x + self.shift_x + size[0]
+                        eol = self.bounding_box.x + self.shift_x + width
 
                     self.current_cursor_position = n
                     if event.pos[0] >= prev_x and event.pos[0] < eol:
@@ -15,21 +15,89 @@
 # You should have received a copy of the GNU General Public License
 # along with Peppy Player. If not, see <http://www.gnu.org/licenses/>.
 
+import os
+import json
+import time
+import struct
+import logging
+import hashlib
+import threading
+
 from threading import RLock
+from collections import OrderedDict
+from util.config import CACHE, CACHE_FOLDER
+
+DEFAULT_MEMORY_BUDGET = 64 * 1024 * 1024
+PINNED_BUDGET_RATIO = 0.25
+ENTRY_OVERHEAD = 64
+HITS = "hits"
+MISSES = "misses"
+EVICTIONS = "evictions"
+ENTRIES = "entries"
+PINNED = "pinned"
+SIZE = "size"
+BUDGET = "budget"
+CACHES = "caches"
+DEFAULT_DISK_CACHE_SIZE = 32 * 1024 * 1024
+DISK_CACHE_EXTENSION = ".cache"
+DEFAULT_FILE_INFO_ENTRIES = 50000
+DEFAULT_ART_CACHE_SIZE = 64 * 1024 * 1024
+ART_CACHE_EXTENSION = ".art"
+ART_INDEX_FILE = "index.json"
+ART_ORIGINAL = "original"
+ART_INDEX_SAVE_INTERVAL = 10
+URL_CACHE_NAME = "url"
+URL_SPILL_CACHE_NAME = "url.spill"
+URL_CACHE_TTL = 3600
+URL_CACHE_FOLDER = "url"
+URL_CACHE_EXTENSION = ".rgba"
+URL_CACHE_HEADER = ">d"
+URL_CACHE_HEADER_SIZE = struct.calcsize(URL_CACHE_HEADER)
+DEFAULT_URL_CACHE_BUDGET = 16 * 1024 * 1024
 
 class Cache(object):
-    """ Image cache """
+    """ Thread-safe bounded cache of the images loaded by URL. Images are kept in the shared memory cache 
+    of the image utility with LRU eviction and size accounting. Each image expires after the time-to-live period. 
+    Optionally the evicted images are spilled to the disk cache and loaded from there on the next request.
+    All instances with the same spill mode share one named view of the memory cache, so the screens rebuilt 
+    later reuse the images and the view statistics instead of adding new views.
+    """
     
     lock = RLock()
+    spill_cleared = False
     
-    def __init__(self, util):
+    def __init__(self, util, ttl=URL_CACHE_TTL, disk_spill=False):
         """ Initializer 
         
         :param util: utility object 
+        :param ttl: time-to-live period in seconds
+        :param disk_spill: True - save evicted images in the disk cache, False - drop evicted images
         """
         self.util = util
-        self.cached_images_hashes = []
-        self.image_cache = {}
+        self.ttl = ttl
+
+        if disk_spill:
+            self.name = URL_SPILL_CACHE_NAME
+        else:
+            self.name = URL_CACHE_NAME
+
+        self.image_util = getattr(util, "image_util", None)
+        memory_cache = getattr(self.image_util, "memory_cache", None)
+        if memory_cache == None:
+            memory_cache = MemoryCache(DEFAULT_URL_CACHE_BUDGET)
+        self.memory_cache = memory_cache
+        self.image_cache = memory_cache.get_cache(self.name)
+
+        self.disk_cache = None
+        if disk_spill and self.image_util != None:
+            folder = util.config[CACHE][CACHE_FOLDER]
+            if folder:
+                self.disk_cache = DiskCache(os.path.join(folder, URL_CACHE_FOLDER), DEFAULT_DISK_CACHE_SIZE, URL_CACHE_EXTENSION)
+                with Cache.lock:
+                    if not Cache.spill_cleared:
+                        self.disk_cache.clear()
+                        Cache.spill_cleared = True
+                memory_cache.set_eviction_listener(self.name, self.spill_image)
     
     def get_image(self, url):
         """ Get image from cache by specified url 
@@ -37,11 +105,34 @@ class Cache(object):
         :param url: image url 
         :return: image if in cache, None if not in cache
         """
-        with self.lock:
-            try:
-                return self.image_cache[url]
-            except:
-                return None
+        if url == None:
+            return None
+
+        now = time.time()
+        entry = self.image_cache.get(url)
+        if entry != None:
+            if entry[0] > now:
+                return entry[1]
+            self.image_cache.pop(url)
+            return None
+
+        if self.disk_cache == None:
+            return None
+
+        key = self.disk_cache.get_key(self.name, url)
+        data = self.disk_cache.get(key)
+        if not data:
+            return None
+
+        self.disk_cache.remove(key)
+        expires = struct.unpack_from(URL_CACHE_HEADER, data)[0]
+        if expires <= now:
+            return None
+
+        img = self.image_util.decode_raw_image(data[URL_CACHE_HEADER_SIZE:])
+        if img != None:
+            self.image_cache[url] = (expires, img)
+        return img
         
     def cache_image(self, img, url):
         """ Save image in cache 
@@ -49,11 +140,773 @@ class Cache(object):
         :param img: image to cache
         :param url: image url 
         """
+        if img == None or url == None:
+            return
+        self.image_cache[url] = (time.time() + self.ttl, img)
+
+    def spill_image(self, url, entry):
+        """ Eviction listener. Save evicted image in the disk cache. 
+        
+        :param url: image url
+        :param entry: tuple (expiration time, image)
+        """
+        expires, img = entry
+        if expires <= time.time():
+            return
+
+        data = self.image_util.encode_raw_image(img)
+        if data:
+            key = self.disk_cache.get_key(self.name, url)
+            self.disk_cache.put(key, struct.pack(URL_CACHE_HEADER, expires) + data)
+
+def get_object_size(value):
+    """ Estimate memory size of the cached object. The size of the Pygame surface is width * height * bytes per pixel.
+
+    :param value: cached object
+
+    :return: size in bytes
+    """
+    if value == None:
+        return ENTRY_OVERHEAD
+    elif hasattr(value, "get_bytesize") and hasattr(value, "get_size"):
+        w, h = value.get_size()
+        return w * h * value.get_bytesize() + ENTRY_OVERHEAD
+    elif isinstance(value, (str, bytes, bytearray)):
+        return len(value) + ENTRY_OVERHEAD
+    elif isinstance(value, (tuple, list)):
+        return sum([get_object_size(v) for v in value])
+    else:
+        return ENTRY_OVERHEAD
+
+class MemoryCache(object):
+    """ LRU cache shared by several named caches. The least recently used entries are evicted 
+    when the total size of all entries exceeds the memory budget. Pinned entries are not evicted
+    while they fit into the pinned budget (part of the memory budget). The least recently used pinned entries 
+    above the pinned budget are unpinned and can be evicted as other entries.
+    """
+
+    def __init__(self, budget=DEFAULT_MEMORY_BUDGET):
+        """ Initializer
+
+        :param budget: memory budget in bytes
+        """
+        self.budget = budget
+        self.pinned_budget = int(budget * PINNED_BUDGET_RATIO)
+        self.lock = RLock()
+        self.entries = OrderedDict()
+        self.pinned = OrderedDict()
+        self.size = 0
+        self.pinned_size = 0
+        self.stats = {}
+        self.eviction_listeners = {}
+        self.evicted = []
+
+    def get_cache(self, name):
+        """ Get named cache
+
+        :param name: cache name
+
+        :return: dictionary-like cache object
+        """
         with self.lock:
-            new_url = url.encode("utf-8")
-            h = self.util.get_hash(new_url)
-            if h in self.cached_images_hashes:
+            if name not in self.stats:
+                self.stats[name] = {HITS: 0, MISSES: 0, EVICTIONS: 0}
+        return NamedCache(self, name)
+
+    def set_eviction_listener(self, name, listener):
+        """ Set listener called for each object evicted from the named cache. 
+        Listeners are called outside of the cache lock.
+
+        :param name: cache name
+        :param listener: function with key and object parameters
+        """
+        with self.lock:
+            self.eviction_listeners[name] = listener
+
+    def notify_eviction_listeners(self):
+        """ Call eviction listeners for the objects evicted since the previous call """
+
+        with self.lock:
+            evicted = self.evicted
+            self.evicted = []
+
+        for name, key, value in evicted:
+            try:
+                self.eviction_listeners[name](key, value)
+            except Exception as e:
+                logging.debug(e)
+
+    def get(self, name, key, default=None):
+        """ Get cached object and mark it as the most recently used
+
+        :param name: cache name
+        :param key: object key
+        :param default: value returned if the key is not in the cache
+
+        :return: cached object or default value
+        """
+        k = (name, key)
+        with self.lock:
+            entry = self.pinned.get(k, None)
+            if entry != None:
+                self.pinned.move_to_end(k)
+            else:
+                entry = self.entries.get(k, None)
+                if entry != None:
+                    self.entries.move_to_end(k)
+            if entry == None:
+                self.stats[name][MISSES] += 1
+                return default
+            self.stats[name][HITS] += 1
+            return entry[0]
+
+    def contains(self, name, key):
+        """ Check if the key is in the cache. Statistics are not changed.
+
+        :param name: cache name
+        :param key: object key
+
+        :return: True - cached, False - not cached
+        """
+        k = (name, key)
+        with self.lock:
+            return k in self.pinned or k in self.entries
+
+    def put(self, name, key, value, pinned=False):
+        """ Add object to the cache. Objects larger than the budget are not cached unless they are pinned.
+
+        :param name: cache name
+        :param key: object key
+        :param value: object
+        :param pinned: True - never evict the object
+        """
+        size = get_object_size(value)
+        k = (name, key)
+        with self.lock:
+            self.remove(name, key)
+            if pinned:
+                self.pinned[k] = (value, size)
+                self.pinned_size += size
+                self.limit_pinned()
+            elif size > self.budget:
                 return
-            self.image_cache[url] = img
-            self.cached_images_hashes.append(h)
-            
+            else:
+                self.entries[k] = (value, size)
+                self.size += size
+            self.evict()
+        self.notify_eviction_listeners()
+
+    def remove(self, name, key):
+        """ Remove object from the cache
+
+        :param name: cache name
+        :param key: object key
+
+        :return: removed object or None
+        """
+        k = (name, key)
+        with self.lock:
+            entry = self.entries.pop(k, None)
+            if entry != None:
+                self.size -= entry[1]
+                return entry[0]
+            entry = self.pinned.pop(k, None)
+            if entry != None:
+                self.pinned_size -= entry[1]
+                return entry[0]
+            return None
+
+    def pin(self, name, key):
+        """ Pin cached object
+
+        :param name: cache name
+        :param key: object key
+        """
+        k = (name, key)
+        with self.lock:
+            entry = self.entries.pop(k, None)
+            if entry != None:
+                self.size -= entry[1]
+                self.pinned[k] = entry
+                self.pinned_size += entry[1]
+                self.limit_pinned()
+                self.evict()
+        self.notify_eviction_listeners()
+
+    def limit_pinned(self):
+        """ Unpin the least recently used pinned objects until the pinned objects fit into the pinned budget. 
+        Unpinned objects become the least recently used objects.
+        """
+        with self.lock:
+            while len(self.pinned) > 1 and self.pinned_size > self.pinned_budget:
+                k, entry = self.pinned.popitem(last=False)
+                self.pinned_size -= entry[1]
+                self.entries[k] = entry
+                self.entries.move_to_end(k, last=False)
+                self.size += entry[1]
+
+    def unpin(self, name, key):
+        """ Unpin cached object. It becomes the most recently used object.
+
+        :param name: cache name
+        :param key: object key
+        """
+        k = (name, key)
+        with self.lock:
+            entry = self.pinned.pop(k, None)
+            if entry != None:
+                self.pinned_size -= entry[1]
+                self.entries[k] = entry
+                self.size += entry[1]
+                self.evict()
+        self.notify_eviction_listeners()
+
+    def evict(self):
+        """ Evict the least recently used objects until the total size fits into the budget """
+
+        with self.lock:
+            while self.entries and self.size + self.pinned_size > self.budget:
+                k, entry = self.entries.popitem(last=False)
+                self.size -= entry[1]
+                self.stats[k[0]][EVICTIONS] += 1
+                if k[0] in self.eviction_listeners:
+                    self.evicted.append((k[0], k[1], entry[0]))
+
+    def set_budget(self, budget):
+        """ Change memory budget
+
+        :param budget: memory budget in bytes
+        """
+        with self.lock:
+            self.budget = budget
+            self.pinned_budget = int(budget * PINNED_BUDGET_RATIO)
+            self.limit_pinned()
+            self.evict()
+        self.notify_eviction_listeners()
+
+    def get_keys(self, name):
+        """ Get all keys of the named cache
+
+        :param name: cache name
+
+        :return: list of keys
+        """
+        with self.lock:
+            return [k[1] for k in list(self.pinned.keys()) + list(self.entries.keys()) if k[0] == name]
+
+    def get_object_ids(self):
+        """ Get identifiers of all cached objects including the objects inside of the cached tuples and lists
+
+        :return: set of object identifiers
+        """
+        ids = set()
+        with self.lock:
+            values = [entry[0] for entry in list(self.pinned.values()) + list(self.entries.values())]
+        while values:
+            value = values.pop()
+            if isinstance(value, (tuple, list)):
+                values.extend(value)
+            else:
+                ids.add(id(value))
+        return ids
+
+    def get_statistics(self):
+        """ Get cache statistics
+
+        :return: dictionary with total and pinned size, budget and counters of each named cache
+        """
+        with self.lock:
+            caches = {}
+            for name, s in self.stats.items():
+                c = dict(s)
+                c[ENTRIES] = 0
+                c[SIZE] = 0
+                c[PINNED] = 0
+                caches[name] = c
+            for k, entry in self.entries.items():
+                caches[k[0]][ENTRIES] += 1
+                caches[k[0]][SIZE] += entry[1]
+            for k, entry in self.pinned.items():
+                caches[k[0]][ENTRIES] += 1
+                caches[k[0]][PINNED] += 1
+                caches[k[0]][SIZE] += entry[1]
+            return {
+                SIZE: self.size + self.pinned_size,
+                PINNED: self.pinned_size,
+                BUDGET: self.budget,
+                CACHES: caches
+            }
+
+class NamedCache(object):
+    """ Dictionary-like view of the named cache in the shared memory cache """
+
+    def __init__(self, memory_cache, name):
+        """ Initializer
+
+        :param memory_cache: shared memory cache
+        :param name: cache name
+        """
+        self.memory_cache = memory_cache
+        self.name = name
+
+    def __getitem__(self, key):
+        """ Get cached object
+
+        :param key: object key
+
+        :return: cached object, KeyError if not cached
+        """
+        missing = self
+        value = self.memory_cache.get(self.name, key, missing)
+        if value is missing:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key, value):
+        """ Add object to the cache
+
+        :param key: object key
+        :param value: object
+        """
+        self.memory_cache.put(self.name, key, value)
+
+    def __delitem__(self, key):
+        """ Remove object from the cache
+
+        :param key: object key
+        """
+        self.memory_cache.remove(self.name, key)
+
+    def __contains__(self, key):
+        """ Check if the key is in the cache
+
+        :param key: object key
+
+        :return: True - cached, False - not cached
+        """
+        return self.memory_cache.contains(self.name, key)
+
+    def __len__(self):
+        """ Get the number of cached objects
+
+        :return: number of objects
+        """
+        return len(self.memory_cache.get_keys(self.name))
+
+    def get(self, key, default=None):
+        """ Get cached object
+
+        :param key: object key
+        :param default: value returned if the key is not in the cache
+
+        :return: cached object or default value
+        """
+        return self.memory_cache.get(self.name, key, default)
+
+    def put(self, key, value, pinned=False):
+        """ Add object to the cache
+
+        :param key: object key
+        :param value: object
+        :param pinned: True - never evict the object
+        """
+        self.memory_cache.put(self.name, key, value, pinned)
+
+    def pop(self, key, default=None):
+        """ Remove object from the cache
+
+        :param key: object key
+        :param default: value returned if the key is not in the cache
+
+        :return: removed object or default value
+        """
+        value = self.memory_cache.remove(self.name, key)
+        if value == None:
+            return default
+        return value
+
+    def pin(self, key):
+        """ Pin cached object
+
+        :param key: object key
+        """
+        self.memory_cache.pin(self.name, key)
+
+    def unpin(self, key):
+        """ Unpin cached object
+
+        :param key: object key
+        """
+        self.memory_cache.unpin(self.name, key)
+
+    def keys(self):
+        """ Get keys of all cached objects
+
+        :return: list of keys
+        """
+        return self.memory_cache.get_keys(self.name)
+
+class DiskCache(object):
+    """ Persistent cache of binary files limited by the total size. The oldest files are deleted first. """
+
+    def __init__(self, folder, max_size=DEFAULT_DISK_CACHE_SIZE, extension=DISK_CACHE_EXTENSION, lru=False):
+        """ Initializer
+
+        :param folder: cache folder
+        :param max_size: maximum total size of the cached files in bytes
+        :param extension: cached file extension
+        :param lru: True - update file modification time on read so that the least recently used files are deleted first
+        """
+        self.folder = folder
+        self.max_size = max_size
+        self.extension = extension
+        self.lru = lru
+        self.lock = RLock()
+        self.size = None
+
+        try:
+            os.makedirs(folder, exist_ok=True)
+        except Exception as e:
+            logging.debug(e)
+
+    def get_key(self, *values):
+        """ Create cache key from the values
+
+        :param values: values which define cached content
+
+        :return: hex digest
+        """
+        h = hashlib.sha1()
+        for v in values:
+            if not isinstance(v, bytes):
+                v = str(v).encode("utf-8")
+            h.update(v)
+            h.update(b"\0")
+        return h.hexdigest()
+
+    def get_path(self, key):
+        """ Get path of the cached file
+
+        :param key: cache key
+
+        :return: file path
+        """
+        return os.path.join(self.folder, key + self.extension)
+
+    def get(self, key):
+        """ Read cached file
+
+        :param key: cache key
+
+        :return: file content or None if not cached
+        """
+        path = self.get_path(key)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+            if self.lru:
+                os.utime(path)
+            return data
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logging.debug(e)
+            return None
+
+    def put(self, key, data):
+        """ Save file in the cache. The file is written to a temporary file first and then renamed.
+
+        :param key: cache key
+        :param data: file content
+        """
+        path = self.get_path(key)
+        tmp_path = path + "." + str(threading.get_ident()) + ".tmp"
+        try:
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            logging.debug(e)
+            try:
+                os.remove(tmp_path)
+            except Exception:
+                pass
+            return
+
+        with self.lock:
+            if self.size == None:
+                self.size = self.get_folder_size()
+            else:
+                self.size += len(data)
+            if self.size > self.max_size:
+                self.cleanup()
+
+    def remove(self, key):
+        """ Remove file from the cache
+
+        :param key: cache key
+        """
+        try:
+            os.remove(self.get_path(key))
+            with self.lock:
+                self.size = None
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logging.debug(e)
+
+    def get_files(self):
+        """ Get all cached files
+
+        :return: list of tuples (modification time, size, path)
+        """
+        files = []
+        try:
+            with os.scandir(self.folder) as entries:
+                for e in entries:
+                    if e.is_file() and e.name.endswith(self.extension):
+                        s = e.stat()
+                        files.append((s.st_mtime, s.st_size, e.path))
+        except Exception as e:
+            logging.debug(e)
+        return files
+
+    def get_folder_size(self):
+        """ Get total size of the cached files
+
+        :return: size in bytes
+        """
+        return sum([f[1] for f in self.get_files()])
+
+    def cleanup(self):
+        """ Delete the oldest files until the total size is below the limit """
+
+        with self.lock:
+            files = sorted(self.get_files())
+            size = sum([f[1] for f in files])
+            for _, file_size, path in files:
+                if size <= self.max_size:
+                    break
+                try:
+                    os.remove(path)
+                    size -= file_size
+                except Exception as e:
+                    logging.debug(e)
+            self.size = size
+
+    def clear(self):
+        """ Delete all cached files """
+
+        with self.lock:
+            for _, _, path in self.get_files():
+                try:
+                    os.remove(path)
+                except Exception as e:
+                    logging.debug(e)
+            self.size = 0
+
+class FileInfoCache(object):
+    """ Persistent dictionary of small values calculated from files (e.g. flags). 
+    The value is valid while the modification time and the size of the file don't change. 
+    """
+
+    def __init__(self, path, max_entries=DEFAULT_FILE_INFO_ENTRIES):
+        """ Initializer
+
+        :param path: path to the JSON file
+        :param max_entries: maximum number of entries, the oldest entries are removed first
+        """
+        self.path = path
+        self.max_entries = max_entries
+        self.lock = RLock()
+        self.entries = None
+        self.changed = False
+
+    def load(self):
+        """ Load entries from the file if they were not loaded yet """
+
+        if self.entries != None:
+            return
+
+        self.entries = {}
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                entries = json.load(f)
+            if isinstance(entries, dict):
+                self.entries = entries
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logging.debug(e)
+
+    def get(self, path, stats):
+        """ Get value of the file
+
+        :param path: file path or any other key (e.g. URL)
+        :param stats: file stats (os.stat result), None - the value doesn't depend on the file
+
+        :return: value or None if the file is not in the cache or was changed
+        """
+        with self.lock:
+            self.load()
+            entry = self.entries.get(path)
+            if not entry:
+                return None
+            if stats == None or (entry[0] == stats.st_mtime and entry[1] == stats.st_size):
+                return entry[2]
+            return None
+
+    def put(self, path, stats, value):
+        """ Set value of the file
+
+        :param path: file path or any other key (e.g. URL)
+        :param stats: file stats (os.stat result), None - the value doesn't depend on the file
+        :param value: JSON serializable value
+        """
+        with self.lock:
+            self.load()
+            self.entries.pop(path, None)
+            if stats == None:
+                self.entries[path] = [None, None, value]
+            else:
+                self.entries[path] = [stats.st_mtime, stats.st_size, value]
+            self.changed = True
+
+    def get_values(self):
+        """ Get all values
+
+        :return: list of values
+        """
+        with self.lock:
+            self.load()
+            return [entry[2] for entry in self.entries.values()]
+
+    def save(self):
+        """ Save entries to the file if they were changed. The file is written to a temporary file first and then renamed. """
+
+        with self.lock:
+            if not self.changed:
+                return
+
+            extra = len(self.entries) - self.max_entries
+            if extra > 0:
+                for key in list(self.entries.keys())[:extra]:
+                    del self.entries[key]
+
+            tmp_path = self.path + "." + str(threading.get_ident()) + ".tmp"
+            try:
+                folder = os.path.dirname(self.path)
+                if folder:
+                    os.makedirs(folder, exist_ok=True)
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump(self.entries, f)
+                os.replace(tmp_path, self.path)
+                self.changed = False
+            except Exception as e:
+                logging.debug(e)
+                try:
+                    os.remove(tmp_path)
+                except Exception:
+                    pass
+
+class ArtCache(object):
+    """ Content addressed disk cache of album art. The original image and its size class variants 
+    are stored by the hash of the original image data. The index maps image sources (audio file path, URL) 
+    to the content hash, so the same image used by several sources is stored once.
+    """
+
+    def __init__(self, folder, max_size=DEFAULT_ART_CACHE_SIZE, size_classes=None):
+        """ Initializer
+
+        :param folder: cache folder
+        :param max_size: maximum total size of the cached images in bytes
+        :param size_classes: list of tuples (size class name, (width, height)) sorted by size
+        """
+        self.images = DiskCache(folder, max_size, ART_CACHE_EXTENSION, lru=True)
+        self.index = FileInfoCache(os.path.join(folder, ART_INDEX_FILE))
+        self.size_classes = size_classes or []
+        self.last_save = 0
+
+    def get_size_class(self, size):
+        """ Get the smallest size class which covers the size
+
+        :param size: tuple (width, height), None - original size
+
+        :return: size class name
+        """
+        if size:
+            for name, box in self.size_classes:
+                if box[0] >= size[0] and box[1] >= size[1]:
+                    return name
+        return ART_ORIGINAL
+
+    def get_content_key(self, source, stats=None):
+        """ Get hash of the image data for the image source
+
+        :param source: image source (file path or URL)
+        :param stats: file stats for the file sources
+
+        :return: content hash, empty string if the source has no image, None if the source is unknown
+        """
+        return self.index.get(source, stats)
+
+    def get(self, content_key, size_class):
+        """ Get image data
+
+        :param content_key: content hash
+        :param size_class: size class name
+
+        :return: image data or None if not cached
+        """
+        return self.images.get(self.images.get_key(content_key, size_class))
+
+    def put(self, source, variants, stats=None):
+        """ Save image variants and link them to the source
+
+        :param source: image source (file path or URL)
+        :param variants: dictionary size class name -> image data, None - the source has no image
+        :param stats: file stats for the file sources
+
+        :return: content hash
+        """
+        content_key = ""
+        if variants:
+            content_key = hashlib.sha1(variants[ART_ORIGINAL]).hexdigest()
+            for name, data in variants.items():
+                key = self.images.get_key(content_key, name)
+                if not os.path.exists(self.images.get_path(key)):
+                    self.images.put(key, data)
+
+        self.index.put(source, stats, content_key)
+        self.save_index()
+        return content_key
+
+    def get_value(self, name):
+        """ Get value saved in the index (e.g. album art URL found by the album name)
+
+        :param name: value name
+
+        :return: value or None
+        """
+        return self.index.get(name, None)
+
+    def put_value(self, name, value):
+        """ Save value in the index
+
+        :param name: value name
+        :param value: JSON serializable value
+        """
+        self.index.put(name, None, value)
+        self.save_index(True)
+
+    def save_index(self, force=False):
+        """ Save the index. To avoid rewriting the index for each new image it's saved 
+        not more often than once per ART_INDEX_SAVE_INTERVAL seconds unless forced.
+
+        :param force: True - save regardless of the time of the previous save
+        """
+        now = time.time()
+        if not force and now - self.last_save < ART_INDEX_SAVE_INTERVAL:
+            return
+        self.last_save = now
+        self.index.save()
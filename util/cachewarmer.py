@@ -0,0 +1,251 @@
+# Copyright 2026 Peppy Player peppy.player@gmail.com
+#
+# This file is part of Peppy Player.
+#
+# Peppy Player is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Peppy Player is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Peppy Player. If not, see <http://www.gnu.org/licenses/>.
+
+import os
+import sys
+import json
+import logging
+import multiprocessing
+
+from timeit import default_timer as timer
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+TASK_BACKGROUND = "backgrounds"
+TASK_ICONS = "icons"
+TASK_FLIPCLOCK = "flipclock"
+ICON_BATCH_SIZE = 50
+FLIPCLOCK_KEYS = ["key-top", "key-bottom", "key-top-on", "key-bottom-on"]
+ITEMS = "items"
+ERRORS = "errors"
+TIME = "time"
+BUILT = "built"
+BYTES = "bytes"
+
+worker_util = None
+
+def get_util():
+    """ Create utility object using the current configuration. The display is never opened,
+    so the warmer can run next to the running player.
+
+    :return: utility object
+    """
+    os.environ["SDL_VIDEODRIVER"] = "dummy"
+    from util.util import Util
+
+    util = Util()
+    util.init_utilities()
+    util.image_util.write_backgrounds_async = False
+    return util
+
+def init_worker():
+    """ Initialize worker process """
+
+    global worker_util
+    worker_util = get_util()
+
+def warm_backgrounds(index, blur_radius):
+    """ Prepare screen background image
+
+    :param index: index of the background definition
+    :param blur_radius: blur radius, None - radius from the definition
+
+    :return: tuple (number of prepared images, number of errors)
+    """
+    image = worker_util.image_util.get_screen_bgr_image(index=index, blur_radius=blur_radius)
+    if image == None:
+        return (0, 1)
+    return (1, 0)
+
+def warm_icons(requests):
+    """ Rasterize icons from the manifest
+
+    :param requests: list of icon requests
+
+    :return: tuple (number of rasterized icons, number of errors)
+    """
+    items = errors = 0
+    for request in requests:
+        try:
+            if worker_util.image_util.load_icon_request(request) == None:
+                errors += 1
+            else:
+                items += 1
+        except Exception as e:
+            logging.debug(e)
+            errors += 1
+    return (items, errors)
+
+def warm_flipclock():
+    """ Rasterize flip clock digits, separator and keys in the sizes used by the timer screen
+
+    :return: tuple (number of rasterized images, number of errors)
+    """
+    from ui.screen.timer import get_clock_grid, get_digit_layout
+
+    image_util = worker_util.image_util
+    _, grid = get_clock_grid(worker_util.screen_rect)
+    layout, _ = get_digit_layout(grid.get_next_constraints())
+    digits = image_util.get_flipclock_digits(layout.LEFT)
+    h = digits[0][1].get_size()[1]
+    image_util.get_flipclock_separator(h / 3)
+    for name in FLIPCLOCK_KEYS:
+        image_util.get_flipclock_key(name, h)
+    return (len(digits) + 1 + len(FLIPCLOCK_KEYS), 0)
+
+def run_task(task):
+    """ Execute warming task in the worker process
+
+    :param task: tuple (task type, arguments)
+
+    :return: tuple (task type, number of items, number of errors, time in seconds)
+    """
+    task_type, args = task
+    start = timer()
+    try:
+        if task_type == TASK_BACKGROUND:
+            items, errors = warm_backgrounds(*args)
+        elif task_type == TASK_ICONS:
+            items, errors = warm_icons(*args)
+        else:
+            items, errors = warm_flipclock()
+    except Exception as e:
+        logging.debug(e)
+        items, errors = 0, 1
+    return (task_type, items, errors, timer() - start)
+
+class CacheWarmer(object):
+    """ Pre-generates derived images (backgrounds, icons, flip clock digits) into the persistent caches.
+    The work is split into tasks which are executed in the pool of processes.
+    """
+
+    def __init__(self, util, workers=1):
+        """ Initializer
+
+        :param util: utility object
+        :param workers: number of worker processes
+        """
+        self.util = util
+        self.image_util = util.image_util
+        self.workers = workers
+
+    def get_tasks(self, blur_radiuses=None):
+        """ Prepare the list of tasks
+
+        :param blur_radiuses: additional blur radiuses for backgrounds (e.g. used by screensavers)
+
+        :return: list of tuples (task type, arguments)
+        """
+        tasks = []
+        if self.image_util.background_disk_cache != None:
+            radiuses = [None] + (blur_radiuses or [])
+            for index in range(len(self.image_util.get_screen_bgr_names())):
+                for radius in radiuses:
+                    tasks.append((TASK_BACKGROUND, (index, radius)))
+
+        if self.image_util.icon_disk_cache != None:
+            tasks.append((TASK_FLIPCLOCK, ()))
+            requests = self.image_util.get_icon_requests()
+            for i in range(0, len(requests), ICON_BATCH_SIZE):
+                tasks.append((TASK_ICONS, (requests[i : i + ICON_BATCH_SIZE],)))
+
+        return tasks
+
+    def get_caches(self):
+        """ Get persistent caches filled by the warmer
+
+        :return: dictionary task type -> disk cache
+        """
+        caches = {}
+        if self.image_util.background_disk_cache != None:
+            caches[TASK_BACKGROUND] = self.image_util.background_disk_cache
+        if self.image_util.icon_disk_cache != None:
+            caches[TASK_ICONS] = self.image_util.icon_disk_cache
+        return caches
+
+    def run(self, blur_radiuses=None):
+        """ Execute all tasks
+
+        :param blur_radiuses: additional blur radiuses for backgrounds
+
+        :return: dictionary with results
+        """
+        caches = self.get_caches()
+        files_before = {name: set([f[2] for f in cache.get_files()]) for name, cache in caches.items()}
+        tasks = self.get_tasks(blur_radiuses)
+        results = {}
+        start = timer()
+
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=self.workers, mp_context=context, initializer=init_worker) as executor:
+            futures = [executor.submit(run_task, task) for task in tasks]
+            for future in as_completed(futures):
+                task_type, items, errors, t = future.result()
+                r = results.setdefault(task_type, {ITEMS: 0, ERRORS: 0, TIME: 0})
+                r[ITEMS] += items
+                r[ERRORS] += errors
+                r[TIME] += t
+                logging.debug(f"""{task_type}: {items} items, {errors} errors, {t:.3f} sec""")
+
+        for name, cache in caches.items():
+            built = [f for f in cache.get_files() if f[2] not in files_before[name]]
+            r = results.setdefault(name, {ITEMS: 0, ERRORS: 0, TIME: 0})
+            r[BUILT] = len(built)
+            r[BYTES] = sum([f[1] for f in built])
+
+        for r in results.values():
+            r[TIME] = round(r[TIME], 3)
+
+        return {
+            "workers": self.workers,
+            "tasks": len(tasks),
+            "time": round(timer() - start, 3),
+            "results": results
+        }
+
+def main():
+    import argparse
+    log_handler = logging.StreamHandler(sys.stderr)
+    logging.basicConfig(
+        level=logging.INFO,
+        format='[%(asctime)s] {%(filename)s:%(lineno)d} %(levelname)s - %(message)s',
+        handlers=[log_handler]
+    )
+    usage = """python -m util.cachewarmer [args]"""
+    examples = """Should be started in the player folder. Icons are rasterized using the manifest of the icons
+    requested by the player before (cache/icons.json), the manifest can be copied from another device with the same screen.
+
+Examples:
+    python -m util.cachewarmer
+        pre-generate backgrounds, icons and flip clock digits for the current configuration using all cores
+    python -m util.cachewarmer -w 2 -b 10 20
+        use 2 processes, also prepare backgrounds with blur radiuses 10 and 20
+    """
+    parser = argparse.ArgumentParser(
+        usage=usage,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=examples
+    )
+    parser.add_argument("-w", help="number of worker processes", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("-b", help="additional background blur radiuses", type=int, nargs="+", default=[])
+    args = parser.parse_args()
+
+    warmer = CacheWarmer(get_util(), args.w)
+    report = warmer.run(args.b)
+    print(json.dumps(report, indent=2))
+
+if __name__ == '__main__':
+    main()
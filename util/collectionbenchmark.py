@@ -0,0 +1,497 @@
+# Copyright 2026 Peppy Player peppy.player@gmail.com
+#
+# This file is part of Peppy Player.
+#
+# Peppy Player is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Peppy Player is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Peppy Player. If not, see <http://www.gnu.org/licenses/>.
+
+import os
+import sys
+import json
+import time
+import random
+import shutil
+import struct
+import logging
+import platform
+import sqlite3
+
+from timeit import default_timer as timer
+from util.collector import Collector, TOPICS, GENRE, ARTIST, COMPOSER, ALBUM, TITLE, DATE, TOTAL_FILES
+from util.selector import Selector
+from util.keys import KEY_LIST, KEY_ABC, KEY_SEARCH
+
+LIBRARY_SIZES = {"1k": 1000, "10k": 10000, "100k": 100000, "500k": 500000}
+FILE_TYPES = ["mp3", "flac", "m4a"]
+FILES_PER_ALBUM = 10
+ALBUMS_PER_ARTIST = 4
+COMPOSER_RATIO = 0.3
+UPDATE_RATIO = 0.01
+DELETE_RATIO = 0.005
+ADD_RATIO = 0.005
+PAGE_SIZE = 10
+REPEAT = 5
+SEED = 1
+RESULTS_FORMAT_VERSION = 1
+DB_FILENAME = "collection.db"
+LIBRARY_FOLDER = "library"
+NEW_FILES_FOLDER = "new"
+
+GENRES = ["Rock", "Pop", "Jazz", "Classical", "Electronic", "Hip-Hop", "Blues", "Country", "Folk", "Reggae",
+    "Soul", "Funk", "Metal", "Punk", "Latin", "Ambient", "Soundtrack", "World", "R&B", "Disco", "Gospel", "Ska",
+    "Chanson", "Schlager"]
+WORDS = ["love", "night", "dream", "blue", "river", "fire", "heart", "city", "Über", "café", "light", "rain",
+    "summer", "road", "Ångström", "moon", "sky", "dance", "gold", "wind", "señor", "winter", "star", "home",
+    "ocean", "shadow", "garden", "Łódź", "silver", "time", "fever", "echo"]
+FIRST_NAMES = ["John", "Anna", "Miles", "Ella", "Björk", "Nina", "Frank", "Édith", "Chet", "Aretha", "Ray", "Joni"]
+LAST_NAMES = ["Smith", "Davis", "Fitzgerald", "Simone", "Baker", "Piaf", "Franklin", "Charles", "Mitchell",
+    "Müller", "Young", "King"]
+
+MP3_FRAME = b"\xff\xfb\x90\x00" + bytes(413)
+MP3_FRAMES = 4
+ID3_FRAMES = {GENRE: b"TCON", ALBUM: b"TALB", COMPOSER: b"TCOM", ARTIST: b"TPE1", TITLE: b"TIT2", DATE: b"TDRC"}
+MP4_ATOMS = {GENRE: b"\xa9gen", ALBUM: b"\xa9alb", COMPOSER: b"\xa9wrt", ARTIST: b"\xa9ART", TITLE: b"\xa9nam",
+    DATE: b"\xa9day"}
+SAMPLE_RATE = 44100
+TOTAL_SAMPLES = 44100
+
+def get_syncsafe(n):
+    """ Encode the number as ID3v2 syncsafe integer
+
+    :param n: number
+
+    :return: 4 bytes
+    """
+    return bytes([(n >> 21) & 0x7f, (n >> 14) & 0x7f, (n >> 7) & 0x7f, n & 0x7f])
+
+def get_mp3(tags):
+    """ Create MP3 file content: ID3v2.4 tag followed by a few silent MPEG frames
+
+    :param tags: dictionary with tags
+
+    :return: file content
+    """
+    frames = b""
+    for key, frame_id in ID3_FRAMES.items():
+        v = tags.get(key, None)
+        if v:
+            data = b"\x03" + v.encode("utf-8")
+            frames += frame_id + get_syncsafe(len(data)) + b"\x00\x00" + data
+    header = b"ID3\x04\x00\x00" + get_syncsafe(len(frames))
+    return header + frames + MP3_FRAME * MP3_FRAMES
+
+def get_flac(tags):
+    """ Create FLAC file content: STREAMINFO and VORBIS_COMMENT metadata blocks without audio frames
+
+    :param tags: dictionary with tags
+
+    :return: file content
+    """
+    info = struct.pack(">HH", 4096, 4096) + bytes(6)
+    info += ((SAMPLE_RATE << 44) | (1 << 41) | (15 << 36) | TOTAL_SAMPLES).to_bytes(8, "big") + bytes(16)
+
+    vendor = b"peppy"
+    comments = [f"{k.upper()}={v}".encode("utf-8") for k, v in tags.items() if v]
+    block = struct.pack("<I", len(vendor)) + vendor + struct.pack("<I", len(comments))
+    for c in comments:
+        block += struct.pack("<I", len(c)) + c
+
+    content = b"fLaC"
+    content += bytes([0]) + len(info).to_bytes(3, "big") + info
+    content += bytes([0x80 | 4]) + len(block).to_bytes(3, "big") + block
+    return content
+
+def get_atom(name, data):
+    """ Create MP4 atom
+
+    :param name: atom name
+    :param data: atom content
+
+    :return: atom bytes
+    """
+    return struct.pack(">I", len(data) + 8) + name + data
+
+def get_m4a(tags):
+    """ Create M4A file content: movie header, one audio track and iTunes metadata
+
+    :param tags: dictionary with tags
+
+    :return: file content
+    """
+    mvhd = get_atom(b"mvhd", bytes(12) + struct.pack(">II", SAMPLE_RATE, TOTAL_SAMPLES) + bytes(80))
+    mdhd = get_atom(b"mdhd", bytes(12) + struct.pack(">II", SAMPLE_RATE, TOTAL_SAMPLES) + bytes(4))
+    hdlr = get_atom(b"hdlr", bytes(8) + b"soun" + bytes(13))
+    trak = get_atom(b"trak", get_atom(b"mdia", mdhd + hdlr))
+
+    items = b""
+    for key, name in MP4_ATOMS.items():
+        v = tags.get(key, None)
+        if v:
+            items += get_atom(name, get_atom(b"data", struct.pack(">II", 1, 0) + v.encode("utf-8")))
+    meta_hdlr = get_atom(b"hdlr", bytes(8) + b"mdirappl" + bytes(9))
+    udta = get_atom(b"udta", get_atom(b"meta", bytes(4) + meta_hdlr + get_atom(b"ilst", items)))
+
+    ftyp = get_atom(b"ftyp", b"M4A " + bytes(4) + b"M4A isommp42")
+    return ftyp + get_atom(b"moov", mvhd + trak + udta)
+
+FILE_CONTENT = {"mp3": get_mp3, "flac": get_flac, "m4a": get_m4a}
+
+class SyntheticLibrary(object):
+    """ Generates the tree of tiny tagged audio files with controlled tag distributions """
+
+    def __init__(self, folder, total_files, seed=SEED):
+        """ Initializer
+
+        :param folder: library root folder
+        :param total_files: number of audio files
+        :param seed: random seed, the same seed produces the same library
+        """
+        self.folder = folder
+        self.total_files = total_files
+        self.random = random.Random(seed)
+        total_albums = max(1, total_files // FILES_PER_ALBUM)
+        total_artists = max(1, total_albums // ALBUMS_PER_ARTIST)
+        self.artists = [self.get_name(i) for i in range(total_artists)]
+        self.composers = [self.get_name(i + total_artists) for i in range(max(1, total_artists // 4))]
+        self.genre_weights = [1.0 / (i + 1) for i in range(len(GENRES))]
+        self.files = []
+
+    def get_name(self, n):
+        """ Get unique person name
+
+        :param n: person index
+
+        :return: name
+        """
+        first = FIRST_NAMES[n % len(FIRST_NAMES)]
+        last = LAST_NAMES[(n // len(FIRST_NAMES)) % len(LAST_NAMES)]
+        return f"{first} {last} {n // (len(FIRST_NAMES) * len(LAST_NAMES)) + 1}"
+
+    def get_words(self, count):
+        """ Get random words
+
+        :param count: number of words
+
+        :return: capitalized words separated by space
+        """
+        return " ".join([self.random.choice(WORDS) for _ in range(count)]).capitalize()
+
+    def get_tags(self, artist, album, genre, date, track):
+        """ Get tags of one track
+
+        :param artist: album artist
+        :param album: album name
+        :param genre: album genre
+        :param date: album date
+        :param track: track number
+
+        :return: dictionary with tags
+        """
+        tags = {
+            GENRE: genre,
+            ARTIST: artist,
+            ALBUM: album,
+            TITLE: f"{self.get_words(self.random.randint(1, 3))} {track}",
+            DATE: date
+        }
+        if self.random.random() < COMPOSER_RATIO:
+            tags[COMPOSER] = self.random.choice(self.composers)
+        return tags
+
+    def create(self):
+        """ Create the library. Genres follow Zipf distribution, artists have the same number of albums. """
+
+        if os.path.isdir(self.folder):
+            shutil.rmtree(self.folder)
+
+        n = 0
+        album_index = 0
+        while n < self.total_files:
+            artist = self.artists[(album_index // ALBUMS_PER_ARTIST) % len(self.artists)]
+            album = f"{self.get_words(2)} {album_index}"
+            genre = self.random.choices(GENRES, self.genre_weights)[0]
+            date = str(self.random.randint(1950, 2025))
+            ext = FILE_TYPES[album_index % len(FILE_TYPES)]
+            album_folder = os.path.join(self.folder, f"artist{album_index // ALBUMS_PER_ARTIST:06d}", f"album{album_index:06d}")
+            os.makedirs(album_folder)
+
+            for track in range(1, FILES_PER_ALBUM + 1):
+                if n == self.total_files:
+                    break
+                path = os.path.join(album_folder, f"{track:02d}.{ext}")
+                self.write_file(path, self.get_tags(artist, album, genre, date, track))
+                n += 1
+            album_index += 1
+
+    def write_file(self, path, tags):
+        """ Write audio file
+
+        :param path: file path
+        :param tags: dictionary with tags
+        """
+        ext = path[path.rfind(".") + 1:]
+        with open(path, "wb") as f:
+            f.write(FILE_CONTENT[ext](tags))
+        self.files.append(path)
+
+    def modify(self, update_ratio=UPDATE_RATIO, delete_ratio=DELETE_RATIO, add_ratio=ADD_RATIO):
+        """ Change the library: retag, delete and add files
+
+        :param update_ratio: share of the files with new tags
+        :param delete_ratio: share of the deleted files
+        :param add_ratio: share of the added files
+
+        :return: tuple (updated, deleted, added)
+        """
+        files = list(self.files)
+        self.random.shuffle(files)
+        updated = files[:int(len(files) * update_ratio)]
+        deleted = files[len(updated):len(updated) + int(len(files) * delete_ratio)]
+        added = int(len(files) * add_ratio)
+
+        for path in updated:
+            tags = self.get_tags(self.random.choice(self.artists), self.get_words(3), self.random.choice(GENRES), "2026", 1)
+            self.files.remove(path)
+            self.write_file(path, tags)
+            t = time.time() + 10
+            os.utime(path, (t, t))
+
+        for path in deleted:
+            os.remove(path)
+            self.files.remove(path)
+
+        folder = os.path.join(self.folder, NEW_FILES_FOLDER)
+        os.makedirs(folder, exist_ok=True)
+        for n in range(added):
+            ext = FILE_TYPES[n % len(FILE_TYPES)]
+            tags = self.get_tags(self.random.choice(self.artists), self.get_words(2), self.random.choice(GENRES), "2026", n)
+            self.write_file(os.path.join(folder, f"{n:06d}.{ext}"), tags)
+
+        return (len(updated), len(deleted), added)
+
+class CollectionBenchmark(object):
+    """ Measures collection creation, update, summary and selector queries on synthetic libraries """
+
+    def __init__(self, work_folder, workers=1, repeat=REPEAT, page_size=PAGE_SIZE):
+        """ Initializer
+
+        :param work_folder: folder for generated libraries and databases
+        :param workers: number of metadata parsing processes
+        :param repeat: number of runs for each query
+        :param page_size: page size for selector queries
+        """
+        self.work_folder = work_folder
+        self.workers = workers
+        self.repeat = repeat
+        self.page_size = page_size
+        self.results = []
+
+    def add_result(self, size, name, times, rows=None):
+        """ Add measurement
+
+        :param size: library size name
+        :param name: measured operation
+        :param times: list of execution times in seconds
+        :param rows: number of rows returned by the operation (if any)
+        """
+        times = sorted(times)
+        result = {
+            "size": size,
+            "name": name,
+            "runs": len(times),
+            "min": times[0],
+            "median": times[len(times) // 2],
+            "max": times[-1]
+        }
+        if rows != None:
+            result["rows"] = rows
+        self.results.append(result)
+        logging.debug(f"""{size} {name}: {result["median"]:.6f} sec""")
+
+    def measure(self, size, name, function, repeat=1):
+        """ Run the function several times and add its execution time to the results
+
+        :param size: library size name
+        :param name: measured operation
+        :param function: function without parameters
+        :param repeat: number of runs
+
+        :return: result of the last run
+        """
+        times = []
+        r = None
+        for _ in range(repeat):
+            start = timer()
+            r = function()
+            times.append(timer() - start)
+
+        rows = None
+        if isinstance(r, (list, tuple)):
+            rows = len(r)
+        elif isinstance(r, int):
+            rows = r
+        self.add_result(size, name, times, rows)
+        return r
+
+    def run(self, size_name, total_files):
+        """ Run all benchmarks for one library size
+
+        :param size_name: library size name
+        :param total_files: number of audio files
+        """
+        folder = os.path.join(self.work_folder, size_name)
+        library_folder = os.path.join(folder, LIBRARY_FOLDER)
+        db_filename = os.path.join(folder, DB_FILENAME)
+
+        library = SyntheticLibrary(library_folder, total_files)
+        self.measure(size_name, "generate_library", library.create)
+        if os.path.isfile(db_filename):
+            os.remove(db_filename)
+
+        collector = Collector(db_filename)
+        total_folders = collector.count_folders(library_folder, False)[0]
+        self.measure(size_name, "create_collection",
+            lambda: collector.create_collection(library_folder, total_folders, db_filename, workers=self.workers)[TOTAL_FILES])
+        self.measure(size_name, "create_summary", lambda: collector.create_summary(library_folder))
+
+        self.run_selector_benchmarks(size_name, Selector(collector.dbutil))
+
+        self.measure(size_name, "update_collection_unchanged",
+            lambda: collector.update_collection(library_folder, total_folders, workers=self.workers)[TOTAL_FILES])
+        library.modify()
+        total_folders = collector.count_folders(library_folder, False)[0]
+        self.measure(size_name, "update_collection",
+            lambda: collector.update_collection(library_folder, total_folders, workers=self.workers)[TOTAL_FILES])
+
+        self.add_database_size(size_name, db_filename)
+        collector.dbutil.disconnect()
+
+    def add_database_size(self, size_name, db_filename):
+        """ Add database file size to the results
+
+        :param size_name: library size name
+        :param db_filename: database filename
+        """
+        size = 0
+        for f in [db_filename, db_filename + "-wal"]:
+            if os.path.isfile(f):
+                size += os.path.getsize(f)
+        self.results.append({"size": size_name, "name": "database_size", "bytes": size})
+
+    def run_selector_benchmarks(self, size_name, selector):
+        """ Measure selector queries for all topics
+
+        :param size_name: library size name
+        :param selector: selector object
+        """
+        p = self.page_size
+        r = self.repeat
+
+        for topic in TOPICS:
+            prefix = f"selector.{topic}."
+            total_pages = self.measure(size_name, prefix + "page_count", lambda: selector.get_page_count(topic, p), r)
+            first_page = self.measure(size_name, prefix + "first_page",
+                lambda: selector.get_topic_page(KEY_LIST, topic, None, 1, 0, None, None, p), r)
+            if not first_page:
+                continue
+            self.measure(size_name, prefix + "next_page",
+                lambda: selector.get_topic_page(KEY_LIST, topic, None, 2, 1, first_page[0], first_page[-1], p), r)
+            middle = max(1, total_pages // 2)
+            self.measure(size_name, prefix + "middle_page",
+                lambda: selector.get_topic_page(KEY_LIST, topic, None, middle, 0, None, None, p), r)
+            self.measure(size_name, prefix + "last_page",
+                lambda: selector.get_topic_page(KEY_LIST, topic, None, total_pages, 0, None, None, p), r)
+
+            ch = first_page[-1][0]
+            self.measure(size_name, prefix + "abc_page_count", lambda: selector.get_page_count_by_char(topic, ch, p), r)
+            self.measure(size_name, prefix + "abc_page",
+                lambda: selector.get_topic_page(KEY_ABC, topic, ch, 1, 0, None, None, p), r)
+
+            pattern = first_page[-1].split()[0][:4]
+            self.measure(size_name, prefix + "search_page_count",
+                lambda: selector.get_page_count_by_pattern(topic, pattern, p), r)
+            self.measure(size_name, prefix + "search_page",
+                lambda: selector.get_topic_page(KEY_SEARCH, topic, pattern, 1, 0, None, None, p), r)
+
+            value = first_page[-1]
+            self.measure(size_name, prefix + "detail_page_count",
+                lambda: selector.get_page_count_by_column(topic, value, p), r)
+            folders = self.measure(size_name, prefix + "detail_page",
+                lambda: selector.get_topic_detail_page(topic, value, 1, 0, None, None, p), r)
+
+            if topic == TITLE and folders:
+                folder = folders[0]
+                self.measure(size_name, "selector.filename_by_title",
+                    lambda: selector.get_filename_by_title(folder, value), r)
+
+    def get_report(self):
+        """ Get machine-readable benchmark report
+
+        :return: dictionary with environment and results
+        """
+        return {
+            "format": RESULTS_FORMAT_VERSION,
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "python": platform.python_version(),
+            "sqlite": sqlite3.sqlite_version,
+            "platform": platform.platform(),
+            "machine": platform.machine(),
+            "workers": self.workers,
+            "repeat": self.repeat,
+            "page_size": self.page_size,
+            "results": self.results
+        }
+
+def main():
+    import argparse
+    log_handler = logging.StreamHandler(sys.stderr)
+    logging.basicConfig(
+        level=logging.INFO,
+        format='[%(asctime)s] {%(filename)s:%(lineno)d} %(levelname)s - %(message)s',
+        handlers=[log_handler]
+    )
+    usage = """python -m util.collectionbenchmark [args]"""
+    examples = """Examples:
+    python -m util.collectionbenchmark -f /tmp/bench
+        run benchmarks for 1k and 10k files libraries, print JSON results
+    python -m util.collectionbenchmark -f /tmp/bench -s 1k 10k 100k 500k -w 4 -o results.json
+        run benchmarks for all library sizes parsing metadata in 4 processes, save JSON results to the file
+    """
+    parser = argparse.ArgumentParser(
+        usage=usage,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=examples
+    )
+    parser.add_argument("-f", help="work folder for generated libraries and databases", required=True)
+    parser.add_argument("-s", help="library sizes", nargs="+", choices=LIBRARY_SIZES.keys(), default=["1k", "10k"])
+    parser.add_argument("-w", help="number of metadata parsing processes", type=int, default=1)
+    parser.add_argument("-r", help="number of runs for each query", type=int, default=REPEAT)
+    parser.add_argument("-o", help="results filename, results are printed if not defined")
+    parser.add_argument("-k", help="keep generated libraries and databases", action="store_true")
+    args = parser.parse_args()
+
+    benchmark = CollectionBenchmark(args.f, args.w, args.r)
+    for size in args.s:
+        benchmark.run(size, LIBRARY_SIZES[size])
+        if not args.k:
+            shutil.rmtree(os.path.join(args.f, size), ignore_errors=True)
+
+    report = json.dumps(benchmark.get_report(), indent=2)
+    if args.o:
+        with open(args.o, "w") as f:
+            f.write(report)
+    else:
+        print(report)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,322 @@
+# Copyright 2026 Peppy Player peppy.player@gmail.com
+#
+# This file is part of Peppy Player.
+#
+# Peppy Player is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Peppy Player is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Peppy Player. If not, see <http://www.gnu.org/licenses/>.
+
+import os
+import sys
+import time
+import errno
+import struct
+import select
+import logging
+import ctypes
+import ctypes.util
+
+from threading import Thread
+from util.collector import Collector, EXTENSIONS, TOTAL_FILES, FOLDER_IMAGES
+
+DEBOUNCE_PERIOD = 2.0
+POLLING_PERIOD = 60.0
+SELECT_TIMEOUT = 0.5
+
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF | IN_ONLYDIR
+EVENT_HEADER = "iIII"
+EVENT_HEADER_SIZE = struct.calcsize(EVENT_HEADER)
+READ_BUFFER_SIZE = 65536
+
+class InotifyMonitor(object):
+    """ Watches the folder tree using Linux inotify API """
+
+    def __init__(self, base_folder):
+        """ Initializer
+
+        :param base_folder: root of the watched tree
+        """
+        self.base_folder = base_folder
+        self.libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self.fd = self.libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.watches = {}
+        self.add_watches(base_folder)
+
+    def add_watches(self, folder):
+        """ Add watches for the folder and all its subfolders
+
+        :param folder: folder path
+        """
+        for current_folder, _, _ in os.walk(folder, followlinks=True):
+            wd = self.libc.inotify_add_watch(self.fd, os.fsencode(current_folder), WATCH_MASK)
+            if wd < 0:
+                e = ctypes.get_errno()
+                if e == errno.ENOSPC:
+                    raise OSError(e, "Maximum number of inotify watches reached")
+                logging.debug(f"""Cannot watch folder {current_folder}: {os.strerror(e)}""")
+                continue
+            self.watches[wd] = current_folder
+
+    def remove_watches(self, folder):
+        """ Remove watches of the folder and all its subfolders
+
+        :param folder: folder path
+        """
+        prefix = folder + os.sep
+        for wd, path in list(self.watches.items()):
+            if path == folder or path.startswith(prefix):
+                self.libc.inotify_rm_watch(self.fd, wd)
+                del self.watches[wd]
+
+    def get_changes(self, timeout):
+        """ Wait for file system events
+
+        :param timeout: maximum waiting time in seconds
+
+        :return: list of tuples (absolute folder path, recursive), None if the event queue overflowed
+        """
+        changes = []
+        r, _, _ = select.select([self.fd], [], [], timeout)
+        if not r:
+            return changes
+
+        try:
+            data = os.read(self.fd, READ_BUFFER_SIZE)
+        except BlockingIOError:
+            return changes
+
+        i = 0
+        while i + EVENT_HEADER_SIZE <= len(data):
+            wd, mask, _, length = struct.unpack_from(EVENT_HEADER, data, i)
+            name = os.fsdecode(data[i + EVENT_HEADER_SIZE : i + EVENT_HEADER_SIZE + length].rstrip(b"\0"))
+            i += EVENT_HEADER_SIZE + length
+
+            if mask & IN_Q_OVERFLOW:
+                return None
+
+            folder = self.watches.get(wd)
+            if mask & IN_IGNORED:
+                self.watches.pop(wd, None)
+                continue
+            if folder == None:
+                continue
+
+            if mask & (IN_DELETE_SELF | IN_MOVE_SELF):
+                changes.append((folder, True))
+            elif mask & IN_ISDIR:
+                path = os.path.join(folder, name)
+                if mask & (IN_CREATE | IN_MOVED_TO):
+                    self.add_watches(path)
+                elif mask & IN_MOVED_FROM:
+                    self.remove_watches(path)
+                changes.append((path, True))
+            elif name.lower().endswith(EXTENSIONS):
+                changes.append((folder, False))
+
+        return changes
+
+    def close(self):
+        """ Release inotify file descriptor """
+
+        os.close(self.fd)
+
+class PollingMonitor(object):
+    """ Detects changes by comparing folder modification times periodically """
+
+    def __init__(self, base_folder, period=POLLING_PERIOD):
+        """ Initializer
+
+        :param base_folder: root of the watched tree
+        :param period: polling period in seconds
+        """
+        self.base_folder = base_folder
+        self.period = period
+        self.last_poll = time.time()
+        self.folders = self.get_folders()
+
+    def get_folders(self):
+        """ Get modification time of all folders in the tree
+
+        :return: dictionary folder -> modification time
+        """
+        folders = {}
+        for current_folder, _, _ in os.walk(self.base_folder, followlinks=True):
+            try:
+                folders[current_folder] = os.stat(current_folder).st_mtime
+            except Exception as e:
+                logging.debug(e)
+        return folders
+
+    def get_changes(self, timeout):
+        """ Compare folder modification times with the previous state
+
+        :param timeout: maximum waiting time in seconds
+
+        :return: list of tuples (absolute folder path, recursive)
+        """
+        if time.time() - self.last_poll < self.period:
+            time.sleep(timeout)
+            return []
+
+        self.last_poll = time.time()
+        folders = self.get_folders()
+        changes = [(f, False) for f, mtime in folders.items() if self.folders.get(f) != mtime]
+        changes.extend([(f, False) for f in self.folders.keys() if f not in folders])
+        self.folders = folders
+        return changes
+
+    def close(self):
+        """ Nothing to release """
+
+        pass
+
+class CollectionWatcher(object):
+    """ Background service which applies file system changes in the collection base folder to the database """
+
+    def __init__(self, base_folder, dbutil, debounce_period=DEBOUNCE_PERIOD, polling_period=POLLING_PERIOD, folder_images=FOLDER_IMAGES):
+        """ Initializer
+
+        :param base_folder: collection base folder
+        :param dbutil: database utility object
+        :param debounce_period: time in seconds without new events before the database update
+        :param polling_period: folder polling period in seconds if inotify is not available
+        :param folder_images: folder image file names used as artwork
+        """
+        if base_folder.endswith(os.sep):
+            base_folder = base_folder[:-1]
+        self.base_folder = base_folder
+        self.collector = Collector(dbutil=dbutil, folder_images=folder_images)
+        self.debounce_period = debounce_period
+        self.polling_period = polling_period
+        self.listeners = []
+        self.monitor = None
+        self.running = False
+        self.thread = None
+
+    def add_listener(self, listener):
+        """ Add listener called after the collection was changed
+
+        :param listener: listener function without parameters
+        """
+        if listener not in self.listeners:
+            self.listeners.append(listener)
+
+    def notify_listeners(self):
+        """ Notify all listeners about collection change """
+
+        for listener in self.listeners:
+            try:
+                listener()
+            except Exception as e:
+                logging.debug(e)
+
+    def get_monitor(self):
+        """ Create inotify monitor on Linux, polling monitor otherwise
+
+        :return: file system monitor
+        """
+        if sys.platform.startswith("linux"):
+            try:
+                m = InotifyMonitor(self.base_folder)
+                logging.debug(f"""Watching collection folder {self.base_folder} using inotify""")
+                return m
+            except Exception as e:
+                logging.debug(f"""Inotify is not available: {e}""")
+
+        logging.debug(f"""Polling collection folder {self.base_folder}""")
+        return PollingMonitor(self.base_folder, self.polling_period)
+
+    def start(self):
+        """ Start watching in the background thread """
+
+        if self.running:
+            return
+
+        self.running = True
+        self.thread = Thread(target=self.watch_thread, daemon=True)
+        self.thread.start()
+
+    def watch_thread(self):
+        """ Thread method. Collects changes and applies them after the debounce period. """
+
+        try:
+            self.monitor = self.get_monitor()
+        except Exception as e:
+            logging.debug(e)
+            self.running = False
+            return
+
+        pending = {}
+        last_event = 0
+
+        while self.running:
+            try:
+                changes = self.monitor.get_changes(SELECT_TIMEOUT)
+            except Exception as e:
+                logging.debug(e)
+                changes = None
+
+            if changes == None:
+                pending = {self.base_folder: True}
+                last_event = time.time()
+            elif changes:
+                for folder, recursive in changes:
+                    pending[folder] = pending.get(folder, False) or recursive
+                last_event = time.time()
+
+            if pending and time.time() - last_event >= self.debounce_period:
+                self.apply_changes(pending)
+                pending = {}
+
+        self.monitor.close()
+
+    def apply_changes(self, pending):
+        """ Apply changes in the folders to the database
+
+        :param pending: dictionary folder -> recursive
+        """
+        recursive_folders = [f for f, r in pending.items() if r]
+        folders = []
+        for folder, recursive in pending.items():
+            covered = any(folder != f and folder.startswith(f + os.sep) for f in recursive_folders)
+            if not covered:
+                folders.append((folder, recursive))
+
+        logging.debug(f"""Updating collection folders: {folders}""")
+        try:
+            stats = self.collector.update_folders(self.base_folder, folders)
+        except Exception as e:
+            logging.debug(e)
+            return
+
+        if stats and stats[TOTAL_FILES]:
+            self.notify_listeners()
+
+    def stop(self):
+        """ Stop watching """
+
+        self.running = False
@@ -19,16 +19,27 @@ import os
 import sys
 import logging
 import sqlite3
-
+import queue
+
+from collections import deque
+from threading import RLock, Lock
+from urllib.request import pathname2url
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
+from itertools import repeat
 from timeit import default_timer as timer
 from datetime import timedelta
 from mutagen import File
 from mutagen.mp4 import MP4
+from PIL import Image
 
 # DB Util constants
 
 DEFAULT_TABLE_NAME = "metadata"
 DEFAULT_SUMMARY_TABLE_NAME = "summary"
+DEFAULT_FTS_TABLE_NAME = "metadata_fts"
+DEFAULT_ARTWORK_TABLE_NAME = "artwork"
+DEFAULT_CHECKPOINT_TABLE_NAME = "checkpoint"
 FOLDER = "folder"
 FILENAME = "filename"
 TYPE = "type"
@@ -39,6 +50,8 @@ ARTIST = "artist"
 PERFORMER = "performer"
 TITLE = "title"
 DATE = "date"
+SIZE = "size"
+MTIME = "mtime"
 BASEFOLDER = "basefolder"
 ORIGINOS = "originos"
 EXTENSIONS = (".aac", ".ac3", ".aiff", ".ape", ".flac", ".m4a", ".mp3", ".ogg", ".opus", ".wav", ".wma", ".wv")
@@ -47,7 +60,24 @@ MP4_METADATA = ["\xa9gen", "\xa9alb", "\xa9wrt", "\xa9ART", "aART", "\xa9nam", "
 INFO = ["sample_rate", "channels", "bits_per_sample", "length", "bitrate"]
 ALL_METADATA = [FOLDER, FILENAME, TYPE]
 ALL_METADATA.extend(METADATA + INFO)
+FILE_STAT = [SIZE, MTIME]
 SUMMARY = [BASEFOLDER, ORIGINOS, GENRE, ARTIST, COMPOSER, ALBUM, TITLE, DATE, TYPE, FOLDER, FILENAME]
+TOPICS = [GENRE, ARTIST, COMPOSER, ALBUM, TITLE, DATE, FOLDER, FILENAME, TYPE]
+FTS_COLUMNS = [ARTIST, ALBUM, TITLE, COMPOSER]
+KEY_SUFFIX = "_key"
+TOPIC_TRIGGERS = ["insert", "delete", "update"]
+SCHEMA_VERSION = 6
+READ_CONNECTIONS = 3
+STATEMENT_CACHE_SIZE = 256
+BUSY_TIMEOUT = 30.0
+SLOW_QUERY_TIME = 0.1
+QUERY_COUNT = "count"
+QUERY_TOTAL_TIME = "total_time"
+QUERY_MAX_TIME = "max_time"
+ARTWORK_SIZES = [128, 256, 512]
+ARTWORK_QUALITY = 85
+ARTWORK_PROBE_FILES = 3
+FOLDER_IMAGES = ["folder.jpg", "folder.png", "cover.jpg", "cover.png", "front.jpg", "front.png"]
 
 # Collector constants
 
@@ -60,6 +90,11 @@ ESTIMATED_DISK_SPACE = "Estimated disk space for metadata database (bytes): "
 FILES = "files"
 TOTAL_TRACKS = "total tracks"
 TOTAL_FILES = "Total audio files: "
+ADDED_FILES = "Added files: "
+ARTWORK_FOLDERS = "Folders with artwork: "
+RESUMED_FOLDERS = "Folders restored from checkpoint: "
+UPDATED_FILES = "Updated files: "
+REMOVED_FILES = "Removed files: "
 FILES_STATISTICS = "Files Statistics"
 METADATA_STATISTICS = "Metadata Statistics"
 DATABASE_STATISTICS = "Database Statistics"
@@ -75,40 +110,417 @@ PROGRESS_BAR_SUFFIX = "Complete"
 PROGRESS_BAR_LENGTH = 50
 BATCH_SIZE = 300
 FILE_BATCH_SIZE = 50
+IN_FLIGHT_BATCHES_PER_WORKER = 2
 FULL_BLOCK_CHARACTER = chr(9608)
 ADDED_PREFIX = "Added:"
+UPDATED_PREFIX = "Updated:"
+REMOVED_PREFIX = "Removed:"
 ADDED_SUFFIX = "file"
 UPDATE_TIME = "Update time (h:mm:ss):"
+REMAINING_TIME = "Remaining (h:mm:ss):"
+
+def get_key(value):
+    """ Get normalized (trimmed and lower case) value used for sorting and searching
+
+    :param value: column value
+
+    :return: normalized value or None
+    """
+    if value == None:
+        return None
+    return str(value).strip().lower()
+
+def get_key_column(column):
+    """ Get the name of the normalized column
+
+    :param column: topic column name
+
+    :return: normalized column name
+    """
+    return column + KEY_SUFFIX
+
+def get_file_stat(path):
+    """ Get file size and modification time used to detect changed files
+
+    :param path: file path
+
+    :return: list [size, mtime]
+    """
+    try:
+        st = os.stat(path)
+        return [st.st_size, int(st.st_mtime)]
+    except Exception as e:
+        logging.debug(e)
+        return [None, None]
+
+def get_file_metadata(folder, filename, ext, meta):
+    """ Prepare audio file metadata
+
+    :param folder: file folder
+    :param filename: file name
+    :param ext: file extension
+    :param meta: file metadata from mutagen
+
+    :return: file metadata list of values for insert
+    """
+    metadata = []
+
+    if not folder: # file in the base folder
+        folder = os.sep
+
+    metadata.append(folder)
+    metadata.append(filename)
+    metadata.append(ext)
+
+    if meta == None:
+        for _ in range(len(ALL_METADATA) - len(metadata)):
+            metadata.append(None)
+        return metadata
+
+    if filename.lower().endswith(".mp4") or filename.lower().endswith(".m4a"):
+        m = MP4_METADATA
+    else:
+        m = METADATA
+
+    for key in m:
+        if meta and (key not in meta.keys() or len(meta[key][0].replace(" ", "").strip()) == 0):
+            v = None
+        else:
+            v = meta[key][0].strip()
+        metadata.append(v)
+
+    if hasattr(meta, "info"):
+        for key in INFO:
+            metadata.append(getattr(meta.info, key, None))
+    else:
+        for _ in INFO:
+            metadata.append(None)
+
+    return metadata
+
+def parse_audio_file(base_folder, current_folder, file):
+    """ Parse audio file metadata using mutagen
+
+    :param base_folder: collection base folder
+    :param current_folder: file folder
+    :param file: file name
+
+    :return: tuple (file metadata list of values for insert, error message or None)
+    """
+    ext = file[file.rfind('.') + 1:]
+    ext = ext.lower()
+    meta = None
+    error = None
+    p = os.path.join(current_folder, file)
+    try:
+        if ext == "mp4" or ext == "m4a":
+            meta = MP4(p)
+        else:
+            meta = File(p, easy=True)
+    except Exception as e:
+        error = f"""Metadata parsing error in file {file}: {e}"""
+
+    meta_folder = current_folder[len(base_folder):]
+    if meta:
+        metadata = get_file_metadata(meta_folder, file, ext, meta)
+    else:
+        metadata = get_file_metadata(meta_folder, file, ext, None)
+    metadata.extend(get_file_stat(p))
+
+    return (metadata, error)
+
+def parse_audio_files(base_folder, files):
+    """ Parse metadata of the batch of audio files. Used by the worker processes.
+
+    :param base_folder: collection base folder
+    :param files: list of tuples (folder, file name)
+
+    :return: list of tuples (file metadata, error message or None)
+    """
+    return [parse_audio_file(base_folder, folder, file) for folder, file in files]
+
+def get_embedded_image(path):
+    """ Get the first image embedded into audio file
+
+    :param path: audio file path
+
+    :return: image data or None
+    """
+    try:
+        f = File(path)
+    except Exception as e:
+        logging.debug(e)
+        return None
+
+    if f == None:
+        return None
+
+    pictures = getattr(f, "pictures", None)
+    if pictures:
+        return pictures[0].data
+
+    tags = f.tags
+    if not tags:
+        return None
+
+    if hasattr(tags, "getall"):
+        frames = tags.getall("APIC")
+        if frames:
+            return frames[0].data
+    elif "covr" in tags:
+        covers = tags["covr"]
+        if covers:
+            return bytes(covers[0])
+
+    return None
+
+def create_thumbnails(data, sizes=ARTWORK_SIZES):
+    """ Downscale image to the size classes
+
+    :param data: image data
+    :param sizes: list of size classes (maximum width and height)
+
+    :return: list of tuples (size class, JPEG data)
+    """
+    thumbnails = []
+    try:
+        image = Image.open(BytesIO(data))
+        image = image.convert("RGB")
+    except Exception as e:
+        logging.debug(e)
+        return thumbnails
+
+    for size in sizes:
+        img = image.copy()
+        img.thumbnail((size, size), Image.LANCZOS)
+        buffer = BytesIO()
+        img.save(buffer, "JPEG", quality=ARTWORK_QUALITY)
+        thumbnails.append((size, buffer.getvalue()))
+    return thumbnails
+
+def get_artwork_mtime(folder_path, source):
+    """ Get the time of the last change which can affect folder artwork: 
+    the folder itself (files added or removed) or the folder image file
+
+    :param folder_path: absolute folder path
+    :param source: artwork source file name
+
+    :return: modification time or None if the folder doesn't exist
+    """
+    try:
+        mtime = int(os.stat(folder_path).st_mtime)
+        if source:
+            mtime = max(mtime, int(os.stat(os.path.join(folder_path, source)).st_mtime))
+        return mtime
+    except Exception:
+        return None
+
+def extract_folder_artwork(base_folder, folder, image_names=FOLDER_IMAGES, sizes=ARTWORK_SIZES):
+    """ Find folder artwork and create thumbnails. The folder image file has priority, 
+    then the image embedded into one of the first audio files.
+
+    :param base_folder: collection base folder
+    :param folder: folder relative to the base folder
+    :param image_names: folder image file names
+    :param sizes: list of size classes
+
+    :return: tuple (folder, source file name, modification time, list of (size class, JPEG data))
+    """
+    folder_path = os.path.join(base_folder, folder.lstrip(os.sep))
+    try:
+        files = sorted(os.listdir(folder_path))
+    except Exception as e:
+        logging.debug(e)
+        return (folder, None, None, [])
+
+    names = [n.lower() for n in image_names]
+    images = [f for f in files if f.lower() in names]
+    images.sort(key=lambda f: names.index(f.lower()))
+    for f in images:
+        try:
+            with open(os.path.join(folder_path, f), "rb") as image_file:
+                thumbnails = create_thumbnails(image_file.read(), sizes)
+            if thumbnails:
+                return (folder, f, get_artwork_mtime(folder_path, f), thumbnails)
+        except Exception as e:
+            logging.debug(e)
+
+    audio_files = [f for f in files if f.lower().endswith(EXTENSIONS)]
+    for f in audio_files[:ARTWORK_PROBE_FILES]:
+        data = get_embedded_image(os.path.join(folder_path, f))
+        if data:
+            thumbnails = create_thumbnails(data, sizes)
+            if thumbnails:
+                return (folder, f, get_artwork_mtime(folder_path, None), thumbnails)
+
+    return (folder, None, get_artwork_mtime(folder_path, None), [])
 
 class DbUtil(object):
     """ Database utility class. Keeps the connection to the database and provides utility SQL functions. """
 
-    def __init__(self, db_filename=None):
+    def __init__(self, db_filename=None, read_connections=READ_CONNECTIONS):
         """ Initializer.
 
         :param db_filename: folder and filename of the database file
+        :param read_connections: number of read-only connections in the pool
         """
         self.db_path = db_filename
+        self.read_connections = read_connections
         self.table_name = DEFAULT_TABLE_NAME
         self.summary_table_name = DEFAULT_SUMMARY_TABLE_NAME
+        self.fts_table_name = DEFAULT_FTS_TABLE_NAME
+        self.artwork_table_name = DEFAULT_ARTWORK_TABLE_NAME
+        self.checkpoint_table_name = DEFAULT_CHECKPOINT_TABLE_NAME
+        self.fts_available = False
         self.metadata_keys = METADATA
         self.info_keys = INFO
+        self.key_columns = [get_key_column(t) for t in TOPICS]
+        self.key_indexes = [ALL_METADATA.index(t) for t in TOPICS]
+        self.row_length = len(ALL_METADATA + FILE_STAT)
 
-        csv = ",".join([m + " text" for m in ALL_METADATA])
+        csv = ",".join([m + " text" for m in ALL_METADATA] + [m + " integer" for m in FILE_STAT] + \
+            [m + " text" for m in self.key_columns])
         self.CREATE_METADATA_TABLE = f"""CREATE TABLE IF NOT EXISTS {self.table_name} (id integer PRIMARY KEY,{csv});"""
 
+        self.CREATE_INDEXES = []
+        for t in TOPICS:
+            if t == FOLDER:
+                covered = FILENAME
+            else:
+                covered = FOLDER
+            self.CREATE_INDEXES.append(f"""CREATE INDEX IF NOT EXISTS idx_{self.table_name}_{t} 
+                ON {self.table_name}({get_key_column(t)},{t},{covered});""")
+
+        fts = self.fts_table_name
+        csv = ",".join(FTS_COLUMNS)
+        new_values = ",".join(["new." + c for c in FTS_COLUMNS])
+        old_values = ",".join(["old." + c for c in FTS_COLUMNS])
+        self.CREATE_FTS_TABLE = f"""CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5({csv}, 
+            content='{self.table_name}', content_rowid='id', tokenize='unicode61 remove_diacritics 2');"""
+        self.CREATE_FTS_TRIGGERS = [
+            f"""CREATE TRIGGER IF NOT EXISTS {fts}_insert AFTER INSERT ON {self.table_name} BEGIN
+                INSERT INTO {fts}(rowid,{csv}) VALUES (new.id,{new_values});
+            END;""",
+            f"""CREATE TRIGGER IF NOT EXISTS {fts}_delete AFTER DELETE ON {self.table_name} BEGIN
+                INSERT INTO {fts}({fts},rowid,{csv}) VALUES ('delete',old.id,{old_values});
+            END;""",
+            f"""CREATE TRIGGER IF NOT EXISTS {fts}_update AFTER UPDATE OF {csv} ON {self.table_name} BEGIN
+                INSERT INTO {fts}({fts},rowid,{csv}) VALUES ('delete',old.id,{old_values});
+                INSERT INTO {fts}(rowid,{csv}) VALUES (new.id,{new_values});
+            END;"""
+        ]
+
+        self.CREATE_TOPIC_TABLES = []
+        self.CREATE_TOPIC_TRIGGERS = []
+        self.REBUILD_TOPIC_TABLES = []
+        for t in TOPICS:
+            self.CREATE_TOPIC_TABLES.extend(self.get_topic_table_commands(t))
+            self.CREATE_TOPIC_TRIGGERS.extend(self.get_topic_trigger_commands(t))
+            self.REBUILD_TOPIC_TABLES.extend(self.get_rebuild_topic_table_commands(t))
+
+        self.CREATE_ARTWORK_TABLE = f"""CREATE TABLE IF NOT EXISTS {self.artwork_table_name} (folder text NOT NULL, 
+            size integer NOT NULL, source text, mtime integer, image blob, PRIMARY KEY (folder, size)) WITHOUT ROWID;"""
+        self.INSERT_ARTWORK = f"""INSERT OR REPLACE INTO {self.artwork_table_name}(folder,size,source,mtime,image) 
+            VALUES(?,?,?,?,?);"""
+        self.DELETE_ARTWORK = f"""DELETE FROM {self.artwork_table_name} WHERE folder = ?;"""
+
+        self.CREATE_CHECKPOINT_TABLE = f"""CREATE TABLE IF NOT EXISTS {self.checkpoint_table_name} 
+            (folder text PRIMARY KEY) WITHOUT ROWID;"""
+        self.INSERT_CHECKPOINT = f"""INSERT OR IGNORE INTO {self.checkpoint_table_name}(folder) VALUES(?);"""
+
         csv = ",".join([m + " text" for m in SUMMARY])
         self.CREATE_SUMMARY_TABLE = f"""CREATE TABLE IF NOT EXISTS {self.summary_table_name} ({csv});"""
 
-        csv = ",".join([m for m in ALL_METADATA])
-        values = ",".join(["?" for _ in ALL_METADATA])
+        columns = ALL_METADATA + FILE_STAT + self.key_columns
+        csv = ",".join(columns)
+        values = ",".join(["?" for _ in columns])
         self.INSERT_DATA = f"""INSERT INTO {self.table_name}({csv}) VALUES({values});"""
 
+        csv = ",".join([m + " = ?" for m in columns])
+        self.UPDATE_DATA = f"""UPDATE {self.table_name} SET {csv} WHERE id = ?;"""
+        self.UPDATE_FILE_STAT = f"""UPDATE {self.table_name} SET {SIZE} = ?, {MTIME} = ? WHERE id = ?;"""
+        self.DELETE_DATA = f"""DELETE FROM {self.table_name} WHERE id = ?;"""
+
         csv = ",".join([m for m in SUMMARY])
         values = ",".join(["?" for _ in SUMMARY])
         self.INSERT_SUMMARY_DATA = f"""INSERT INTO {self.summary_table_name}({csv}) VALUES({values});"""
 
         self.conn = None
+        self.read_pool = None
+        self.write_lock = RLock()
+        self.stats_lock = Lock()
+        self.query_stats = {}
+        self.data_changes = 0
+
+    def get_topic_table(self, topic):
+        """ Get the name of the table with distinct values of the topic
+
+        :param topic: topic column name
+
+        :return: topic table name
+        """
+        return f"{self.table_name}_{topic}"
+
+    def get_topic_table_commands(self, topic):
+        """ Get commands creating the topic table. The table keeps distinct topic values 
+        with normalized value, first character, number of tracks and number of folders.
+
+        :param topic: topic column name
+
+        :return: list of SQL commands
+        """
+        table = self.get_topic_table(topic)
+        return [
+            f"""CREATE TABLE IF NOT EXISTS {table} (value text, value_key text, first_char text, 
+                tracks integer, folders integer, PRIMARY KEY (value_key, value)) WITHOUT ROWID;""",
+            f"""CREATE INDEX IF NOT EXISTS idx_{table}_first_char ON {table}(first_char, value_key, value);"""
+        ]
+
+    def get_topic_trigger_commands(self, topic):
+        """ Get commands creating triggers which maintain the topic table on metadata changes
+
+        :param topic: topic column name
+
+        :return: list of SQL commands
+        """
+        table = self.get_topic_table(topic)
+        key = get_key_column(topic)
+        metadata = self.table_name
+        insert = f"""
+            INSERT OR IGNORE INTO {table}(value, value_key, first_char, tracks, folders) 
+                SELECT new.{topic}, new.{key}, substr(new.{key}, 1, 1), 0, 0 WHERE new.{key} > '';
+            UPDATE {table} SET tracks = tracks + 1, folders = folders + NOT EXISTS (
+                SELECT 1 FROM {metadata} WHERE {key} = new.{key} AND {topic} = new.{topic} AND folder = new.folder AND id != new.id)
+                WHERE new.{key} > '' AND value_key = new.{key} AND value = new.{topic};
+        """
+        delete = f"""
+            UPDATE {table} SET tracks = tracks - 1, folders = folders - NOT EXISTS (
+                SELECT 1 FROM {metadata} WHERE {key} = old.{key} AND {topic} = old.{topic} AND folder = old.folder AND id != old.id)
+                WHERE old.{key} > '' AND value_key = old.{key} AND value = old.{topic};
+            DELETE FROM {table} WHERE old.{key} > '' AND value_key = old.{key} AND value = old.{topic} AND tracks <= 0;
+        """
+        return [
+            f"""CREATE TRIGGER IF NOT EXISTS {table}_insert AFTER INSERT ON {metadata} BEGIN {insert} END;""",
+            f"""CREATE TRIGGER IF NOT EXISTS {table}_delete AFTER DELETE ON {metadata} BEGIN {delete} END;""",
+            f"""CREATE TRIGGER IF NOT EXISTS {table}_update AFTER UPDATE OF {topic}, {key}, folder ON {metadata} 
+                BEGIN {delete} {insert} END;"""
+        ]
+
+    def get_rebuild_topic_table_commands(self, topic):
+        """ Get commands filling the topic table from the metadata table
+
+        :param topic: topic column name
+
+        :return: list of SQL commands
+        """
+        table = self.get_topic_table(topic)
+        key = get_key_column(topic)
+        return [
+            f"""DELETE FROM {table};""",
+            f"""INSERT INTO {table}(value, value_key, first_char, tracks, folders)
+                SELECT {topic}, {key}, substr({key}, 1, 1), COUNT(*), COUNT(DISTINCT folder)
+                FROM {self.table_name} WHERE {key} > '' GROUP BY {key}, {topic};"""
+        ]
 
     def is_db_file_available(self):
         """ Check that the database file exists
@@ -134,24 +546,274 @@ class DbUtil(object):
             return False
 
     def connect(self):
-        """ Connect to the collection database """
-
+        """ Connect to the collection database. The writer connection switches the database to WAL mode 
+        so that the read-only connections from the pool are not blocked by collection updates.
+        """
+        self.disconnect()
         try:
-            self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
-            logging.debug(f"""Connected to the collection database {self.db_path}""")
-            if not self.is_metadata_available():
-                logging.debug("Collection tables don't exist")
-                self.run_command(self.CREATE_METADATA_TABLE)
-                self.run_command(self.CREATE_SUMMARY_TABLE)
-                logging.debug("Created collection tables")
+            with self.write_lock:
+                self.conn = sqlite3.connect(self.db_path, timeout=BUSY_TIMEOUT, check_same_thread=False, 
+                    cached_statements=STATEMENT_CACHE_SIZE)
+                self.data_changes += 1
+                self.conn.execute("PRAGMA journal_mode = WAL")
+                self.conn.execute("PRAGMA synchronous = NORMAL")
+                logging.debug(f"""Connected to the collection database {self.db_path}""")
+                if not self.is_metadata_available():
+                    logging.debug("Collection tables don't exist")
+                    self.create_collection_tables()
+                    logging.debug("Created collection tables")
+                else:
+                    if self.get_schema_version() < SCHEMA_VERSION:
+                        self.migrate()
+                    self.restore_topic_triggers()
+                self.fts_available = self.is_fts_table_available()
+            self.open_read_pool()
         except Exception as e:
             logging.debug(e)
 
+    def open_read_pool(self):
+        """ Open read-only connections. Queries use the writer connection if the pool cannot be created. """
+
+        if not self.db_path or self.db_path == ":memory:" or self.read_connections < 1:
+            return
+
+        uri = "file:" + pathname2url(os.path.abspath(self.db_path)) + "?mode=ro"
+        pool = queue.LifoQueue()
+        try:
+            for _ in range(self.read_connections):
+                conn = sqlite3.connect(uri, uri=True, timeout=BUSY_TIMEOUT, check_same_thread=False, 
+                    cached_statements=STATEMENT_CACHE_SIZE)
+                pool.put(conn)
+        except Exception as e:
+            logging.debug(f"""Cannot open read-only connections: {e}""")
+            self.close_pool(pool)
+            return
+        self.read_pool = pool
+
+    def close_pool(self, pool):
+        """ Close all connections in the pool
+
+        :param pool: connection pool
+        """
+        while not pool.empty():
+            try:
+                pool.get_nowait().close()
+            except Exception as e:
+                logging.debug(e)
+
+    def create_collection_tables(self):
+        """ Create collection tables, indexes and set the current schema version """
+
+        self.run_command(self.CREATE_METADATA_TABLE)
+        self.run_command(self.CREATE_SUMMARY_TABLE)
+        for index in self.CREATE_INDEXES:
+            self.run_command(index)
+        for command in self.CREATE_TOPIC_TABLES + self.CREATE_TOPIC_TRIGGERS:
+            self.run_command(command)
+        self.run_command(self.CREATE_ARTWORK_TABLE)
+        self.create_fts_table()
+        self.set_schema_version(SCHEMA_VERSION)
+
+    def create_topic_triggers(self):
+        """ Create triggers maintaining topic tables """
+
+        for command in self.CREATE_TOPIC_TRIGGERS:
+            self.run_command(command)
+
+    def drop_topic_triggers(self):
+        """ Drop triggers maintaining topic tables. Used to speed up bulk inserts. 
+        The topic tables should be rebuilt after that.
+        """
+        for t in TOPICS:
+            table = self.get_topic_table(t)
+            for suffix in TOPIC_TRIGGERS:
+                self.run_command(f"""DROP TRIGGER IF EXISTS {table}_{suffix}""")
+
+    def is_topic_triggers_available(self):
+        """ Check if all triggers maintaining topic tables exist
+
+        :return: True - triggers exist, False - some triggers are missing
+        """
+        names = ", ".join([f"'{self.get_topic_table(t)}_{suffix}'" for t in TOPICS for suffix in TOPIC_TRIGGERS])
+        query = f"""SELECT COUNT(*) FROM sqlite_master WHERE type='trigger' AND name IN ({names});"""
+        r = self.run_query(query)
+        return bool(r) and int(r[0][0]) == len(TOPICS) * len(TOPIC_TRIGGERS)
+
+    def restore_topic_triggers(self):
+        """ Rebuild topic tables and create their triggers if the collection creation was stopped 
+        after the triggers were dropped. Nothing is done while the creation can be resumed from the checkpoint.
+        """
+        if self.is_checkpoint_available() or self.is_topic_triggers_available():
+            return
+
+        logging.debug("Restoring topic triggers")
+        self.rebuild_topic_tables()
+        self.create_topic_triggers()
+
+    def rebuild_topic_tables(self):
+        """ Fill topic tables from the metadata table """
+
+        with self.write_lock:
+            try:
+                self.conn.execute("begin")
+                for command in self.REBUILD_TOPIC_TABLES:
+                    self.conn.execute(command)
+                self.commit()
+            except Exception as e:
+                self.conn.execute("rollback")
+                logging.debug(e)
+
+    def create_fts_table(self, rebuild=False):
+        """ Create full-text search table and triggers which keep it in sync with the metadata table.
+        The table is optional, it's not created if SQLite was built without FTS5 extension.
+
+        :param rebuild: True - index existing metadata, False - don't index
+        """
+        with self.write_lock:
+            try:
+                self.conn.execute("begin")
+                self.conn.execute(self.CREATE_FTS_TABLE)
+                for trigger in self.CREATE_FTS_TRIGGERS:
+                    self.conn.execute(trigger)
+                if rebuild:
+                    self.conn.execute(f"""INSERT INTO {self.fts_table_name}({self.fts_table_name}) VALUES('rebuild')""")
+                self.commit()
+            except Exception as e:
+                self.conn.execute("rollback")
+                logging.debug(f"""Full-text search is not available: {e}""")
+
+    def is_fts_table_available(self):
+        """ Check if full-text search table exists
+
+        :return: True - table exists, False - table doesn't exist
+        """
+        query = f"""SELECT name FROM sqlite_master WHERE type='table' AND name='{self.fts_table_name}';"""
+        if self.run_query(query):
+            return True
+        else:
+            return False
+
+    def get_schema_version(self):
+        """ Get the schema version of the collection database
+
+        :return: schema version, 0 for databases created before versioning
+        """
+        r = self.run_query("PRAGMA user_version")
+        if r:
+            return int(r[0][0])
+        else:
+            return 0
+
+    def set_schema_version(self, version):
+        """ Set the schema version of the collection database
+
+        :param version: schema version
+        """
+        with self.write_lock:
+            try:
+                self.conn.execute(f"PRAGMA user_version = {int(version)}")
+            except Exception as e:
+                logging.debug(e)
+
+    def migrate(self):
+        """ Migrate existing collection database to the current schema version.
+        Version 1 adds normalized columns, populates them from the existing data and creates indexes.
+        Version 2 adds the full-text search table.
+        Version 3 adds file size and modification time. They stay empty until the next collection update.
+        Version 4 adds topic tables with distinct values and counts.
+        Version 5 adds artwork thumbnails table. It stays empty until the next collection update.
+        Version 6 recreates the full-text search update trigger which fires on the indexed columns only.
+        """
+        version = self.get_schema_version()
+        logging.debug(f"""Migrating collection database from version {version} to {SCHEMA_VERSION}""")
+
+        if version < 1:
+            existing_columns = [r[1] for r in self.run_query(f"PRAGMA table_info({self.table_name})")]
+            with self.write_lock:
+                try:
+                    self.conn.create_function("peppy_key", 1, get_key, deterministic=True)
+                    self.conn.execute("begin")
+                    for t in TOPICS:
+                        key_column = get_key_column(t)
+                        if key_column not in existing_columns:
+                            self.conn.execute(f"""ALTER TABLE {self.table_name} ADD COLUMN {key_column} text""")
+                    assignments = ",".join([f"{get_key_column(t)} = peppy_key({t})" for t in TOPICS])
+                    self.conn.execute(f"""UPDATE {self.table_name} SET {assignments}""")
+                    for index in self.CREATE_INDEXES:
+                        self.conn.execute(index)
+                    self.commit()
+                except Exception as e:
+                    self.conn.execute("rollback")
+                    logging.debug(e)
+                    return
+            self.set_schema_version(1)
+
+        if version < 2:
+            self.create_fts_table(rebuild=True)
+            self.set_schema_version(2)
+
+        if version < 3:
+            existing_columns = [r[1] for r in self.run_query(f"PRAGMA table_info({self.table_name})")]
+            for c in FILE_STAT:
+                if c not in existing_columns:
+                    self.run_command(f"""ALTER TABLE {self.table_name} ADD COLUMN {c} integer""")
+            self.set_schema_version(3)
+
+        if version < 4:
+            for command in self.CREATE_TOPIC_TABLES:
+                self.run_command(command)
+            self.rebuild_topic_tables()
+            self.create_topic_triggers()
+            self.set_schema_version(4)
+
+        if version < 5:
+            self.run_command(self.CREATE_ARTWORK_TABLE)
+            self.set_schema_version(5)
+
+        if version < 6:
+            self.run_command(f"DROP TRIGGER IF EXISTS {self.fts_table_name}_update")
+            self.run_command(self.CREATE_FTS_TRIGGERS[2])
+            self.set_schema_version(6)
+
+        logging.debug("Migration completed")
+
     def disconnect(self):
         """ Disconnect from the collection database """
 
-        if self.conn:
-            self.conn.close()
+        if self.read_pool:
+            self.close_pool(self.read_pool)
+            self.read_pool = None
+
+        with self.write_lock:
+            if self.conn:
+                self.conn.close()
+                self.conn = None
+
+    def add_query_time(self, query, start):
+        """ Add execution time of the query to the statistics. Log slow queries.
+
+        :param query: SQL query or command
+        :param start: start time
+        """
+        t = timer() - start
+        key = " ".join(query.split())
+        with self.stats_lock:
+            s = self.query_stats.get(key, None)
+            if s == None:
+                s = self.query_stats[key] = {QUERY_COUNT: 0, QUERY_TOTAL_TIME: 0.0, QUERY_MAX_TIME: 0.0}
+            s[QUERY_COUNT] += 1
+            s[QUERY_TOTAL_TIME] += t
+            s[QUERY_MAX_TIME] = max(s[QUERY_MAX_TIME], t)
+        if t > SLOW_QUERY_TIME:
+            logging.debug(f"""Slow query ({t:.3f} sec): {key}""")
+
+    def get_query_statistics(self):
+        """ Get execution time statistics of all queries
+
+        :return: dictionary query -> dictionary with count, total and maximum time
+        """
+        with self.stats_lock:
+            return {k: dict(v) for k, v in self.query_stats.items()}
 
     def run_command(self, command, values=None):
         """ Run single SQL command in transaction. Rollback if exception.
@@ -159,29 +821,143 @@ class DbUtil(object):
         :param command: SQL command
         :param values: input values
         """
-        try:
-            self.conn.execute("begin")
-            if values:
-                self.conn.execute(command, values)
-            else:
-                self.conn.execute(command)
-            self.conn.commit()
-        except Exception as e:
-            self.conn.execute("rollback")
-            logging.debug(e)
+        with self.write_lock:
+            start = timer()
+            try:
+                self.conn.execute("begin")
+                if values:
+                    self.conn.execute(command, values)
+                else:
+                    self.conn.execute(command)
+                self.commit()
+            except Exception as e:
+                self.conn.execute("rollback")
+                logging.debug(e)
+            self.add_query_time(command, start)
+
+    def commit(self):
+        """ Commit the transaction of the writer connection and change the data version """
+
+        self.conn.commit()
+        self.data_changes += 1
+
+    def get_data_version(self):
+        """ Get the version of the collection data. The version changes after any transaction 
+        committed by this object. The write lock is not used, so readers are not blocked by running writes.
+
+        :return: data version
+        """
+        return self.data_changes
+
+    def get_row(self, params):
+        """ Prepare values for insert or update. Adds missing file attributes and normalized values.
+
+        :param params: file metadata values
+
+        :return: list of values for all columns
+        """
+        row = list(params)
+        if len(row) < self.row_length:
+            row.extend([None] * (self.row_length - len(row)))
+        return row + [get_key(row[i]) for i in self.key_indexes]
+
+    def run_batch(self, command, params):
+        """ Run the same command for multiple sets of values in transaction. Rollback if exception.
+
+        :param command: SQL command
+        :param params: list of values
+        """
+        with self.write_lock:
+            start = timer()
+            try:
+                self.conn.execute("begin")
+                self.conn.executemany(command, params)
+                self.commit()
+            except Exception as e:
+                self.conn.execute("rollback")
+                logging.debug(e)
+            self.add_query_time(command, start)
+
+    def run_batches(self, batches):
+        """ Run multiple commands with their sets of values in one transaction. Rollback if exception.
+
+        :param batches: list of tuples (SQL command, list of values)
+        """
+        with self.write_lock:
+            try:
+                self.conn.execute("begin")
+                for command, params in batches:
+                    start = timer()
+                    self.conn.executemany(command, params)
+                    self.add_query_time(command, start)
+                self.commit()
+            except Exception as e:
+                self.conn.execute("rollback")
+                logging.debug(e)
 
     def run_batch_insert(self, params):
         """ Run multiple INSERT commands in transaction. Rollback if exception.
 
         :param params: list of values for multiple inserts
         """
-        try:
-            self.conn.execute("begin")
-            self.conn.executemany(self.INSERT_DATA, params)
-            self.conn.commit()
-        except Exception as e:
-            self.conn.execute("rollback")
-            logging.debug(e)
+        self.run_batch(self.INSERT_DATA, [self.get_row(p) for p in params])
+
+    def run_batch_update(self, params):
+        """ Run multiple UPDATE commands in transaction. Rollback if exception.
+
+        :param params: list of values for multiple updates, the last value in the list is the row ID
+        """
+        self.run_batch(self.UPDATE_DATA, [self.get_row(p[:-1]) + [p[-1]] for p in params])
+
+    def run_batch_delete(self, ids):
+        """ Delete multiple rows in transaction. Rollback if exception.
+
+        :param ids: list of row IDs
+        """
+        self.run_batch(self.DELETE_DATA, [(i,) for i in ids])
+
+    def get_file_stats(self, folders=None):
+        """ Get files known to the collection
+
+        :param folders: list of tuples (relative folder, recursive), None - all files
+
+        :return: tuple (dictionary (folder, filename) -> (id, mtime, size), list of duplicate row IDs)
+        """
+        files = {}
+        duplicates = []
+        query = f"""
+            SELECT id, {FOLDER}, {FILENAME}, {MTIME}, {SIZE}
+            FROM {self.table_name}
+        """
+        if folders == None:
+            r = self.run_query(query)
+        else:
+            r = []
+            for folder, recursive in folders:
+                rows = self.run_parameterized_query(query + f"WHERE {get_key_column(FOLDER)} = ? AND {FOLDER} = ?", 
+                    (get_key(folder), folder))
+                r.extend(rows or [])
+                if not recursive:
+                    continue
+                prefix = folder
+                if not prefix.endswith(os.sep):
+                    prefix += os.sep
+                low = get_key(prefix)
+                high = low[:-1] + chr(ord(low[-1]) + 1)
+                rows = self.run_parameterized_query(query + f"WHERE {get_key_column(FOLDER)} >= ? AND {get_key_column(FOLDER)} < ?", 
+                    (low, high))
+                r.extend([row for row in rows or [] if row[1].startswith(prefix)])
+
+        if r:
+            for id, folder, filename, mtime, size in r:
+                key = (folder, filename)
+                if key in files and files[key][0] == id:
+                    continue
+                if key in files:
+                    duplicates.append(id)
+                else:
+                    files[key] = (id, mtime, size)
+        return (files, duplicates)
 
     def run_query(self, query):
         """ Run SELECT query
@@ -190,22 +966,11 @@ class DbUtil(object):
 
         :return: param set
         """
-        if not self.conn:
-            logging.debug(f"""No connection to the database: {self.db_path}""")
-            return
-
-        try:
-            cursor = self.conn.cursor()
-            cursor.execute(query)
-            result = cursor.fetchall()
-            return result
-        except Exception as e:
-            logging.debug(e)
-            logging.debug(query)
-            return None
+        return self.run_parameterized_query(query, ())
 
     def run_parameterized_query(self, query, params):
-        """ Run SELECT query
+        """ Run SELECT query. The query runs on the read-only connection from the pool if it's available. 
+        Otherwise it runs on the writer connection.
 
         :param query: SQL query
         :param params: query parameters
@@ -216,8 +981,29 @@ class DbUtil(object):
             logging.debug(f"""No connection to the database: {self.db_path}""")
             return
 
+        pool = self.read_pool
+        if pool:
+            conn = pool.get()
+            try:
+                return self.execute_query(conn, query, params)
+            finally:
+                pool.put(conn)
+        else:
+            with self.write_lock:
+                return self.execute_query(self.conn, query, params)
+
+    def execute_query(self, conn, query, params):
+        """ Execute SELECT query using provided connection
+
+        :param conn: database connection
+        :param query: SQL query
+        :param params: query parameters
+
+        :return: param set
+        """
+        start = timer()
         try:
-            cursor = self.conn.cursor()
+            cursor = conn.cursor()
             cursor.execute(query, params)
             result = cursor.fetchall()
             return result
@@ -225,6 +1011,8 @@ class DbUtil(object):
             logging.debug(e)
             logging.debug(query)
             return None
+        finally:
+            self.add_query_time(query, start)
 
     def get_collection_summary(self):
         """ Get collection summary from the SUMMARY table
@@ -265,10 +1053,136 @@ class DbUtil(object):
         self.run_command(command)
         command = f"""DROP TABLE IF EXISTS {self.summary_table_name}"""
         self.run_command(command)
-        self.run_command(self.CREATE_METADATA_TABLE)
-        self.run_command(self.CREATE_SUMMARY_TABLE)
+        command = f"""DROP TABLE IF EXISTS {self.fts_table_name}"""
+        self.run_command(command)
+        for t in TOPICS:
+            self.run_command(f"""DROP TABLE IF EXISTS {self.get_topic_table(t)}""")
+        self.run_command(f"""DROP TABLE IF EXISTS {self.artwork_table_name}""")
+        self.drop_checkpoint_table()
+        self.create_collection_tables()
+        self.fts_available = self.is_fts_table_available()
         logging.debug("Collection deleted")
 
+    def create_checkpoint_table(self):
+        """ Create the table with folders committed by the collection creation. 
+        The table exists only while the collection is being created.
+        """
+        self.run_command(self.CREATE_CHECKPOINT_TABLE)
+
+    def drop_checkpoint_table(self):
+        """ Drop the checkpoint table after the collection was created """
+
+        self.run_command(f"""DROP TABLE IF EXISTS {self.checkpoint_table_name}""")
+
+    def is_checkpoint_available(self):
+        """ Check if the previous collection creation was interrupted
+
+        :return: True - checkpoint table exists, False - doesn't exist
+        """
+        query = f"""SELECT name FROM sqlite_master WHERE type='table' AND name='{self.checkpoint_table_name}';"""
+        if self.run_query(query):
+            return True
+        else:
+            return False
+
+    def get_checkpoint_folders(self):
+        """ Get folders committed before the collection creation was interrupted
+
+        :return: set of folders relative to the base folder
+        """
+        r = self.run_query(f"""SELECT folder FROM {self.checkpoint_table_name}""")
+        if not r:
+            return set()
+        return set([n[0] for n in r])
+
+    def delete_uncommitted_metadata(self):
+        """ Delete metadata of the folders which were not completely committed before the interruption """
+
+        self.run_command(f"""DELETE FROM {self.table_name} 
+            WHERE folder NOT IN (SELECT folder FROM {self.checkpoint_table_name})""")
+
+    def run_batch_checkpoint(self, params, folders):
+        """ Insert metadata and record completed folders in one transaction. Rollback if exception.
+
+        :param params: list of values for multiple inserts
+        :param folders: list of folders which files are all inserted
+        """
+        with self.write_lock:
+            start = timer()
+            try:
+                self.conn.execute("begin")
+                self.conn.executemany(self.INSERT_DATA, [self.get_row(p) for p in params])
+                self.conn.executemany(self.INSERT_CHECKPOINT, [(f,) for f in folders])
+                self.commit()
+            except Exception as e:
+                self.conn.execute("rollback")
+                logging.debug(e)
+            self.add_query_time(self.INSERT_DATA, start)
+
+    def save_artwork(self, artwork):
+        """ Replace artwork thumbnails of the folders. A folder without artwork is saved 
+        with empty image to avoid looking for the artwork again.
+
+        :param artwork: list of tuples (folder, source file name, modification time, list of (size class, JPEG data))
+        """
+        deletes = [(a[0],) for a in artwork]
+        inserts = []
+        for folder, source, mtime, thumbnails in artwork:
+            if thumbnails:
+                inserts.extend([(folder, size, source, mtime, image) for size, image in thumbnails])
+            else:
+                inserts.append((folder, 0, None, mtime, None))
+
+        self.run_batches([(self.DELETE_ARTWORK, deletes), (self.INSERT_ARTWORK, inserts)])
+
+    def delete_artwork(self, folders):
+        """ Delete artwork thumbnails of the folders
+
+        :param folders: list of folders
+        """
+        self.run_batch(self.DELETE_ARTWORK, [(f,) for f in folders])
+
+    def get_folders(self):
+        """ Get all folders with audio files
+
+        :return: list of folders relative to the base folder
+        """
+        r = self.run_query(f"""SELECT value FROM {self.get_topic_table(FOLDER)}""")
+        if not r:
+            return []
+        return [n[0] for n in r]
+
+    def get_artwork_sources(self):
+        """ Get artwork sources of all folders
+
+        :return: dictionary folder -> (source file name, modification time)
+        """
+        r = self.run_query(f"""SELECT folder, source, mtime FROM {self.artwork_table_name} GROUP BY folder""")
+        if not r:
+            return {}
+        return {folder: (source, mtime) for folder, source, mtime in r}
+
+    def get_artwork(self, folder, size):
+        """ Get artwork thumbnail of the folder. The smallest size class which is not less than 
+        the requested size is selected. If all size classes are smaller the largest one is selected.
+
+        :param folder: folder relative to the collection base folder
+        :param size: requested size
+
+        :return: tuple (source file name, JPEG data), (None, None) if folder has no artwork, None if folder is unknown
+        """
+        query = f"""
+            SELECT source, image
+            FROM {self.artwork_table_name}
+            WHERE folder = ?
+            ORDER BY (size < ?), CASE WHEN size < ? THEN -size ELSE size END
+            LIMIT 1
+        """
+        r = self.run_parameterized_query(query, (folder, size, size))
+        if not r:
+            return None
+        return (r[0][0], r[0][1])
+
     def delete_summary_data(self):
         """ Delete data from the Summary table """
 
@@ -276,19 +1190,29 @@ class DbUtil(object):
         self.run_command(command)
         logging.debug("Summary data deleted")
 
+    def replace_summary_data(self, values):
+        """ Replace data in the Summary table in one transaction
+
+        :param values: summary values
+        """
+        command = f"""DELETE FROM {self.summary_table_name}"""
+        self.run_batches([(command, [()]), (self.INSERT_SUMMARY_DATA, [values])])
+
 class Collector(object):
     """ Collects audio files metadata and inserts into the database. Reports statistics. """
 
-    def __init__(self, dbfile=None, dbutil=None):
+    def __init__(self, dbfile=None, dbutil=None, folder_images=FOLDER_IMAGES):
         """ Initializer
 
         :param dbfile: database filename
         :param dbutil: database utility class. Provided if class is used in the player.
+        :param folder_images: folder image file names used as artwork
         """
         if dbutil:
             self.dbutil = dbutil
         else:
             self.dbutil = DbUtil(db_filename=dbfile)
+        self.folder_images = folder_images
 
     def get_files_statistics(self, base_folder, total_folders, progress_callback=None):
         """ Collect recursively statistics about all audio files in the specified folder and its subfolders.
@@ -355,9 +1279,8 @@ class Collector(object):
 
         for c in SUMMARY[2:]:
             r = self.dbutil.run_query(f"""
-                SELECT COUNT(DISTINCT {c})
-                FROM {self.dbutil.table_name}
-                WHERE LENGTH(TRIM({c})) > 0""")
+                SELECT COUNT(*)
+                FROM {self.dbutil.get_topic_table(c)}""")
             if r:
                 collection_stats[c] = r[0][0]
 
@@ -373,118 +1296,284 @@ class Collector(object):
 
         :return: file metadata list of values for insert
         """
-        metadata = []
+        return get_file_metadata(folder, filename, ext, meta)
+
+    def collect_metadata(self, base_folder, total_folders, metadata_callback=None, progress_callback=None, workers=1, 
+        skip_folders=None):
+        """ Collect audio file metadata. Files are parsed in batches of FILE_BATCH_SIZE files, 
+        either in the current process or by the pool of processes. The results are passed to the metadata callback
+        in the walking order together with the folders which files were all parsed.
 
-        if not folder: # file in the base folder
-            folder = os.sep
+        :param base_folder: base folder
+        :param base_folder: total number of subfolders
+        :param metadata_callback: callback with metadata and completed folders, called when BATCH_SIZE reached
+        :param progress_callback: callback for reporting progress and remaining time, called for each new folder
+        :param workers: number of processes parsing metadata, 1 - parse in the current process
+        :param skip_folders: set of folders which should not be parsed (e.g. restored from checkpoint)
 
-        metadata.append(folder)
-        metadata.append(filename)
-        metadata.append(ext)
+        :return: dictionary with statistics
+        """
+        if not base_folder:
+            base_folder = os.getcwd()
+        elif base_folder and not os.path.isdir(base_folder):
+            logging.debug(f"""Folder {base_folder} not found""")
+            return
 
-        if meta == None:
-            for _ in range(len(ALL_METADATA) - len(metadata)):
-                metadata.append(None)
-            return metadata
+        metadata = []
+        folders = []
+        errors = []
+        total_files = 0
+        scanned_folders = 0
+        reported_folders = 0
+        start = timer()
 
-        if filename.lower().endswith(".mp4") or filename.lower().endswith(".m4a"):
-            m = MP4_METADATA
+        batches = self.get_file_batches(base_folder, skip_folders)
+        if workers and workers > 1:
+            results = self.parse_in_pool(base_folder, batches, workers)
         else:
-            m = METADATA
+            results = ((parse_audio_files(base_folder, files), progress) for files, progress in batches)
+
+        for r, progress in results:
+            scanned_folders, completed_folders, skipped_folders = progress
+            for m, error in r:
+                if error:
+                    errors.append(error)
+                metadata.append(m)
+                total_files += 1
+            folders.extend(completed_folders)
 
-        for key in m:
-            if meta and (key not in meta.keys() or len(meta[key][0].replace(" ", "").strip()) == 0):
-                v = None
-            else:
-                v = meta[key][0].strip()
-            metadata.append(v)
+            if len(metadata) >= BATCH_SIZE:
+                if metadata_callback:
+                    metadata_callback(metadata, folders)
+                metadata = []
+                folders = []
 
-        if hasattr(meta, "info"):
-            for key in INFO:
-                metadata.append(getattr(meta.info, key, None))
-        else:
-            for _ in INFO:
-                metadata.append(None)
+            if progress_callback and scanned_folders != reported_folders:
+                remaining = self.get_remaining_time(start, scanned_folders - skipped_folders, total_folders, scanned_folders)
+                progress_callback(scanned_folders, total_folders, remaining)
+                reported_folders = scanned_folders
 
-        return metadata
+        end = timer()
 
-    def collect_metadata(self, base_folder, total_folders, metadata_callback=None, progress_callback=None):
-        """ Collect audio file metadata
+        if metadata_callback and (metadata or folders):
+            metadata_callback(metadata, folders)
+
+        stats = {
+            SCANNED_FOLDERS: scanned_folders,
+            TOTAL_FILES: total_files,
+            PARSING_TIME: timedelta(seconds=(end - start)),
+            ERRORS: errors
+        }
+
+        return stats
+
+    def get_remaining_time(self, start, parsed_folders, total_folders, scanned_folders):
+        """ Estimate remaining time using the average time per parsed folder
+
+        :param start: start time
+        :param parsed_folders: number of folders parsed in this run
+        :param total_folders: total number of subfolders
+        :param scanned_folders: number of scanned folders including skipped ones
+
+        :return: remaining time or None if it cannot be estimated
+        """
+        if not total_folders or parsed_folders <= 0:
+            return None
+        remaining_folders = max(0, total_folders - scanned_folders)
+        return timedelta(seconds=int((timer() - start) / parsed_folders * remaining_folders))
+
+    def get_file_batches(self, base_folder, skip_folders=None):
+        """ Walk through the base folder and split audio files into batches.
+        An empty batch is returned at the end of each folder to report progress.
+        The folder is reported as completed with the batch containing its last file.
 
         :param base_folder: base folder
-        :param base_folder: total number of subfolders
-        :param metadata_callback: callback for reporting progress, called when BATCH_SIZE reached
-        :param progress_callback: callback for reporting progress, called for each new folder
+        :param skip_folders: set of folders relative to the base folder which should be skipped
 
-        :return: dictionary with statistics
+        :return: generator of tuples (list of (folder, file name), progress), where progress is a tuple 
+            (number of completely scanned folders, list of folders which last files are in the batch 
+            or in the previous batches, number of skipped folders)
         """
-        metadata = []
-        errors = []
-        num = 0
-        total_files = 0
+        batch = []
+        waiting = []
         scanned_folders = 0
-        start = timer()
-
-        if not base_folder:
-            base_folder = os.getcwd()
-        elif base_folder and not os.path.isdir(base_folder):
-            logging.debug(f"""Folder {base_folder} not found""")
-            return
+        skipped_folders = 0
 
         for current_folder, _, files in os.walk(base_folder, followlinks=True):
+            folder = self.get_relative_folder(base_folder, current_folder)
             scanned_folders += 1
+            if skip_folders and folder in skip_folders:
+                skipped_folders += 1
+                yield ([], (scanned_folders, [], skipped_folders))
+                continue
+
+            audio_files = 0
             for file in files:
                 if not file.lower().endswith(EXTENSIONS):
                     continue
+                audio_files += 1
+                batch.append((current_folder, file))
+                if len(batch) == FILE_BATCH_SIZE:
+                    yield (batch, (scanned_folders - 1, waiting, skipped_folders))
+                    batch = []
+                    waiting = []
+
+            if audio_files:
+                waiting.append(folder)
+
+            if batch:
+                yield ([], (scanned_folders, [], skipped_folders))
+            else:
+                yield ([], (scanned_folders, waiting, skipped_folders))
+                waiting = []
 
-                ext = file[file.rfind('.') + 1:]
-                ext = ext.lower()
-                meta = None
+        yield (batch, (scanned_folders, waiting, skipped_folders))
+
+    def walk_folders(self, folders):
+        """ Walk through the folders
+
+        :param folders: list of tuples (absolute folder path, recursive)
+
+        :return: generator of tuples (folder, list of file names)
+        """
+        for root, recursive in folders:
+            if not os.path.isdir(root):
+                continue
+            if recursive:
+                for current_folder, _, files in os.walk(root, followlinks=True):
+                    yield (current_folder, files)
+            else:
                 try:
-                    p = os.path.join(current_folder, file)
-                    if ext == "mp4" or ext == "m4a":
-                        meta = MP4(p)
-                    else:
-                        meta = File(p, easy=True)
+                    files = [f for f in os.listdir(root) if os.path.isfile(os.path.join(root, f))]
                 except Exception as e:
-                    msg = f"""Metadata parsing error in file {file}: {e}"""
-                    errors.append(msg)
+                    logging.debug(e)
+                    continue
+                yield (root, files)
 
-                meta_folder = current_folder[len(base_folder):]
-                if meta:
-                    m = self.get_file_metadata(meta_folder, file, ext, meta)
-                    metadata.append(m)
+    def parse_in_pool(self, base_folder, batches, workers):
+        """ Parse batches of audio files in the pool of processes.
+        The number of batches in flight is limited to keep the memory usage bounded.
+
+        :param base_folder: base folder
+        :param batches: iterable of tuples (list of (folder, file name), progress value)
+        :param workers: number of worker processes
+
+        :return: generator of tuples (list of (metadata, error), progress value) in the order of batches
+        """
+        pending = deque()
+        max_in_flight = workers * IN_FLIGHT_BATCHES_PER_WORKER
+
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for files, progress in batches:
+                if files:
+                    future = executor.submit(parse_audio_files, base_folder, files)
                 else:
-                    metadata.append(self.get_file_metadata(meta_folder, file, ext, None))
+                    future = None
+                pending.append((future, files, progress))
+                if len(pending) >= max_in_flight:
+                    yield self.get_batch_result(base_folder, *pending.popleft())
+            while pending:
+                yield self.get_batch_result(base_folder, *pending.popleft())
 
-                num += 1
-                total_files += 1
+    def get_batch_result(self, base_folder, future, files, progress):
+        """ Wait for the batch parsed by the worker process
 
-                if num == BATCH_SIZE:
-                    if metadata_callback:
-                        metadata_callback(metadata)
-                    metadata = []
-                    num = 0
+        :param base_folder: base folder
+        :param future: worker future, None for empty batch
+        :param files: list of (folder, file name) in the batch
+        :param progress: progress value
 
-            if progress_callback:
-                progress_callback(scanned_folders, total_folders)
+        :return: tuple (list of (metadata, error), progress value)
+        """
+        if future == None:
+            return ([], progress)
 
-        end = timer()
+        try:
+            return (future.result(), progress)
+        except Exception as e:
+            logging.debug(e)
+            results = []
+            for folder, file in files:
+                ext = file[file.rfind('.') + 1:].lower()
+                m = get_file_metadata(folder[len(base_folder):], file, ext, None)
+                results.append((m, f"""Metadata parsing error in file {file}: {e}"""))
+            return (results, progress)
 
-        if metadata_callback and metadata:
-            metadata_callback(metadata)
+    def collect_artwork(self, base_folder, folders, workers=1):
+        """ Extract folder artwork, create thumbnails and save them in the database
 
-        stats = {
-            SCANNED_FOLDERS: scanned_folders,
-            TOTAL_FILES: total_files,
-            PARSING_TIME: timedelta(seconds=(end - start)),
-            ERRORS: errors
-        }
+        :param base_folder: collection base folder
+        :param folders: list of folders relative to the base folder
+        :param workers: number of processes extracting artwork
 
-        return stats
+        :return: number of folders with artwork
+        """
+        if not folders:
+            return 0
+
+        logging.debug(f"""Collecting artwork for {len(folders)} folders""")
+        names = repeat(self.folder_images)
+        if workers and workers > 1:
+            executor = ProcessPoolExecutor(max_workers=workers)
+            results = executor.map(extract_folder_artwork, repeat(base_folder), folders, names, chunksize=FILE_BATCH_SIZE)
+        else:
+            executor = None
+            results = map(extract_folder_artwork, repeat(base_folder), folders, names)
+
+        found = 0
+        artwork = []
+        try:
+            for a in results:
+                if a[3]:
+                    found += 1
+                artwork.append(a)
+                if len(artwork) == FILE_BATCH_SIZE:
+                    self.dbutil.save_artwork(artwork)
+                    artwork = []
+        except Exception as e:
+            logging.debug(e)
+        finally:
+            if executor:
+                executor.shutdown()
+
+        if artwork:
+            self.dbutil.save_artwork(artwork)
+        return found
+
+    def update_artwork(self, base_folder, changed_folders, check_all=True, workers=1):
+        """ Update artwork of the changed folders, folders without artwork and folders 
+        where the folder or the image file were modified. Delete artwork of removed folders.
+
+        :param base_folder: collection base folder
+        :param changed_folders: set of folders with added, updated or removed files
+        :param check_all: True - check modification time of all folders, False - only changed folders
+        :param workers: number of processes extracting artwork
+
+        :return: number of updated folders with artwork
+        """
+        sources = self.dbutil.get_artwork_sources()
+        folders = set(self.dbutil.get_folders())
+
+        removed = [f for f in sources.keys() if f not in folders]
+        if removed:
+            self.dbutil.delete_artwork(removed)
+
+        todo = set([f for f in changed_folders if f in folders])
+        for folder in folders:
+            if folder in todo:
+                continue
+            s = sources.get(folder, None)
+            if s == None:
+                todo.add(folder)
+            elif check_all:
+                folder_path = os.path.join(base_folder, folder.lstrip(os.sep))
+                if get_artwork_mtime(folder_path, s[0]) != s[1]:
+                    todo.add(folder)
+
+        return self.collect_artwork(base_folder, sorted(todo), workers)
 
     def create_summary(self, base_folder):
-        """ Create collection summary
+        """ Create collection summary. The previous summary is replaced in the same transaction.
 
         :param base_folder: base folder name
         """
@@ -503,16 +1592,19 @@ class Collector(object):
             str(summary[FOLDER]),
             str(summary[FILENAME])
         ]
-        self.dbutil.run_command(self.dbutil.INSERT_SUMMARY_DATA, values)
+        self.dbutil.replace_summary_data(values)
         logging.debug("Summary created")
 
-    def create_collection(self, base_folder, total_folders, db_filename, progress_callback=None):
-        """ Create the database collection with audio files metadata
+    def create_collection(self, base_folder, total_folders, db_filename, progress_callback=None, workers=1):
+        """ Create the database collection with audio files metadata.
+        Completed folders are recorded in the checkpoint table together with their metadata. 
+        If the previous creation was interrupted it's resumed from the last committed folder.
 
         :param base_folder: collection base folder
         :param total_folders: total number of the subfolders in the base folder
         :param db_filename: collection database filename
-        :param progress_callback: callback for reporting progress
+        :param progress_callback: callback for reporting progress and remaining time
+        :param workers: number of processes parsing metadata
 
         :return: dictionary with collection database statistics
         """
@@ -522,110 +1614,228 @@ class Collector(object):
 
         self.dbutil.db_path = db_filename
         self.dbutil.connect()
+        self.dbutil.drop_topic_triggers()
+
+        if self.dbutil.is_checkpoint_available():
+            skip_folders = self.dbutil.get_checkpoint_folders()
+            self.dbutil.delete_uncommitted_metadata()
+            logging.debug(f"""Resuming collection creation, {len(skip_folders)} folders restored from checkpoint""")
+        else:
+            skip_folders = set()
+            self.dbutil.create_checkpoint_table()
+            logging.debug("Creating collection")
 
-        logging.debug("Creating collection")
-        stats = self.collect_metadata(base_folder, total_folders, self.dbutil.run_batch_insert, progress_callback)
+        try:
+            stats = self.collect_metadata(base_folder, total_folders, self.dbutil.run_batch_checkpoint, progress_callback, 
+                workers, skip_folders)
+        finally:
+            self.dbutil.rebuild_topic_tables()
+            self.dbutil.create_topic_triggers()
         logging.debug("Collection created")
+        if stats:
+            stats[RESUMED_FOLDERS] = len(skip_folders)
+            stats[ARTWORK_FOLDERS] = self.collect_artwork(base_folder, self.dbutil.get_folders(), workers)
         self.create_summary(base_folder)
+        self.dbutil.drop_checkpoint_table()
         logging.debug("Creation process completed")
         return stats
 
-    def update_collection(self, base_folder, total_folders, progress_callback=None):
-        """ Go through the base folder/sub-folders and check if the files exist in the database. 
-            If not add the audio files metadata to the database.
+    def update_collection(self, base_folder, total_folders, progress_callback=None, workers=1):
+        """ Go through the base folder/sub-folders and compare the files with the files in the database.
+            Add metadata of the new files, parse again the changed files and delete the files which don't exist anymore.
 
         :param base_folder: collection base folder
         :param total_folders: total number of the subfolders in the base folder
         :param progress_callback: callback for reporting progress
+        :param workers: number of processes parsing metadata
 
         :return: dictionary with collection database statistics
         """
-        if base_folder and not os.path.isdir(base_folder):
-            logging.debug(f"""Folder {base_folder} not found""")
-            return None
-
-        metadata = []
-        errors = []
-        num = 0
-        scanned_folders = 0
-        start = timer()
-        new_files_added = 0
-
         if not base_folder:
             base_folder = os.getcwd()
         elif base_folder and not os.path.isdir(base_folder):
             logging.debug(f"""Folder {base_folder} not found""")
             return None
 
-        query = f"""
-            SELECT COUNT(DISTINCT ID)
-            FROM {self.dbutil.table_name} 
-            WHERE FOLDER = ? AND FILENAME = ?
+        known, duplicates = self.dbutil.get_file_stats()
+        return self.update_files(base_folder, [(base_folder, True)], known, duplicates, total_folders, progress_callback, workers)
+
+    def update_folders(self, base_folder, folders):
+        """ Update only specified folders of the collection. Folders which don't exist anymore are removed.
+
+        :param base_folder: collection base folder
+        :param folders: list of tuples (absolute folder path, recursive)
+
+        :return: dictionary with collection database statistics
         """
+        if not base_folder or not os.path.isdir(base_folder) or not os.listdir(base_folder):
+            logging.debug(f"""Folder {base_folder} not found or empty""")
+            return None
 
-        for current_folder, _, files in os.walk(base_folder, followlinks=True):
-            scanned_folders += 1
-            for file in files:
-                if not file.lower().endswith(EXTENSIONS):
-                    continue
+        relative_folders = [(self.get_relative_folder(base_folder, f), recursive) for f, recursive in folders]
+        known, duplicates = self.dbutil.get_file_stats(relative_folders)
+        return self.update_files(base_folder, folders, known, duplicates, check_empty=False)
 
-                ext = file[file.rfind('.') + 1:]
-                ext = ext.lower()
-                meta = None
+    def get_relative_folder(self, base_folder, folder):
+        """ Get folder name relative to the base folder as it's stored in the database
 
-                folder = current_folder[len(base_folder):]
-                filename = file
+        :param base_folder: collection base folder
+        :param folder: absolute folder path
 
-                result = self.dbutil.run_parameterized_query(query, (folder, filename))
-                if result and int(result[0][0]) == 1:
-                    continue
+        :return: relative folder name
+        """
+        relative_folder = folder[len(base_folder):]
+        if not relative_folder:
+            relative_folder = os.sep
+        return relative_folder
 
-                try:
-                    p = os.path.join(current_folder, file)
-                    if ext == "mp4" or ext == "m4a":
-                        meta = MP4(p)
-                    else:
-                        meta = File(p, easy=True)
-                except Exception as e:
-                    msg = f"""Metadata parsing error in file {file}: {e}"""
-                    errors.append(msg)
+    def update_files(self, base_folder, folders, known, duplicates, total_folders=None, progress_callback=None, 
+        workers=1, check_empty=True):
+        """ Compare files in the folders with known files. Insert, update and delete metadata in batches.
 
-                if meta:
-                    m = self.get_file_metadata(folder, file, ext, meta)
-                    metadata.append(m)
+        :param base_folder: collection base folder
+        :param folders: list of tuples (absolute folder path, recursive) to scan
+        :param known: dictionary (folder, filename) -> (id, mtime, size) with files from the database
+        :param duplicates: list of duplicate row IDs to delete
+        :param total_folders: total number of the subfolders in the base folder
+        :param progress_callback: callback for reporting progress
+        :param workers: number of processes parsing metadata
+        :param check_empty: True - don't remove files if no audio files found (e.g. unmounted disk)
+
+        :return: dictionary with collection database statistics
+        """
+        start = timer()
+        inserts = []
+        updates = []
+        errors = []
+        added = 0
+        updated = 0
+        seen = set()
+        changed = {}
+        stat_updates = []
+        changed_folders = set()
+        reported_folders = 0
+
+        batches = self.get_update_batches(base_folder, folders, known, seen, changed, stat_updates)
+        if workers and workers > 1:
+            results = self.parse_in_pool(base_folder, batches, workers)
+        else:
+            results = ((parse_audio_files(base_folder, files), progress) for files, progress in batches)
+
+        for r, scanned_folders in results:
+            for m, error in r:
+                if error:
+                    errors.append(error)
+                changed_folders.add(m[0])
+                id = changed.get((m[0], m[1]))
+                if id == None:
+                    inserts.append(m)
                 else:
-                    metadata.append(self.get_file_metadata(folder, file, ext, None))
+                    updates.append(m + [id])
 
-                num += 1
+            if len(inserts) >= BATCH_SIZE:
+                self.dbutil.run_batch_insert(inserts)
+                added += len(inserts)
+                inserts = []
 
-                if num == BATCH_SIZE:
-                    self.dbutil.run_batch_insert(metadata)
-                    logging.debug(metadata)
-                    new_files_added += len(metadata)
-                    metadata = []
-                    num = 0
+            if len(updates) >= BATCH_SIZE:
+                self.dbutil.run_batch_update(updates)
+                updated += len(updates)
+                updates = []
 
-            if progress_callback:
+            if progress_callback and scanned_folders != reported_folders:
                 progress_callback(scanned_folders, total_folders)
+                reported_folders = scanned_folders
 
-        end = timer()
+        if inserts:
+            self.dbutil.run_batch_insert(inserts)
+            added += len(inserts)
+
+        if updates:
+            self.dbutil.run_batch_update(updates)
+            updated += len(updates)
+
+        for i in range(0, len(stat_updates), BATCH_SIZE):
+            self.dbutil.run_batch(self.dbutil.UPDATE_FILE_STAT, stat_updates[i : i + BATCH_SIZE])
+
+        if seen or not known or not check_empty:
+            removed_ids = duplicates + [v[0] for k, v in known.items() if k not in seen]
+        else:
+            logging.debug(f"""No audio files found in {base_folder}, skipping removal""")
+            removed_ids = []
 
-        if metadata:
-            self.dbutil.run_batch_insert(metadata)
-            new_files_added += len(metadata)
+        for i in range(0, len(removed_ids), BATCH_SIZE):
+            self.dbutil.run_batch_delete(removed_ids[i : i + BATCH_SIZE])
+        removed = len(removed_ids)
 
-        if new_files_added > 0:
-            self.dbutil.delete_summary_data()
+        if removed_ids:
+            changed_folders.update([k[0] for k, v in known.items() if k not in seen])
+        artwork_folders = self.update_artwork(base_folder, changed_folders, check_empty, workers)
+
+        end = timer()
+
+        if added or updated or removed:
             self.create_summary(base_folder)
 
         stats = {
-            TOTAL_FILES: new_files_added,
+            TOTAL_FILES: added + updated + removed,
+            ADDED_FILES: added,
+            UPDATED_FILES: updated,
+            REMOVED_FILES: removed,
+            ARTWORK_FOLDERS: artwork_folders,
             PARSING_TIME: timedelta(seconds=(end - start)),
             ERRORS: errors
         }
 
         return stats
 
+    def get_update_batches(self, base_folder, folders, known, seen, changed, stat_updates):
+        """ Walk through the folders and compare files with the files known to the database.
+        Only new and changed files are returned for parsing.
+
+        :param base_folder: base folder
+        :param folders: list of tuples (absolute folder path, recursive)
+        :param known: dictionary (folder, filename) -> (id, mtime, size) with files from the database
+        :param seen: set which receives (folder, filename) of all found audio files
+        :param changed: dictionary which receives (folder, filename) -> id of changed files
+        :param stat_updates: list which receives (size, mtime, id) of files without stored size and mtime
+
+        :return: generator of tuples (list of (folder, file name), number of completely scanned folders)
+        """
+        batch = []
+        scanned_folders = 0
+
+        for current_folder, files in self.walk_folders(folders):
+            folder = self.get_relative_folder(base_folder, current_folder)
+            for file in files:
+                if not file.lower().endswith(EXTENSIONS):
+                    continue
+
+                key = (folder, file)
+                if key in seen:
+                    continue
+                seen.add(key)
+                stat = get_file_stat(os.path.join(current_folder, file))
+                row = known.get(key)
+                if row:
+                    id, mtime, size = row
+                    if mtime == None or size == None:
+                        stat_updates.append((stat[0], stat[1], id))
+                        continue
+                    elif [size, mtime] == stat:
+                        continue
+                    changed[key] = id
+
+                batch.append((current_folder, file))
+                if len(batch) == FILE_BATCH_SIZE:
+                    yield (batch, scanned_folders)
+                    batch = []
+
+            scanned_folders += 1
+            yield ([], scanned_folders)
+
+        yield (batch, scanned_folders)
+
     def print_files_statistics(self, stats):
         """ Prepare formatted string with folder statistics
 
@@ -668,8 +1878,12 @@ class Collector(object):
         n = int((STARS - 2 - len(METADATA_STATISTICS)) / 2)
         s = "\n\n" + "*" * n + " " + METADATA_STATISTICS + " " + "*" * n
         s += f"""\n\n{SCANNED_FOLDERS} {stats[SCANNED_FOLDERS]}"""
+        if stats.get(RESUMED_FOLDERS):
+            s += f"""\n{RESUMED_FOLDERS} {stats[RESUMED_FOLDERS]}"""
         s += f"""\n{TOTAL_FILES} {stats[TOTAL_FILES]}"""
         s += f"""\n{PARSING_TIME} {stats[PARSING_TIME]}"""
+        if ARTWORK_FOLDERS in stats:
+            s += f"""\n{ARTWORK_FOLDERS} {stats[ARTWORK_FOLDERS]}"""
         s += f"""\n{ERRORS} {len(stats[ERRORS])}\n"""
         if stats[ERRORS]:
             s += f"""{ERRORS}\n"""
@@ -695,12 +1909,14 @@ class Collector(object):
             logging.debug(s)
             return
 
-        if stats[TOTAL_FILES] > 1:
-            suffix = ADDED_SUFFIX + "s"
-        else:
-            suffix = ADDED_SUFFIX
-
-        s += f"""\n\n{ADDED_PREFIX} {stats[TOTAL_FILES]} {suffix}"""
+        s += "\n"
+        for prefix, key in [(ADDED_PREFIX, ADDED_FILES), (UPDATED_PREFIX, UPDATED_FILES), (REMOVED_PREFIX, REMOVED_FILES)]:
+            if stats[key] != 1:
+                suffix = ADDED_SUFFIX + "s"
+            else:
+                suffix = ADDED_SUFFIX
+            s += f"""\n{prefix} {stats[key]} {suffix}"""
+        s += f"""\n{ARTWORK_FOLDERS} {stats[ARTWORK_FOLDERS]}"""
         s += f"""\n{UPDATE_TIME} {stats[PARSING_TIME]}"""
         s += f"""\n{ERRORS} {len(stats[ERRORS])}\n"""
         s += "\n" + "*" * STARS
@@ -725,18 +1941,23 @@ class Collector(object):
 
         logging.debug(s)
 
-    def print_progress_bar(self, current_value, total):
+    def print_progress_bar(self, current_value, total, remaining=None):
         """ Show progress bar
         Modified version of the source which was found here: 
         https://stackoverflow.com/questions/3173320/text-progress-bar-in-the-console
         
         :param current_value: current value
         :param total: total values
+        :param remaining: estimated remaining time (if any)
         """
         percents = f"""{100 * (current_value / float(total)):.2f}"""
         filled_length = int(round(PROGRESS_BAR_LENGTH * current_value / float(total)))
         bar = f"""{FULL_BLOCK_CHARACTER * filled_length}{"-" * (PROGRESS_BAR_LENGTH - filled_length)}"""
-        print(f"""\r{PROGRESS_BAR_PREFIX} |{bar}| {percents}% {PROGRESS_BAR_SUFFIX}""", end="")
+        if remaining != None:
+            suffix = f"""{PROGRESS_BAR_SUFFIX} {REMAINING_TIME} {remaining}  """
+        else:
+            suffix = PROGRESS_BAR_SUFFIX
+        print(f"""\r{PROGRESS_BAR_PREFIX} |{bar}| {percents}% {suffix}""", end="")
 
         if current_value == total:
             print()
@@ -791,6 +2012,11 @@ def main():
     python collector.py db -i c:\\peppy.db\t show statistics for specific database file
     python collector.py create -i c:\\music -o c:\peppy.db
         create collection database using specified folder and database filename
+    python collector.py create -i c:\\music -o c:\peppy.db -w 4
+        create collection database parsing metadata in 4 processes.
+        If the creation was interrupted, the same command resumes it from the last committed folder
+    python collector.py create -i c:\\music -o c:\peppy.db -f folder.jpg cover.jpg
+        create collection database using folder.jpg and cover.jpg as folder artwork
     python collector.py update -i c:\\music -o c:\peppy.db
         update collection database using specified folder and database filename
     """
@@ -810,10 +2036,14 @@ def main():
     p = subparsers.add_parser("create", help="create collection database")
     p.add_argument("-i", help="audio files root folder", required=True)
     p.add_argument("-o", help="collection database filename", required=True)
+    p.add_argument("-w", help="number of metadata parsing processes", type=int, default=1)
+    p.add_argument("-f", help="folder image file names used as artwork", nargs="+", default=FOLDER_IMAGES)
 
     p = subparsers.add_parser("update", help="update collection database")
     p.add_argument("-i", help="audio files root folder", required=True)
     p.add_argument("-o", help="collection database filename", required=True)
+    p.add_argument("-w", help="number of metadata parsing processes", type=int, default=1)
+    p.add_argument("-f", help="folder image file names used as artwork", nargs="+", default=FOLDER_IMAGES)
 
     try:
         args = parser.parse_args()
@@ -845,15 +2075,17 @@ def main():
             base_folder = base_folder[:-1]
         db_filename = args.o
 
-        if db_filename and os.path.isfile(db_filename):
+        exists = db_filename and os.path.isfile(db_filename)
+        coll = Collector(db_filename, folder_images=args.f)
+        coll.dbutil.connect()
+
+        if exists and not coll.dbutil.is_checkpoint_available():
             logging.debug(f"""Collection database file {db_filename} exists already""")
             sys.exit(1)
 
-        coll = Collector(db_filename)
-        coll.dbutil.connect()
         n = coll.count_folders(base_folder)
         if n:
-            stats = coll.create_collection(base_folder, n[0], db_filename, coll.print_progress_bar)
+            stats = coll.create_collection(base_folder, n[0], db_filename, coll.print_progress_bar, args.w)
             coll.print_metadata_statistics(stats)
     elif command == "update":        
         base_folder = args.i
@@ -865,11 +2097,11 @@ def main():
             logging.debug(f"""Collection database file {db_filename} not found""")
             sys.exit(1)
 
-        coll = Collector(db_filename)
+        coll = Collector(db_filename, folder_images=args.f)
         coll.dbutil.connect()        
         n = coll.count_folders(base_folder)
         if n:
-            stats = coll.update_collection(base_folder, n[0], coll.print_progress_bar)
+            stats = coll.update_collection(base_folder, n[0], coll.print_progress_bar, args.w)
             coll.print_update_statistics(stats, UPDATE_STATISTICS)
         
 if __name__ == '__main__':
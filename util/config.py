@@ -91,6 +91,7 @@ APPEND = "append"
 CONSOLE_LOGGING = "console.logging"
 ENABLE_STDOUT = 'enable.stdout'
 SHOW_MOUSE_EVENTS = 'show.mouse.events'
+SHOW_DAMAGE = "show.damage"
 
 FILE_BROWSER = "file.browser"
 AUDIO_FILE_EXTENSIONS = "audio.file.extensions"
@@ -198,6 +199,23 @@ COLLECTION = "collection"
 DATABASE_FILE = "database.file"
 BASE_FOLDER = "base.folder"
 SHOW_NUMBERS = "show.numbers"
+WATCH_CHANGES = "watch.changes"
+
+CACHE = "cache"
+IMAGE_CACHE_SIZE = "image.cache.size"
+DEFAULT_IMAGE_CACHE_SIZE = 64
+CACHE_FOLDER = "cache.folder"
+DEFAULT_CACHE_FOLDER = "cache"
+ICON_CACHE_SIZE = "icon.cache.size"
+DEFAULT_ICON_CACHE_SIZE = 32
+ART_CACHE_SIZE = "art.cache.size"
+DEFAULT_ART_CACHE_SIZE = 64
+BACKGROUND_CACHE_SIZE = "background.cache.size"
+DEFAULT_BACKGROUND_CACHE_SIZE = 16
+SCREEN_CACHE_SIZE = "screen.cache.size"
+DEFAULT_SCREEN_CACHE_SIZE = 16
+SCREEN_CACHE_MEMORY = "screen.cache.memory"
+DEFAULT_SCREEN_CACHE_MEMORY = 48
 COLLECTION_TOPIC = "topic"
 TOPIC_DETAIL = "collection detail"
 COLLECTION_TRACK = "collection.track"
@@ -931,6 +949,10 @@ class Config(object):
         config[LOG_FILENAME] = c[LOG_FILENAME]
         config[APPEND] = c[APPEND]
         config[SHOW_MOUSE_EVENTS] = config_file.getboolean(LOGGING, SHOW_MOUSE_EVENTS)
+        try:
+            config[SHOW_DAMAGE] = config_file.getboolean(LOGGING, SHOW_DAMAGE)
+        except:
+            config[SHOW_DAMAGE] = False
         config[CONSOLE_LOGGING] = c[CONSOLE_LOGGING]
         
         log_handlers = []
@@ -975,13 +997,53 @@ class Config(object):
         except:
             pass
 
+        watch_changes = False
+        try:
+            watch_changes = config_file.getboolean(COLLECTION, WATCH_CHANGES)
+        except:
+            pass
+
         c = {
             DATABASE_FILE: config_file.get(COLLECTION, DATABASE_FILE),
             BASE_FOLDER: config_file.get(COLLECTION, BASE_FOLDER),
-            SHOW_NUMBERS: show_numbers
+            SHOW_NUMBERS: show_numbers,
+            WATCH_CHANGES: watch_changes
         }
         config[COLLECTION] = c        
 
+        c = {IMAGE_CACHE_SIZE: DEFAULT_IMAGE_CACHE_SIZE, CACHE_FOLDER: DEFAULT_CACHE_FOLDER, ICON_CACHE_SIZE: DEFAULT_ICON_CACHE_SIZE, 
+            ART_CACHE_SIZE: DEFAULT_ART_CACHE_SIZE, BACKGROUND_CACHE_SIZE: DEFAULT_BACKGROUND_CACHE_SIZE,
+            SCREEN_CACHE_SIZE: DEFAULT_SCREEN_CACHE_SIZE, SCREEN_CACHE_MEMORY: DEFAULT_SCREEN_CACHE_MEMORY}
+        try:
+            c[IMAGE_CACHE_SIZE] = config_file.getint(CACHE, IMAGE_CACHE_SIZE)
+        except:
+            pass
+        try:
+            c[CACHE_FOLDER] = config_file.get(CACHE, CACHE_FOLDER)
+        except:
+            pass
+        try:
+            c[ICON_CACHE_SIZE] = config_file.getint(CACHE, ICON_CACHE_SIZE)
+        except:
+            pass
+        try:
+            c[ART_CACHE_SIZE] = config_file.getint(CACHE, ART_CACHE_SIZE)
+        except:
+            pass
+        try:
+            c[BACKGROUND_CACHE_SIZE] = config_file.getint(CACHE, BACKGROUND_CACHE_SIZE)
+        except:
+            pass
+        try:
+            c[SCREEN_CACHE_SIZE] = config_file.getint(CACHE, SCREEN_CACHE_SIZE)
+        except:
+            pass
+        try:
+            c[SCREEN_CACHE_MEMORY] = config_file.getint(CACHE, SCREEN_CACHE_MEMORY)
+        except:
+            pass
+        config[CACHE] = c
+
         c = {RADIO: config_file.getboolean(HOME_MENU, RADIO)}
         c[RADIO_BROWSER] = config_file.getboolean(HOME_MENU, RADIO_BROWSER)
         c[AUDIO_FILES] = config_file.getboolean(HOME_MENU, AUDIO_FILES)
@@ -231,7 +231,7 @@ class FileUtil(object):
 
                 if self.is_audio_file(f) and  FILES in sort_order:
                     state.file_type = FILE_AUDIO
-                    if load_images and self.image_util.get_image_from_audio_file(file_path):
+                    if load_images and self.image_util.has_embedded_image(file_path):
                         state.has_embedded_image = True
                     else:
                         state.has_embedded_image = False
@@ -255,6 +255,9 @@ class FileUtil(object):
                         state.file_image_path = real_path
                     images.append(state)
         
+        if load_images:
+            self.image_util.save_embedded_image_cache()
+
         if self.config[SORT_BY_TYPE]:
             for n in sort_order:
                 if n == FOLDERS: files.extend(sorted(folders, key=attrgetter("file_name"), reverse=d))
@@ -0,0 +1,159 @@
+# Copyright 2026 Peppy Player peppy.player@gmail.com
+#
+# This file is part of Peppy Player.
+#
+# Peppy Player is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Peppy Player is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Peppy Player. If not, see <http://www.gnu.org/licenses/>.
+
+import logging
+
+from queue import Queue
+from threading import Thread, RLock
+from weakref import WeakKeyDictionary, ref
+
+IMAGE_LOADER_THREADS = 4
+
+class ImageLoader(object):
+    """ Worker pool which loads, decodes and scales images outside of the UI thread.
+    Requests are grouped by owner (e.g. menu). Cancelling the owner drops all its queued requests
+    and the results of the requests which are still running. Owners are referenced weakly, 
+    so the state of the released owner is dropped with the owner.
+    """
+
+    def __init__(self, threads=IMAGE_LOADER_THREADS, listener=None):
+        """ Initializer
+
+        :param threads: number of worker threads
+        :param listener: function which is called when the new image is loaded
+        """
+        self.threads = threads
+        self.listener = listener
+        self.lock = RLock()
+        self.jobs = Queue()
+        self.generations = WeakKeyDictionary()
+        self.results = WeakKeyDictionary()
+        self.pending = WeakKeyDictionary()
+        self.workers = []
+
+    def start(self):
+        """ Start worker threads if they are not running yet """
+
+        with self.lock:
+            if self.workers:
+                return
+            for _ in range(self.threads):
+                worker = Thread(target=self.worker_thread, daemon=True)
+                worker.start()
+                self.workers.append(worker)
+
+    def load(self, owner, item, load_image):
+        """ Add image loading request
+
+        :param owner: object which owns the request
+        :param item: request item (e.g. button) which is passed to the loading function and returned with the result
+        :param load_image: function which takes the item and returns the image, runs in the worker thread
+        """
+        self.start()
+        with self.lock:
+            generation = self.generations.get(owner, 0)
+            self.generations[owner] = generation
+            self.pending[owner] = self.pending.get(owner, 0) + 1
+        self.jobs.put((ref(owner), generation, item, load_image))
+
+    def cancel(self, owner):
+        """ Cancel all requests of the owner. Queued requests will be skipped,
+        the results of the running requests will be ignored.
+
+        :param owner: object which owns the requests
+        """
+        with self.lock:
+            if owner not in self.generations:
+                return
+            self.generations[owner] += 1
+            self.results.pop(owner, None)
+            self.pending[owner] = 0
+
+    def is_current(self, owner, generation):
+        """ Check if the request was not cancelled
+
+        :param owner: object which owns the request, None if it was released
+        :param generation: request generation
+
+        :return: True - request is current, False - request was cancelled
+        """
+        if owner == None:
+            return False
+        with self.lock:
+            return self.generations.get(owner) == generation
+
+    def is_loading(self, owner):
+        """ Check if the owner has unfinished requests
+
+        :param owner: object which owns the requests
+
+        :return: True - some images are still loading, False - all images loaded
+        """
+        with self.lock:
+            return self.pending.get(owner, 0) > 0
+
+    def get_results(self, owner):
+        """ Get images loaded since the previous call. Should be called from the UI thread.
+
+        :param owner: object which owns the requests
+
+        :return: list of tuples (item, image)
+        """
+        with self.lock:
+            if not self.results.get(owner):
+                return []
+            return self.results.pop(owner)
+
+    def add_result(self, owner, generation, item, image):
+        """ Add loaded image to the results of the owner
+
+        :param owner: object which owns the request, None if it was released
+        :param generation: request generation
+        :param item: request item
+        :param image: loaded image or None
+
+        :return: True - result was added, False - request was cancelled
+        """
+        if owner == None:
+            return False
+        with self.lock:
+            if self.generations.get(owner) != generation:
+                return False
+            self.pending[owner] -= 1
+            if image != None:
+                self.results.setdefault(owner, []).append((item, image))
+        return True
+
+    def worker_thread(self):
+        """ Thread method. Executes loading requests. """
+
+        while True:
+            owner_ref, generation, item, load_image = self.jobs.get()
+            if not self.is_current(owner_ref(), generation):
+                continue
+
+            try:
+                image = load_image(item)
+            except Exception as e:
+                logging.debug(e)
+                image = None
+
+            if not self.add_result(owner_ref(), generation, item, image):
+                continue
+
+            if image != None and self.listener:
+                self.listener()
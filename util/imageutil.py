@@ -22,12 +22,17 @@ import logging
 import codecs
 import random
 import io
+import json
+import struct
+import hashlib
 
 from util.config import *
+from util.cache import MemoryCache, DiskCache, FileInfoCache, ArtCache, ART_ORIGINAL
 from PIL import Image, ImageFilter
 from PIL.ImageColor import getcolor, getrgb
 from PIL.ImageOps import grayscale
 from io import BytesIO
+from threading import Thread, Timer, RLock
 from util.fileutil import FOLDER, FOLDER_WITH_ICON, FILE_AUDIO, FILE_PLAYLIST, FILE_IMAGE, FILE_CD_DRIVE
 from urllib import request
 from urllib.request import urlopen
@@ -66,6 +71,32 @@ CATEGORY_ORIGINAL = "original"
 
 HTTP_CONNECTION_TIMEOUT_SEC = 12
 
+ICON_CACHE_FOLDER = "icons"
+ICON_CACHE_EXTENSION = ".rgba"
+RAW_IMAGE_HEADER = ">II"
+RAW_IMAGE_HEADER_SIZE = struct.calcsize(RAW_IMAGE_HEADER)
+ICON_MANIFEST_FILE = "icons.json"
+ICON_MANIFEST_SAVE_DELAY = 10
+ICON_REQUEST_SVG = "svg"
+ICON_REQUEST_MULTI_COLOR = "multi"
+ICON_COLOR_ROLE_PREFIX = "@"
+EMBEDDED_IMAGE_CACHE_FILE = "embedded.images.json"
+ID3_HEADER_SIZE = 10
+FLAC_PICTURE_BLOCK = 6
+MP4_COVER_PATH = [b"moov", b"udta", b"meta", b"ilst", b"covr"]
+ART_CACHE_FOLDER = "art"
+ART_THUMBNAIL = "thumbnail"
+ART_SCREEN = "screen"
+ART_THUMBNAIL_DIVIDER = 3
+ART_JPEG_QUALITY = 90
+DISCOGS_URL_PREFIX = "discogs:"
+BACKGROUND_CACHE_FOLDER = "backgrounds"
+BACKGROUND_CACHE_EXTENSION = ".jpg"
+MAX_ALBUM_ART_KEYS = 8
+BLUR_TARGET_RADIUS = 2
+ENCODING_PNG = ".png"
+ENCODING_BASE64 = ".base64"
+
 class ImageUtil(object):
     """ Image Utility class """
     
@@ -91,13 +122,61 @@ class ImageUtil(object):
             
         self.COLOR_OFF = self.color_to_hex(self.config[COLORS][COLOR_DARK_LIGHT])
         self.COLOR_MUTE = self.color_to_hex(self.config[COLORS][COLOR_MUTE])        
-
-        self.image_cache = {}
-        self.image_cache_base64 = {}
-        self.svg_cache = {}
-        self.background_cache = {}
-        self.album_art_url_cache = {}
-        self.thumbnail_cache = {}
+        self.icon_colors = {
+            "main.1": self.COLOR_MAIN_1,
+            "main.2": self.COLOR_MAIN_2,
+            "on.1": self.COLOR_ON_1,
+            "on.2": self.COLOR_ON_2,
+            "off": self.COLOR_OFF,
+            "mute": self.COLOR_MUTE
+        }
+
+        self.memory_cache = MemoryCache(self.config[CACHE][IMAGE_CACHE_SIZE] * 1024 * 1024)
+        self.image_cache = self.memory_cache.get_cache("image")
+        self.image_cache_base64 = self.memory_cache.get_cache("base64")
+        self.encoding_cache = self.memory_cache.get_cache("encoding")
+        self.svg_cache = self.memory_cache.get_cache("svg")
+        self.background_cache = self.memory_cache.get_cache("background")
+        self.prepared_background_cache = self.memory_cache.get_cache("prepared.background")
+        self.album_art_keys = []
+        self.album_art_url_cache = self.memory_cache.get_cache("album_art_url")
+        self.thumbnail_cache = self.memory_cache.get_cache("thumbnail")
+
+        self.icon_disk_cache = None
+        cache_folder = self.config[CACHE][CACHE_FOLDER]
+        icon_cache_size = self.config[CACHE][ICON_CACHE_SIZE]
+        if cache_folder and icon_cache_size > 0:
+            path = os.path.join(cache_folder, ICON_CACHE_FOLDER)
+            self.icon_disk_cache = DiskCache(path, icon_cache_size * 1024 * 1024, ICON_CACHE_EXTENSION)
+
+        self.icon_manifest = None
+        self.icon_manifest_lock = RLock()
+        self.icon_manifest_timer = None
+        if self.icon_disk_cache != None:
+            self.icon_manifest = FileInfoCache(os.path.join(cache_folder, ICON_MANIFEST_FILE))
+
+        self.embedded_image_cache = None
+        if cache_folder:
+            self.embedded_image_cache = FileInfoCache(os.path.join(cache_folder, EMBEDDED_IMAGE_CACHE_FILE))
+
+        self.art_cache = None
+        art_cache_size = self.config[CACHE][ART_CACHE_SIZE]
+        if cache_folder and art_cache_size > 0:
+            w = self.config[SCREEN_INFO][WIDTH]
+            h = self.config[SCREEN_INFO][HEIGHT]
+            size_classes = [
+                (ART_THUMBNAIL, (int(w / ART_THUMBNAIL_DIVIDER), int(h / ART_THUMBNAIL_DIVIDER))),
+                (ART_SCREEN, (w, h))
+            ]
+            path = os.path.join(cache_folder, ART_CACHE_FOLDER)
+            self.art_cache = ArtCache(path, art_cache_size * 1024 * 1024, size_classes)
+
+        self.background_disk_cache = None
+        background_cache_size = self.config[CACHE][BACKGROUND_CACHE_SIZE]
+        if cache_folder and background_cache_size > 0:
+            path = os.path.join(cache_folder, BACKGROUND_CACHE_FOLDER)
+            self.background_disk_cache = DiskCache(path, background_cache_size * 1024 * 1024, BACKGROUND_CACHE_EXTENSION, lru=True)
+        self.write_backgrounds_async = True
 
         self.FILE_EXTENSIONS_EMBEDDED_IMAGES = None
         if self.config[SHOW_EMBEDDED_IMAGES]:
@@ -123,15 +202,15 @@ class ImageUtil(object):
         
         :return: base64 encoded image
         """        
+        key = path
+        if cache_key:
+            key = cache_key
+
         try:
-            img = self.image_cache_base64[path]
+            img = self.image_cache_base64[key]
             return img
         except:
             pass
-
-        key = path
-        if cache_key:
-            key = cache_key
         
         if EXT_SVG in path:
             svg_image = self.svg_cache[path]
@@ -310,6 +389,111 @@ class ImageUtil(object):
 
         return None
 
+    def get_audio_file_art(self, filename, size=None):
+        """ Get image embedded into audio file using the album art disk cache
+
+        :param filename: file name
+        :param size: tuple (width, height) of the area where the image will be shown, None - original size
+
+        :return: image or None if not found
+        """
+        if not filename: return None
+
+        def load_data():
+            buffer = self.get_image_from_audio_file(filename, True)
+            if buffer:
+                return buffer.read()
+            return None
+
+        try:
+            stats = os.stat(filename)
+        except Exception as e:
+            logging.debug(e)
+            return None
+
+        return self.get_art(filename, load_data, size, stats)
+
+    def get_art(self, source, load_data, size=None, stats=None):
+        """ Get album art from the disk cache. If the image is not cached it will be loaded
+        using the provided function and saved in the cache with all size class variants.
+
+        :param source: image source (audio file path or URL)
+        :param load_data: function which returns the original image data
+        :param size: tuple (width, height) of the area where the image will be shown, None - original size
+        :param stats: file stats for the file sources. The missing images are cached for the file sources only.
+
+        :return: image or None if not available
+        """
+        if self.art_cache == None:
+            return self.decode_art(load_data())
+
+        size_class = self.art_cache.get_size_class(size)
+        content_key = self.art_cache.get_content_key(source, stats)
+        if content_key == "":
+            return None
+
+        data = None
+        if content_key:
+            data = self.art_cache.get(content_key, size_class)
+
+        if data == None:
+            original = load_data()
+            if not original:
+                if stats != None:
+                    self.art_cache.put(source, None, stats)
+                return None
+            variants = self.create_art_variants(original)
+            self.art_cache.put(source, variants, stats)
+            data = variants.get(size_class, original)
+
+        return self.decode_art(data)
+
+    def decode_art(self, data):
+        """ Decode image data
+
+        :param data: image data
+
+        :return: image or None
+        """
+        if not data:
+            return None
+
+        try:
+            return pygame.image.load(BytesIO(data)).convert_alpha()
+        except Exception as e:
+            logging.debug(e)
+            return None
+
+    def create_art_variants(self, data):
+        """ Downscale image to the album art size classes
+
+        :param data: original image data
+
+        :return: dictionary size class name -> image data
+        """
+        variants = {ART_ORIGINAL: data}
+        try:
+            img = Image.open(BytesIO(data))
+            img.load()
+        except Exception as e:
+            logging.debug(e)
+            return variants
+
+        for name, box in self.art_cache.size_classes:
+            if img.size[0] <= box[0] and img.size[1] <= box[1]:
+                variants[name] = data
+                continue
+            i = img.copy()
+            i.thumbnail(box, Image.LANCZOS)
+            buffer = BytesIO()
+            if i.mode in ("RGBA", "LA") or (i.mode == "P" and "transparency" in i.info):
+                i.save(buffer, "PNG")
+            else:
+                i.convert("RGB").save(buffer, "JPEG", quality=ART_JPEG_QUALITY)
+            variants[name] = buffer.getvalue()
+
+        return variants
+
     def get_image_from_mp3(self, filename, return_buffer=False):
         """ Fetch image from mp3 file
 
@@ -379,6 +563,235 @@ class ImageUtil(object):
         except:
             return None
 
+    def has_embedded_image(self, filename):
+        """ Check if audio file has embedded image without decoding the image. 
+        Only the tag headers are parsed. The result is cached by file path, modification time and size.
+
+        :param filename: file name
+
+        :return: True - file has embedded image, False - no image
+        """
+        if not filename or not self.FILE_EXTENSIONS_EMBEDDED_IMAGES:
+            return False
+
+        name = filename.lower()
+        if name.endswith(EXT_MP3) and EXT_MP3 in self.FILE_EXTENSIONS_EMBEDDED_IMAGES:
+            probe = self.probe_mp3
+        elif name.endswith(EXT_FLAC) and EXT_FLAC in self.FILE_EXTENSIONS_EMBEDDED_IMAGES:
+            probe = self.probe_flac
+        elif (name.endswith(EXT_MP4) or name.endswith(EXT_M4A)) and \
+            ((EXT_MP4 in self.FILE_EXTENSIONS_EMBEDDED_IMAGES) or (EXT_M4A in self.FILE_EXTENSIONS_EMBEDDED_IMAGES)):
+            probe = self.probe_mp4
+        else:
+            return False
+
+        stats = None
+        if self.embedded_image_cache != None:
+            try:
+                stats = os.stat(filename)
+                found = self.embedded_image_cache.get(filename, stats)
+                if found != None:
+                    return found
+            except Exception as e:
+                logging.debug(e)
+
+        try:
+            with open(filename, "rb") as f:
+                found = probe(f)
+        except Exception as e:
+            logging.debug(e)
+            found = None
+
+        if found == None:
+            found = self.get_image_from_audio_file(filename, True) != None
+
+        if stats != None:
+            self.embedded_image_cache.put(filename, stats, found)
+
+        return found
+
+    def save_embedded_image_cache(self):
+        """ Save embedded image flags to the disk """
+
+        if self.embedded_image_cache != None:
+            self.embedded_image_cache.save()
+
+    def get_id3_size(self, f):
+        """ Read ID3v2 header at the current file position
+
+        :param f: file object
+
+        :return: tuple (major version, flags, tag size without header), None if there is no ID3v2 tag
+        """
+        header = f.read(ID3_HEADER_SIZE)
+        if len(header) < ID3_HEADER_SIZE or header[:3] != b"ID3":
+            return None
+        size = (header[6] << 21) | (header[7] << 14) | (header[8] << 7) | header[9]
+        return (header[3], header[5], size)
+
+    def probe_mp3(self, f):
+        """ Check if ID3v2 tag has picture frame with empty description (the frame used by get_image_from_mp3).
+        Only frame headers and the beginning of the picture frame are read.
+
+        :param f: file object
+
+        :return: True - picture found, False - no picture, None - tag cannot be parsed
+        """
+        id3 = self.get_id3_size(f)
+        if id3 == None:
+            return False
+
+        version, flags, tag_size = id3
+        if version == 2:
+            id_size, header_size, picture_id = 3, 6, b"PIC"
+        elif version == 3 or version == 4:
+            id_size, header_size, picture_id = 4, 10, b"APIC"
+        else:
+            return None
+
+        if flags & 0x80 and version < 4:
+            return None # unsynchronized tag
+
+        pos = ID3_HEADER_SIZE
+        if flags & 0x40 and version > 2:
+            ext = f.read(4)
+            if version == 3:
+                pos += struct.unpack(">I", ext)[0] + 4
+            else:
+                pos += (ext[0] << 21) | (ext[1] << 14) | (ext[2] << 7) | ext[3]
+
+        end = ID3_HEADER_SIZE + tag_size
+        while pos + header_size <= end:
+            f.seek(pos)
+            header = f.read(header_size)
+            if len(header) < header_size:
+                return None
+            frame_id = header[:id_size]
+            if frame_id[0] == 0:
+                break # padding
+            if not frame_id.isalnum() or not frame_id.isupper() and not frame_id.isdigit():
+                return None
+
+            if version == 2:
+                size = int.from_bytes(header[3:6], "big")
+            elif version == 3:
+                size = struct.unpack(">I", header[4:8])[0]
+            else:
+                size = (header[4] << 21) | (header[5] << 14) | (header[6] << 7) | header[7]
+
+            if frame_id == picture_id and self.has_empty_description(f.read(min(size, 512)), version):
+                return True
+            pos += header_size + size
+
+        return False
+
+    def has_empty_description(self, body, version):
+        """ Check if ID3 picture frame has empty description
+
+        :param body: the beginning of the frame body
+        :param version: ID3v2 major version
+
+        :return: True - description is empty, False - description is not empty
+        """
+        if len(body) < 2:
+            return False
+
+        encoding = body[0]
+        if version == 2:
+            i = 4 # encoding, image format (3 bytes)
+        else:
+            i = body.find(b"\0", 1)
+            if i < 0:
+                return False
+            i += 1
+        i += 1 # picture type
+
+        description = body[i : i + 4]
+        if encoding == 1 or encoding == 2:
+            if description[:2] in (b"\xff\xfe", b"\xfe\xff"):
+                description = description[2:]
+            return description[:2] == b"\0\0"
+        return description[:1] == b"\0"
+
+    def probe_flac(self, f):
+        """ Check if FLAC file has PICTURE metadata block. Only metadata block headers are read.
+
+        :param f: file object
+
+        :return: True - picture found, False - no picture, None - file cannot be parsed
+        """
+        pos = 0
+        id3 = self.get_id3_size(f)
+        if id3 != None:
+            pos = ID3_HEADER_SIZE + id3[2]
+        f.seek(pos)
+
+        if f.read(4) != b"fLaC":
+            return None
+        pos += 4
+
+        while True:
+            header = f.read(4)
+            if len(header) < 4:
+                return None
+            if header[0] & 0x7F == FLAC_PICTURE_BLOCK:
+                return True
+            if header[0] & 0x80:
+                return False
+            pos += 4 + int.from_bytes(header[1:4], "big")
+            f.seek(pos)
+
+    def probe_mp4(self, f):
+        """ Check if MP4 file has cover atom (moov/udta/meta/ilst/covr). Only atom headers are read.
+
+        :param f: file object
+
+        :return: True - cover found, False - no cover, None - file cannot be parsed
+        """
+        f.seek(0, os.SEEK_END)
+        start = 0
+        end = f.tell()
+
+        for name in MP4_COVER_PATH:
+            atom = self.find_mp4_atom(f, start, end, name)
+            if atom == None:
+                return False
+            start, end = atom
+            if name == b"meta":
+                start += 4 # version and flags
+
+        return True
+
+    def find_mp4_atom(self, f, start, end, name):
+        """ Find MP4 atom in the range
+
+        :param f: file object
+        :param start: range start
+        :param end: range end
+        :param name: atom name
+
+        :return: tuple (atom content start, atom end), None if not found
+        """
+        pos = start
+        while pos + 8 <= end:
+            f.seek(pos)
+            header = f.read(8)
+            if len(header) < 8:
+                return None
+            size, atom_name = struct.unpack(">I4s", header)
+            header_size = 8
+            if size == 1:
+                size = struct.unpack(">Q", f.read(8))[0]
+                header_size = 16
+            elif size == 0:
+                size = end - pos
+            if size < header_size:
+                return None
+            if atom_name == name:
+                return (pos + header_size, min(pos + size, end))
+            pos += size
+        return None
+
     def get_audio_file_icon(self, folder, bb, url=None):
         """ Return audio file icon which is album art image. 
         If it's not available then CD image will be returned.
@@ -390,12 +803,16 @@ class ImageUtil(object):
         :return: audio file icon
         """
         if url:
-            img = self.get_image_from_audio_file(url)
+            img = self.get_audio_file_art(url, (bb.w, bb.h))
             if img:
                 ratio = self.get_scale_ratio((bb.w, bb.h), img)
                 scaled_img = self.scale_image(img, ratio)
                 return (url, scaled_img)
 
+        artwork = self.get_collection_artwork(folder, bb)
+        if artwork:
+            return artwork
+
         d = os.path.join(FOLDER_ICONS, DEFAULT_CD_IMAGE)
         p = self.util.get_folder_image_path(folder)
         if not p: p = d
@@ -403,6 +820,57 @@ class ImageUtil(object):
 
         return (p, img[1])
 
+    def get_collection_artwork(self, folder, bb):
+        """ Return folder artwork thumbnail prepared by the collector. 
+        Only folders inside the collection base folder are checked.
+
+        :param folder: folder name
+        :param bb: bounding box
+
+        :return: tuple (image path, image), None if the thumbnail is not available
+        """
+        base_folder = self.config[COLLECTION][BASE_FOLDER]
+        if not folder or not base_folder:
+            return None
+
+        if base_folder.endswith(os.sep):
+            base_folder = base_folder[:-1]
+        if folder.endswith(os.sep) and len(folder) > 1:
+            folder = folder[:-1]
+        if folder != base_folder and not folder.startswith(base_folder + os.sep):
+            return None
+
+        dbutil = self.util.get_db_util()
+        if not dbutil or not dbutil.conn:
+            return None
+
+        relative_folder = folder[len(base_folder):] or os.sep
+        artwork = dbutil.get_artwork(relative_folder, max(bb.w, bb.h))
+        if artwork == None:
+            return None
+
+        source, data = artwork
+        if not data:
+            p = os.path.join(FOLDER_ICONS, DEFAULT_CD_IMAGE)
+            img = self.load_image(p, False, (bb.w, bb.h))
+            return (p, img[1])
+
+        try:
+            img = pygame.image.load(BytesIO(data)).convert_alpha()
+        except Exception as e:
+            logging.debug(e)
+            return None
+
+        ratio = self.get_scale_ratio((bb.w, bb.h), img)
+        return (os.path.join(folder, source), self.scale_image(img, ratio))
+
+    def get_cache_statistics(self):
+        """ Get hit, miss and eviction counters, sizes and memory budget of the image caches
+
+        :return: dictionary with statistics
+        """
+        return self.memory_cache.get_statistics()
+
     def get_base64_surface(self, surface):
         """ Encode Pygame Surface using Base 64
 
@@ -412,21 +880,27 @@ class ImageUtil(object):
         """
         if surface == None:
             return None
-        
-        s = None
+
+        key = None
         try:
-            d = pygame.image.tostring(surface, "RGBA", False)
-            img = Image.frombytes("RGBA", surface.get_size(), d)
-            buffer = BytesIO()
-            img.save(buffer, "PNG")
-            s = base64.b64encode(buffer.getvalue()).decode()
-        except Exception as e:
-            logging.debug(e)
+            key = self.get_surface_hash(surface) + ENCODING_BASE64
+            s = self.encoding_cache[key]
+            return s
+        except Exception:
+            pass
+
+        s = None
+        png = self.encode_png(surface)
+        if png:
+            s = base64.b64encode(png).decode()
+            if key:
+                self.encoding_cache[key] = s
 
         return s
 
     def get_png_from_surface(self, surface):
-        """ Convert Pygame Surface to PNG image
+        """ Convert Pygame Surface to PNG image. 
+        The PNG images are cached by the surface content so unchanged surfaces are not encoded again.
 
         :param surface: Pygame Surface object
 
@@ -435,6 +909,27 @@ class ImageUtil(object):
         if surface == None:
             return None
 
+        key = None
+        try:
+            key = self.get_surface_hash(surface) + ENCODING_PNG
+            s = self.encoding_cache[key]
+            return s
+        except Exception:
+            pass
+
+        s = self.encode_png(surface)
+        if s and key:
+            self.encoding_cache[key] = s
+
+        return s
+
+    def encode_png(self, surface):
+        """ Encode Pygame Surface as PNG image without caching
+
+        :param surface: Pygame Surface object
+
+        :return: PNG image
+        """
         s = None
         try:
             d = pygame.image.tostring(surface, "RGBA", False)
@@ -447,6 +942,21 @@ class ImageUtil(object):
 
         return s
 
+    def get_surface_hash(self, surface):
+        """ Get the hash of the surface content. 
+        Hashing pixels is much faster than PNG encoding, so the hash is calculated for each request.
+
+        :param surface: Pygame Surface object
+
+        :return: hex digest of the size, pixel format and pixels
+        """
+        h = hashlib.sha1(str((surface.get_size(), surface.get_bitsize(), surface.get_masks())).encode())
+        try:
+            h.update(surface.get_view("1"))
+        except Exception:
+            h.update(pygame.image.tostring(surface, "RGBA", False)) # subsurface pixels are not contiguous
+        return h.hexdigest()
+
     def blur_image(self, surface, blur_radius, argb=False):
         """ Blur image using Gaussian method
 
@@ -464,6 +974,46 @@ class ImageUtil(object):
             surface.set_shifts((b, g, r, a))
             surface.set_masks((bm, gm, rm, am))
 
+        k = self.get_blur_factor(surface, blur_radius)
+        if k > 1:
+            small = pygame.transform.smoothscale(surface, self.get_blur_size(size, k))
+            blurred = self.blur_small_image(small, blur_radius / k)
+            return pygame.transform.smoothscale(blurred, size)
+
+        return self.blur_small_image(surface, blur_radius)
+
+    def get_blur_factor(self, surface, blur_radius):
+        """ Get downsampling factor for blurring. Blurring of the downsampled image followed by upsampling 
+        looks the same as blurring at full size but it's much faster.
+
+        :param surface: surface to blur
+        :param blur_radius: blur radius
+
+        :return: downsampling factor, 1 - no downsampling
+        """
+        if surface.get_bitsize() not in (24, 32):
+            return 1
+        return max(1, int(blur_radius / BLUR_TARGET_RADIUS))
+
+    def get_blur_size(self, size, k):
+        """ Get size of the downsampled image
+
+        :param size: original size
+        :param k: downsampling factor
+
+        :return: downsampled size
+        """
+        return (max(1, int(size[0] / k)), max(1, int(size[1] / k)))
+
+    def blur_small_image(self, surface, blur_radius):
+        """ Blur image at its current size using Gaussian method
+
+        :param surface: surface to blur
+        :param blur_radius: blur radius
+
+        :return: blurred RGBA surface
+        """
+        size = surface.get_size()
         s = pygame.image.tostring(surface, "RGBA", False)
         img = Image.frombytes("RGBA", size, s)
         
@@ -585,6 +1135,7 @@ class ImageUtil(object):
         
         :return: bitmap image rasterized from svg image
         """
+        name = filename
         if filepath:
             path = filepath
         else:
@@ -636,17 +1187,28 @@ class ImageUtil(object):
         try:
             s = self.increment_size(s, "width=\"")
             s = self.increment_size(s, "height=\"")
-
-            bytes = io.BytesIO(s.encode())
-            bitmap_image =  pygame.image.load(bytes).convert_alpha()
         except Exception as e:
             logging.debug("Problem parsing SVG file %s %s", path, e)
             return None
-        
-        if self.config[USAGE][USE_WEB]:
-            self.svg_cache[cache_path] = s
 
-        img = self.scale_svg_image(cache_path, bitmap_image, bounding_box, scale)
+        disk_key = self.get_icon_cache_key(s, bounding_box, scale)
+        img = self.load_cached_icon(cache_path, disk_key)
+
+        if img == None:
+            try:
+                bytes = io.BytesIO(s.encode())
+                bitmap_image =  pygame.image.load(bytes).convert_alpha()
+            except Exception as e:
+                logging.debug("Problem parsing SVG file %s %s", path, e)
+                return None
+            img = self.scale_svg_image(cache_path, bitmap_image, bounding_box, scale)
+            self.save_cached_icon(disk_key, img[1])
+
+        self.record_icon_request([ICON_REQUEST_SVG, name, self.get_icon_color_role(color_1), self.get_request_box(bounding_box),
+            scale, self.get_icon_color_role(color_2), gradient, cache_suffix, folder, filepath, category])
+
+        if self.config[USAGE][USE_WEB]:
+            self.svg_cache.put(cache_path, s, True)
 
         if output == "svg":
             return s
@@ -685,6 +1247,7 @@ class ImageUtil(object):
         
         :return: bitmap image rasterized from svg image
         """
+        request = [ICON_REQUEST_MULTI_COLOR, filename, self.get_request_box(bounding_box), scale, path]
         if path == None:
             filename += EXT_SVG
             path = os.path.join(FOLDER_ICONS, filename)
@@ -703,22 +1266,31 @@ class ImageUtil(object):
             pass
         
         try:
-            s = codecs.open(path, "r").read()
-            s = self.increment_size(s, "width=\"")
+            svg = codecs.open(path, "r").read()
+            s = self.increment_size(svg, "width=\"")
             s = self.increment_size(s, "height=\"")
-            bytes = io.BytesIO(s.encode())
-            svg_image =  pygame.image.load(bytes)
         except Exception as e:
             logging.debug("Problem parsing SVG file %s %s", path, e)
             return None
 
-        if self.config[USAGE][USE_WEB]:
+        if self.config[USAGE][USE_WEB] and cache_path not in self.svg_cache:
+            self.svg_cache.put(cache_path, svg, True)
+
+        disk_key = self.get_icon_cache_key(s, bounding_box, scale)
+        img = self.load_cached_icon(cache_path, disk_key)
+        if img == None:
             try:
-                self.svg_cache[cache_path]
-            except KeyError:
-                self.svg_cache[cache_path] = codecs.open(path, "r").read()
-        
-        return self.scale_svg_image(cache_path, svg_image, bounding_box, scale)
+                bytes = io.BytesIO(s.encode())
+                svg_image =  pygame.image.load(bytes)
+            except Exception as e:
+                logging.debug("Problem parsing SVG file %s %s", path, e)
+                return None
+
+            img = self.scale_svg_image(cache_path, svg_image, bounding_box, scale)
+            self.save_cached_icon(disk_key, img[1])
+
+        self.record_icon_request(request)
+        return img
 
     def scale_svg_image(self, cache_path, svg_image, bounding_box=None, scale=1.0):
         """ Scale SVG image
@@ -747,10 +1319,195 @@ class ImageUtil(object):
         h_final = int(h * scale_factor)
         
         image = self.scale_image(svg_image, (w_final, h_final))
-        self.image_cache[cache_path] = image
+        self.cache_icon(cache_path, image)
         
         return (cache_path, image)
 
+    def cache_icon(self, cache_path, image):
+        """ Put rasterized icon into the memory cache. Icons from the icons folder are pinned,
+        the least recently used of them are unpinned when they exceed the pinned budget of the cache.
+
+        :param cache_path: cache key for image
+        :param image: rasterized icon
+        """
+        pinned = cache_path.replace("\\", "/").startswith(FOLDER_ICONS + "/")
+        self.image_cache.put(cache_path, image, pinned)
+
+    def get_icon_cache_key(self, svg, bounding_box, scale):
+        """ Get the key of the rasterized icon in the disk cache. 
+        The SVG content already has the theme colors, so the key changes when the colors or the icon file change.
+
+        :param svg: SVG content prepared for rasterization
+        :param bounding_box: image bounding box
+        :param scale: scale factor
+
+        :return: cache key, None if the disk cache is disabled
+        """
+        if self.icon_disk_cache == None:
+            return None
+
+        if bounding_box:
+            bb = (bounding_box.w, bounding_box.h)
+        else:
+            bb = None
+        return self.icon_disk_cache.get_key(svg, bb, scale, self.config[SCREEN_INFO][DEPTH])
+
+    def load_cached_icon(self, cache_path, key):
+        """ Load rasterized icon from the disk cache
+
+        :param cache_path: cache key for image in the memory cache
+        :param key: disk cache key
+
+        :return: tuple (cache path, image) or None if not cached
+        """
+        if key == None:
+            return None
+
+        image = self.decode_raw_image(self.icon_disk_cache.get(key))
+        if image == None:
+            self.icon_disk_cache.remove(key)
+            return None
+
+        self.cache_icon(cache_path, image)
+        return (cache_path, image)
+
+    def save_cached_icon(self, key, image):
+        """ Save rasterized icon in the disk cache as raw RGBA pixels
+
+        :param key: disk cache key
+        :param image: rasterized icon
+        """
+        if key == None:
+            return
+
+        data = self.encode_raw_image(image)
+        if data:
+            self.icon_disk_cache.put(key, data)
+
+    def get_icon_color_role(self, color):
+        """ Get the theme role of the icon color (e.g. main or selected icon color)
+
+        :param color: hex color
+
+        :return: role name with prefix, the color itself if it's not a theme color
+        """
+        for role, c in self.icon_colors.items():
+            if c == color:
+                return ICON_COLOR_ROLE_PREFIX + role
+        return color
+
+    def get_icon_color(self, role):
+        """ Get the current theme color by role
+
+        :param role: role name with prefix or hex color
+
+        :return: hex color
+        """
+        if role and role.startswith(ICON_COLOR_ROLE_PREFIX):
+            return self.icon_colors.get(role[len(ICON_COLOR_ROLE_PREFIX):])
+        return role
+
+    def get_request_box(self, bounding_box):
+        """ Convert bounding box to the JSON serializable form
+
+        :param bounding_box: bounding box or None
+
+        :return: list [width, height] or None
+        """
+        if bounding_box == None:
+            return None
+        return [bounding_box.w, bounding_box.h]
+
+    def record_icon_request(self, request):
+        """ Remember icon request in the manifest. The manifest is used by the cache warmer
+        to rasterize the same icons with the current theme colors. Theme colors are saved as roles.
+
+        :param request: list of icon loading parameters
+        """
+        if self.icon_manifest == None:
+            return
+
+        key = json.dumps(request)
+        if self.icon_manifest.get(key, None) != None:
+            return
+
+        self.icon_manifest.put(key, None, request)
+        with self.icon_manifest_lock:
+            if self.icon_manifest_timer != None:
+                return
+            self.icon_manifest_timer = Timer(ICON_MANIFEST_SAVE_DELAY, self.save_icon_manifest)
+            self.icon_manifest_timer.daemon = True
+            self.icon_manifest_timer.start()
+
+    def save_icon_manifest(self):
+        """ Save icon manifest. Called by timer to save all requests of the screen at once. """
+
+        with self.icon_manifest_lock:
+            self.icon_manifest_timer = None
+        self.icon_manifest.save()
+
+    def get_icon_requests(self):
+        """ Get all icon requests from the manifest
+
+        :return: list of requests
+        """
+        if self.icon_manifest == None:
+            return []
+        return self.icon_manifest.get_values()
+
+    def load_icon_request(self, request):
+        """ Load icon using the request from the manifest
+
+        :param request: list of icon loading parameters
+
+        :return: icon image or None
+        """
+        box = request[2] if request[0] == ICON_REQUEST_MULTI_COLOR else request[3]
+        if box != None:
+            box = pygame.Rect(0, 0, box[0], box[1])
+
+        if request[0] == ICON_REQUEST_MULTI_COLOR:
+            _, filename, _, scale, path = request
+            return self.load_multi_color_svg_icon(filename, box, scale, path)
+
+        _, filename, color_1, _, scale, color_2, gradient, cache_suffix, folder, filepath, category = request
+        return self.load_svg_icon(filename, self.get_icon_color(color_1), box, scale, self.get_icon_color(color_2),
+            gradient, cache_suffix, folder, filepath, category)
+
+    def encode_raw_image(self, image):
+        """ Convert image to raw RGBA pixels with width and height header
+
+        :param image: image
+
+        :return: image data or None
+        """
+        if image == None:
+            return None
+
+        try:
+            w, h = image.get_size()
+            return struct.pack(RAW_IMAGE_HEADER, w, h) + pygame.image.tostring(image, "RGBA", False)
+        except Exception as e:
+            logging.debug(e)
+            return None
+
+    def decode_raw_image(self, data):
+        """ Create image from raw RGBA pixels with width and height header
+
+        :param data: image data
+
+        :return: image or None
+        """
+        if not data or len(data) < RAW_IMAGE_HEADER_SIZE:
+            return None
+
+        try:
+            w, h = struct.unpack_from(RAW_IMAGE_HEADER, data)
+            return pygame.image.fromstring(data[RAW_IMAGE_HEADER_SIZE:], (w, h), "RGBA").convert_alpha()
+        except Exception as e:
+            logging.debug(e)
+            return None
+
     def get_image_names_from_folder(self, folder):
         """ Get image names from folder
         
@@ -918,7 +1675,7 @@ class ImageUtil(object):
             return (icon_folder[0], scaled_img)
         elif file_type == FILE_AUDIO:
             if self.config[ENABLE_EMBEDDED_IMAGES]:
-                img = self.get_image_from_audio_file(url)
+                img = self.get_audio_file_art(url, image_box)
             else:
                 img = None
 
@@ -968,7 +1725,7 @@ class ImageUtil(object):
             try:
                 url = self.album_art_url_cache[album]
             except:
-                url = self.discogs_util.get_album_art_url(album)
+                url = self.get_album_art_url(album)
                 if url != None:
                     self.album_art_url_cache[album] = url
         
@@ -982,11 +1739,8 @@ class ImageUtil(object):
                 return (url, i)
             except KeyError:
                 pass
-            img = self.load_image_from_url(url)
+            img = self.load_image_from_url(url, (bb.w, bb.h))
 
-        if img == None:
-            return None
-        
         if img == None:
             return None
 
@@ -1002,6 +1756,24 @@ class ImageUtil(object):
         
         return (url, img)
 
+    def get_album_art_url(self, album):
+        """ Find album art URL using Discogs. The found URLs are saved in the album art disk cache.
+        
+        :param album: artist name, song name
+        
+        :return: album art URL or None if not found
+        """
+        name = DISCOGS_URL_PREFIX + album
+        if self.art_cache != None:
+            url = self.art_cache.get_value(name)
+            if url:
+                return url
+
+        url = self.discogs_util.get_album_art_url(album)
+        if url != None and self.art_cache != None:
+            self.art_cache.put_value(name, url)
+        return url
+
     def get_flipclock_digits(self, bb):
         """ Get digits for the flip clock
         
@@ -1068,21 +1840,36 @@ class ImageUtil(object):
         else:
             return "#%06x" % ((color[0] << 16) + (color[1] << 8) + color[2])
 
-    def load_image_from_url(self, url):
+    def load_image_from_url(self, url, size=None, use_cache=True):
         """ Load image from specified URL
         
         :param url: image url
+        :param size: tuple (width, height) of the area where the image will be shown, 
+            the cached image of the nearest size class will be returned, None - original size
+        :param use_cache: True - use album art disk cache, False - always download the image
         
         :return: image from url
         """
+        if use_cache and self.art_cache != None:
+            image = self.get_art(url, lambda: self.download_image(url), size)
+        else:
+            image = self.decode_art(self.download_image(url))
+
+        if image == None:
+            return None
+        return (url, image)
+
+    def download_image(self, url):
+        """ Download image from specified URL
+        
+        :param url: image url
+        
+        :return: image data or None
+        """
         try:
             hdrs = {'User-Agent': 'PeppyPlayer + https://github.com/project-owner/Peppy'}
             req = request.Request(url, headers=hdrs)
-            stream = urlopen(req, timeout=HTTP_CONNECTION_TIMEOUT_SEC).read()
-
-            buf = BytesIO(stream)
-            image = pygame.image.load(buf).convert_alpha()
-            return (url, image)
+            return urlopen(req, timeout=HTTP_CONNECTION_TIMEOUT_SEC).read()
         except Exception as e:
             logging.debug(e)
             return None
@@ -1113,7 +1900,7 @@ class ImageUtil(object):
         :return: hash of the input string
         """
         img_scaled = None
-        img = self.load_image_from_url(url)
+        img = self.load_image_from_url(url, (w, h))
         image_padding = 4 
         if img:
             img_scaled = self.scale_image_with_padding(w, h, img[1], image_padding, 1.0)                
@@ -1146,32 +1933,43 @@ class ImageUtil(object):
 
         return None
 
-    def prepare_background(self, surface, section):
+    def prepare_background(self, surface, section, size=None):
         """
         Paint surface by specified color.
 
         :param surface: surface to paint
         :param section: background definition
+        :param size: size of the new surface, None - the size of the input surface. 
+            The input surface can be smaller than the new surface if it's blurred.
 
         :return: new painted surface
         """
         image = surface
-        size = surface.get_size()
-        result = pygame.Surface(size)
-        result.fill((0, 0, 0), None, pygame.BLEND_RGB_ADD)
+        if size == None:
+            size = surface.get_size()
         overlay = section[OVERLAY_COLOR]
         overlay_opacity = section[OVERLAY_OPACITY]
         blur_radius = section[BLUR_RADIUS]
 
         if blur_radius and blur_radius > 0:
-            image = self.blur_image(image, blur_radius)
+            r = blur_radius * image.get_size()[0] / size[0]
+            k = self.get_blur_factor(image, r)
+            if k > 1:
+                image = pygame.transform.smoothscale(image, self.get_blur_size(image.get_size(), k))
+                r = r / k
+            image = self.blur_small_image(image, r)
 
         if overlay:
             image.fill(overlay, None, pygame.BLEND_RGBA_ADD)
             image.fill((255, 255, 255, overlay_opacity), None, pygame.BLEND_RGBA_MULT)
 
+        result = pygame.Surface(image.get_size())
+        result.fill((0, 0, 0), None, pygame.BLEND_RGB_ADD)
         result.blit(image, (0, 0))
 
+        if result.get_size() != size:
+            result = pygame.transform.smoothscale(result, size)
+
         return result
 
     def get_background_count(self):
@@ -1194,11 +1992,7 @@ class ImageUtil(object):
 
         :return: background image tuple - (filename, image) or None if not found
         """
-        definitions = self.config[BACKGROUND_DEFINITIONS]
-        names = self.config[BACKGROUND][SCREEN_BGR_NAMES]
-        if len(names) == 1 and len(names[0]) == 0:
-            names = list(definitions.keys())
-            del names[0]
+        names = self.get_screen_bgr_names()
 
         if index != None:
             name = names[index]
@@ -1225,6 +2019,18 @@ class ImageUtil(object):
             pass
 
         path = os.path.join(FOLDER_BACKGROUNDS, filename)
+        key = None
+        try:
+            stats = os.stat(path)
+            key = self.get_background_key(path + str(stats.st_mtime) + str(stats.st_size), info)
+            i = self.load_cached_background(key)
+            if i:
+                background = (filename, i, info["num"])
+                self.background_cache[cache_key] = background
+                return background
+        except Exception as e:
+            logging.debug(e)
+
         image = self.load_pygame_image(path, None, use_cache=False)
 
         if not image:
@@ -1243,9 +2049,12 @@ class ImageUtil(object):
             img = self.scale_image(image[1], scale_ratio)
             i = self.prepare_background(img, info)
 
-        self.background_cache[cache_key] = (filename, i, info["num"])
+        if key:
+            self.save_cached_background(key, i)
+        background = (filename, i, info["num"])
+        self.background_cache[cache_key] = background
 
-        return self.background_cache[cache_key]
+        return background
 
     def tint_image(self, src):
         """ Tint the provided image 
@@ -1356,10 +2165,11 @@ class ImageUtil(object):
             if self.config[ALIGN_BUTTON_CONTENT_X] == CENTER and len(folder_name) == 1 and folder_name.isalpha() and self.config[HIDE_FOLDER_NAME]:
                 s.show_label = False
 
-    def get_album_art_bgr(self, image):
+    def get_album_art_bgr(self, image, source=None):
         """ Get album art background image
 
         :param image: input image
+        :param source: image source (file path or URL), None - unknown source
 
         :return: background image
         """
@@ -1374,17 +2184,141 @@ class ImageUtil(object):
         image_w = image.get_size()[0]
         image_h = image.get_size()[1]
 
-        k = screen_w / image_w
+        key = self.get_background_key(self.get_album_art_identity(image, source), s)
+        cached = self.load_cached_background(key)
+        if cached:
+            return cached
+
+        blur_factor = 1
+        if s[BLUR_RADIUS] and s[BLUR_RADIUS] > 0:
+            blur_factor = self.get_blur_factor(image, s[BLUR_RADIUS])
+        w, h = self.get_blur_size((screen_w, screen_h), blur_factor)
+
+        k = w / image_w
+
+        scale_ratio = (max(1, int(image_w * k)), max(1, int(image_h * k)))
+        if image.get_bitsize() in (24, 32):
+            img = pygame.transform.smoothscale(image, scale_ratio)
+        else:
+            img = self.scale_image(image, scale_ratio)
+
+        bgr = pygame.Surface((w, h))
+        y = (h - img.get_size()[1]) /2
+
+        bgr.blit(img, (0, 0), (0, abs(y), w, h))
+
+        result = self.prepare_background(bgr, s, (screen_w, screen_h))
+        self.save_cached_background(key, result)
+        return result
+
+    def get_album_art_identity(self, image, source):
+        """ Get the identity of the album art image used in the background key. 
+        File sources are identified by the path, modification time and size, URLs by the URL. 
+        For other sources (e.g. generated names) the pixels are hashed once per image object.
+
+        :param image: album art image
+        :param source: image source (file path or URL), None - unknown source
+
+        :return: identity string
+        """
+        size = str(image.get_size())
+        if isinstance(source, str) and source:
+            if source.startswith("http://") or source.startswith("https://"):
+                return source + size
+            try:
+                if os.path.isfile(source):
+                    stats = os.stat(source)
+                    return source + str(stats.st_mtime) + str(stats.st_size) + size
+            except Exception as e:
+                logging.debug(e)
+
+        for i, k in self.album_art_keys:
+            if i is image:
+                return k
+
+        k = hashlib.sha1(pygame.image.tostring(image, "RGB")).hexdigest() + size
+        self.album_art_keys.append((image, k))
+        if len(self.album_art_keys) > MAX_ALBUM_ART_KEYS:
+            del self.album_art_keys[0]
+        return k
+
+    def get_screen_bgr_names(self):
+        """ Get names of the screen background definitions
+
+        :return: list of names
+        """
+        definitions = self.config[BACKGROUND_DEFINITIONS]
+        names = self.config[BACKGROUND][SCREEN_BGR_NAMES]
+        if len(names) == 1 and len(names[0]) == 0:
+            names = list(definitions.keys())
+            del names[0]
+        return names
+
+    def get_background_key(self, source, section):
+        """ Create the key of the prepared background image. 
+        The key depends on the source image, blur radius, overlay and screen size.
 
-        scale_ratio = (int(image_w * k), int(image_h * k))
-        img = self.scale_image(image, scale_ratio)
+        :param source: source image file path or source image pixels
+        :param section: background definition
+
+        :return: key
+        """
+        h = hashlib.sha1(source if isinstance(source, bytes) else source.encode("utf-8"))
+        h.update(str((section[BLUR_RADIUS], section[OVERLAY_COLOR], section[OVERLAY_OPACITY],
+            self.config[SCREEN_INFO][WIDTH], self.config[SCREEN_INFO][HEIGHT])).encode("utf-8"))
+        return h.hexdigest()
 
-        bgr = pygame.Surface((screen_w, screen_h))
-        y = (screen_h - img.get_size()[1]) /2
+    def load_cached_background(self, key):
+        """ Load prepared background image from the memory or disk cache
 
-        bgr.blit(img, (0, 0), (0, abs(y), screen_w, screen_h))
+        :param key: background key
 
-        return self.prepare_background(bgr, s)
+        :return: background image or None if not cached
+        """
+        img = self.prepared_background_cache.get(key)
+        if img != None or self.background_disk_cache == None:
+            return img
+
+        data = self.background_disk_cache.get(key)
+        if not data:
+            return None
+
+        try:
+            img = pygame.image.load(BytesIO(data), BACKGROUND_CACHE_EXTENSION).convert()
+        except Exception as e:
+            logging.debug(e)
+            self.background_disk_cache.remove(key)
+            return None
+
+        self.prepared_background_cache[key] = img
+        return img
+
+    def save_cached_background(self, key, image):
+        """ Save prepared background image in the memory and disk cache
+
+        :param key: background key
+        :param image: background image
+        """
+        self.prepared_background_cache[key] = image
+        if self.background_disk_cache == None:
+            return
+        if self.write_backgrounds_async:
+            Thread(target=self.write_cached_background, args=(key, image.copy()), daemon=True).start()
+        else:
+            self.write_cached_background(key, image)
+
+    def write_cached_background(self, key, image):
+        """ Thread method. Encode background image and save it in the disk cache.
+
+        :param key: background key
+        :param image: background image
+        """
+        try:
+            buffer = BytesIO()
+            pygame.image.save(image, buffer, BACKGROUND_CACHE_EXTENSION)
+            self.background_disk_cache.put(key, buffer.getvalue())
+        except Exception as e:
+            logging.debug(e)
 
     def get_thumbnail(self, img_name, k, f, bb):
         """ Get thumbnail image
@@ -1410,7 +2344,7 @@ class ImageUtil(object):
         if thumbnail != None:
             return thumbnail
 
-        image = self.load_image_from_url(img_name)
+        image = self.load_image_from_url(img_name, (bb.w * f, bb.h * f))
         if image != None:
             scale_ratio = self.get_scale_ratio((bb.w * f, bb.h * f), image[1], fit_height=True)
             thumbnail = (img_name, self.scale_image(image, scale_ratio))
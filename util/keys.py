@@ -142,6 +142,7 @@ GENRE = "genre"
 USER_EVENT_TYPE = pygame.USEREVENT + 1
 REST_EVENT_TYPE = pygame.USEREVENT + 2
 SELECT_EVENT_TYPE = pygame.USEREVENT + 3
+WAKE_EVENT_TYPE = pygame.USEREVENT + 4
 SUB_TYPE_KEYBOARD = 0
 KEY_SUB_TYPE = "sub_type"
 KEY_ACTION = "action"
@@ -395,7 +395,7 @@ class PodcastsUtil(object):
         cache_key = PODCASTS + str(k) + str(f) 
         if len(img_name) != 0:
             if online:
-                image = self.image_util.load_image_from_url(img_name)
+                image = self.image_util.load_image_from_url(img_name, (bb.w * f, bb.h * f))
             else:
                 image = self.image_util.load_image(img_name)
                 
@@ -0,0 +1,210 @@
+# Copyright 2026 Peppy Player peppy.player@gmail.com
+#
+# This file is part of Peppy Player.
+#
+# Peppy Player is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Peppy Player is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Peppy Player. If not, see <http://www.gnu.org/licenses/>.
+
+import logging
+
+from util.cache import get_object_size
+
+class ScreenManager(dict):
+    """ Dictionary of the screens which keeps the recently used screens only.
+    When the number of screens or their estimated memory size exceeds the limit the least recently used
+    screens are evicted. Only the screens with registered builders can be evicted, they are rebuilt
+    by the builder when they are requested next time. Player screens, the current and the previous screens
+    are never evicted.
+    """
+
+    def __init__(self, max_screens=0, memory_budget=0, memory_cache=None):
+        """ Initializer
+
+        :param max_screens: maximum number of screens, 0 - unlimited
+        :param memory_budget: memory budget for evictable screens in bytes, 0 - unlimited
+        :param memory_cache: shared image cache, its images are not counted in the screen size
+        """
+        dict.__init__(self)
+        self.max_screens = max_screens
+        self.memory_budget = memory_budget
+        self.memory_cache = memory_cache
+        self.builders = {}
+        self.release_listeners = {}
+        self.order = []
+        self.sizes = {}
+
+    def add_builder(self, name, builder, release_listener=None):
+        """ Make the screen evictable
+
+        :param name: screen name
+        :param builder: function which creates the screen and makes it current, takes the button state
+        :param release_listener: function called with the evicted screen (e.g. to remove listeners)
+        """
+        self.builders[name] = builder
+        if release_listener:
+            self.release_listeners[name] = release_listener
+
+    def __setitem__(self, name, screen):
+        """ Add screen
+
+        :param name: screen name
+        :param screen: screen object
+        """
+        dict.__setitem__(self, name, screen)
+        self.sizes.pop(name, None)
+        self.touch(name)
+
+    def __delitem__(self, name):
+        """ Remove screen
+
+        :param name: screen name
+        """
+        dict.__delitem__(self, name)
+        self.sizes.pop(name, None)
+        if name in self.order:
+            self.order.remove(name)
+
+    def retain(self, names):
+        """ Remove all screens except specified
+
+        :param names: names of the screens to keep
+        """
+        for name in list(self.keys()):
+            if name not in names:
+                del self[name]
+
+    def touch(self, name):
+        """ Mark the screen as the most recently used
+
+        :param name: screen name
+        """
+        if name in self.order:
+            self.order.remove(name)
+        self.order.append(name)
+
+    def rebuild(self, name, state=None):
+        """ Rebuild evicted screen
+
+        :param name: screen name
+        :param state: button state passed to the builder
+
+        :return: True - screen was rebuilt, False - there is no builder for the screen
+        """
+        builder = self.builders.get(name)
+        if builder == None:
+            return False
+
+        logging.debug(f"Rebuild screen {name}")
+        builder(state)
+        return True
+
+    def set_current(self, name, previous_name=None):
+        """ Mark the screen as current. Evict screens if the limits are exceeded.
+
+        :param name: current screen name
+        :param previous_name: previous screen name
+        """
+        self.touch(name)
+
+        if self.memory_budget and previous_name in self.builders and previous_name in self:
+            if self.memory_cache != None:
+                shared = self.memory_cache.get_object_ids()
+            else:
+                shared = set()
+            self.sizes[previous_name] = self.get_screen_size(self[previous_name], shared)
+
+        pinned = [name, previous_name]
+        for n in list(self.order):
+            if not self.is_limit_exceeded():
+                break
+            if n in pinned or n not in self.builders or n not in self:
+                continue
+            screen = self[n]
+            if getattr(screen, "player_screen", False):
+                continue
+            self.evict(n)
+
+    def is_limit_exceeded(self):
+        """ Check if the number of screens or their memory size exceeds the limit
+
+        :return: True - some screens should be evicted, False - limits are not exceeded
+        """
+        if self.max_screens and len(self) > self.max_screens:
+            return True
+
+        if self.memory_budget:
+            size = sum([self.sizes.get(n, 0) for n in self.builders if n in self])
+            if size > self.memory_budget:
+                return True
+
+        return False
+
+    def evict(self, name):
+        """ Remove the screen, stop its image loading and notify release listener
+
+        :param name: screen name
+        """
+        screen = self[name]
+        del self[name]
+        logging.debug(f"Evict screen {name}")
+
+        listener = self.release_listeners.get(name)
+        if listener:
+            try:
+                listener(screen)
+            except Exception as e:
+                logging.debug(e)
+
+        self.release_components(screen)
+
+    def release_components(self, component):
+        """ Cancel image loading and drop the components of the evicted screen
+
+        :param component: screen or container
+        """
+        cancel = getattr(component, "cancel_image_loading", None)
+        if cancel:
+            cancel()
+
+        components = getattr(component, "components", None)
+        if not components:
+            return
+
+        for c in components:
+            if c != None:
+                self.release_components(c)
+        component.components = []
+
+    def get_screen_size(self, component, shared):
+        """ Estimate the memory size of the surfaces owned by the screen. 
+        The surfaces from the shared cache are not released with the screen so they are not counted.
+        Each surface is counted once.
+
+        :param component: screen or container
+        :param shared: identifiers of the cached and already counted surfaces
+
+        :return: size in bytes
+        """
+        size = 0
+        content = getattr(component, "content", None)
+        if isinstance(content, tuple) and len(content) > 1:
+            content = content[1]
+        if content != None and hasattr(content, "get_bytesize") and id(content) not in shared:
+            shared.add(id(content))
+            size += get_object_size(content)
+
+        for c in getattr(component, "components", None) or []:
+            if c != None:
+                size += self.get_screen_size(c, shared)
+
+        return size
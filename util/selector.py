@@ -15,8 +15,12 @@
 # You should have received a copy of the GNU General Public License
 # along with Peppy Player. If not, see <http://www.gnu.org/licenses/>.
 
-from util.collector import DbUtil
-from util.keys import KEY_ABC, KEY_SEARCH
+from collections import OrderedDict
+from util.collector import DbUtil, FTS_COLUMNS, get_key, get_key_column
+from util.keys import KEY_ABC, KEY_SEARCH, KEY_LIST
+
+KEY_DETAIL = "detail"
+MAX_PAGE_BOUNDARIES = 32
 
 class Selector(object):
     """ Collection of the SQL select statements and helper functions """
@@ -31,6 +35,10 @@ class Selector(object):
         else:
             self.dbutil = DbUtil()
 
+        self.page_boundaries = OrderedDict()
+        self.item_counts = OrderedDict()
+        self.data_version = None
+
     def get_sign(self, next):
         """ Get comparison sign
 
@@ -41,6 +49,52 @@ class Selector(object):
         if next: return ">"
         else: return "<"
 
+    def get_prefix_range(self, prefix):
+        """ Get the range of normalized values starting with the provided prefix.
+        The range can be used with the indexed normalized columns instead of the LIKE operator.
+
+        :param prefix: prefix string
+
+        :return: tuple with the lower (inclusive) and upper (exclusive) bounds
+        """
+        low = get_key(prefix)
+        if not low:
+            return ("", chr(0x10FFFF))
+        high = low[:-1] + chr(ord(low[-1]) + 1)
+        return (low, high)
+
+    def is_fts_search(self, column, pattern):
+        """ Check if the full-text search table can be used for the pattern search
+
+        :param column: column name
+        :param pattern: search pattern
+
+        :return: True - use full-text search, False - use LIKE operator
+        """
+        return self.dbutil.fts_available and column in FTS_COLUMNS and len(self.get_tokens(pattern)) > 0
+
+    def get_tokens(self, pattern):
+        """ Split search pattern into tokens
+
+        :param pattern: search pattern
+
+        :return: list of tokens
+        """
+        if not pattern:
+            return []
+        return [t.replace('"', "") for t in pattern.split() if t.replace('"', "")]
+
+    def get_fts_query(self, column, pattern):
+        """ Get full-text search expression. Each token is matched as a prefix, all tokens should match.
+
+        :param column: column name
+        :param pattern: search pattern
+
+        :return: full-text search MATCH expression
+        """
+        tokens = " AND ".join([f'"{t}"*' for t in self.get_tokens(pattern)])
+        return f"{column} : ({tokens})"
+
     def get_count(self, result, page_size):
         """ Get page count
 
@@ -74,19 +128,236 @@ class Selector(object):
                     result.append((n[0], n[1]))
         return result
 
-    def get_offset(self, page, next, page_size):
-        """ Get offset clause
+    def get_values(self, r):
+        """ Get the list of topic values from the result set with (normalized value, value) rows
 
-        :param page: page number
-        :param next: next or previous page
+        :param r: result set
+
+        :return: list of values
+        """
+        result = []
+        if r:
+            for n in r:
+                result.append(n[1])
+        return result
+
+    def get_source(self, kind, column, search_str=None):
+        """ Get the row source for the kind of the page
+
+        :param kind: page kind - list, ABC, search or detail
+        :param column: topic column name
+        :param search_str: search string, character or selection (if any)
+
+        :return: tuple (table, condition, parameters, ordered columns)
+        """
+        if kind == KEY_DETAIL:
+            condition = f"{get_key_column(column)} = ? AND {column} = ?"
+            return (self.dbutil.table_name, condition, (get_key(search_str), search_str), ["folder"])
+        elif kind == KEY_ABC:
+            condition, params = self.get_char_condition(search_str)
+            condition += " AND LENGTH(value_key) > 2"
+            return (self.dbutil.get_topic_table(column), condition, params, ["value_key", "value"])
+        elif kind == KEY_SEARCH:
+            key = get_key_column(column)
+            if self.is_fts_search(column, search_str):
+                fts = self.dbutil.fts_table_name
+                condition = f"LENGTH({key}) > 2 AND id IN (SELECT rowid FROM {fts} WHERE {fts} MATCH ?)"
+                return (self.dbutil.table_name, condition, (self.get_fts_query(column, search_str),), [key, column])
+            condition = "LENGTH(value_key) > 2 AND value_key like ?"
+            params = ("%" + get_key(search_str) + "%",)
+            return (self.dbutil.get_topic_table(column), condition, params, ["value_key", "value"])
+        else:
+            return (self.dbutil.get_topic_table(column), "1 = 1", (), ["value_key", "value"])
+
+    def get_source_count(self, kind, column, search_str):
+        """ Get the number of items in the row source. The detail count is taken from the topic table, 
+        the topic table rows are unique so they are counted without DISTINCT. Only the full-text search 
+        in the metadata table needs DISTINCT. The count is kept until the collection is changed.
+
+        :param kind: page kind - list, ABC, search or detail
+        :param column: topic column name
+        :param search_str: search string, character or selection (if any)
+
+        :return: number of items
+        """
+        self.check_data_version()
+        k = (kind, column, search_str)
+        count = self.item_counts.get(k, None)
+        if count != None:
+            self.item_counts.move_to_end(k)
+            return count
+
+        table, condition, params, columns = self.get_source(kind, column, search_str)
+        if kind == KEY_DETAIL:
+            query = f"SELECT folders FROM {self.dbutil.get_topic_table(column)} WHERE value_key = ? AND value = ?"
+        elif table == self.dbutil.table_name:
+            query = f"""
+                SELECT COUNT(*) FROM (
+                    SELECT DISTINCT {", ".join(columns)}
+                    FROM {table}
+                    WHERE {condition}
+                )
+            """
+        else:
+            query = f"SELECT COUNT(*) FROM {table} WHERE {condition}"
+
+        r = self.dbutil.run_parameterized_query(query, params)
+        if r == None:
+            return 0
+        count = 0
+        if r:
+            count = int(r[0][0])
+        self.item_counts[k] = count
+        if len(self.item_counts) > MAX_PAGE_BOUNDARIES:
+            self.item_counts.popitem(last=False)
+        return count
+
+    def get_source_page_count(self, kind, column, search_str, page_size):
+        """ Get page count for the kind of the page. The same row source is used for the pages,
+        so the page count always matches the pages.
+
+        :param kind: page kind - list, ABC, search or detail
+        :param column: topic column name
+        :param search_str: search string, character or selection (if any)
         :param page_size: page size
 
-        :return: empty string for next, OFFSET clause for previous
+        :return: page count
         """
+        return self.get_count([(self.get_source_count(kind, column, search_str),)], page_size)
+
+    def get_seek_values(self, columns, value):
+        """ Get keyset values for the item value
+
+        :param columns: ordered columns
+        :param value: item value
+
+        :return: tuple of values for all ordered columns
+        """
+        if len(columns) == 1:
+            return (value,)
+        else:
+            return (get_key(value), value)
+
+    def seek(self, source, values, next, page_size, inclusive=False):
+        """ Get page using keyset seek
+
+        :param source: row source
+        :param values: keyset values, None - start from the beginning
+        :param next: True - rows after the values, False - rows before the values
+        :param page_size: page size
+        :param inclusive: True - include the row with provided values
+
+        :return: list of values
+        """
+        table, condition, params, columns = source
+        csv = ", ".join(columns)
+
+        if values != None:
+            placeholders = ", ".join(["?" for _ in columns])
+            if inclusive:
+                sign = ">="
+            else:
+                sign = self.get_sign(next)
+            condition += f" AND ({csv}) {sign} ({placeholders})"
+            params = params + tuple(values)
+
         if next:
-            return ""
+            order = ", ".join([c + " ASC" for c in columns])
         else:
-            return "OFFSET " + str((page - 1) * page_size)
+            order = ", ".join([c + " DESC" for c in columns])
+
+        query = f"""
+            SELECT DISTINCT {csv}
+            FROM {table}
+            WHERE {condition}
+            ORDER BY {order}
+            LIMIT {page_size}
+        """
+        r = self.dbutil.run_parameterized_query(query, params)
+        if not r:
+            return []
+        if not next:
+            r.reverse()
+        return [n[len(columns) - 1] for n in r]
+
+    def check_data_version(self):
+        """ Drop page boundaries if the collection was changed """
+
+        version = self.dbutil.get_data_version()
+        if version != self.data_version:
+            self.page_boundaries.clear()
+            self.item_counts.clear()
+            self.data_version = version
+
+    def get_page_boundaries(self, kind, column, search_str, page_size):
+        """ Get keyset values of the first item for each page. The list is built once per topic and filter.
+        Only MAX_PAGE_BOUNDARIES recently used lists are kept.
+
+        :param kind: page kind
+        :param column: topic column name
+        :param search_str: search string, character or selection (if any)
+        :param page_size: page size
+
+        :return: list of keyset values
+        """
+        self.check_data_version()
+        k = (kind, column, search_str, page_size)
+        boundaries = self.page_boundaries.get(k, None)
+        if boundaries != None:
+            self.page_boundaries.move_to_end(k)
+            return boundaries
+
+        table, condition, params, columns = self.get_source(kind, column, search_str)
+        csv = ", ".join(columns)
+        query = f"""
+            SELECT {csv} FROM (
+                SELECT {csv}, ROW_NUMBER() OVER (ORDER BY {csv}) - 1 AS n FROM (
+                    SELECT DISTINCT {csv}
+                    FROM {table}
+                    WHERE {condition}
+                )
+            )
+            WHERE n % {page_size} = 0
+            ORDER BY {csv}
+        """
+        r = self.dbutil.run_parameterized_query(query, params)
+        if r == None:
+            return []
+        boundaries = [tuple(n) for n in r]
+        self.page_boundaries[k] = boundaries
+        if len(self.page_boundaries) > MAX_PAGE_BOUNDARIES:
+            self.page_boundaries.popitem(last=False)
+        return boundaries
+
+    def get_page_by_number(self, kind, column, search_str, current_page, previous_page, first, last, page_size):
+        """ Get page by number. Adjacent pages are fetched by seeking from the first or last item, 
+        other pages are fetched by seeking from the page boundary.
+
+        :param kind: page kind
+        :param column: topic column name
+        :param search_str: search string, character or selection (if any)
+        :param current_page: current page number
+        :param previous_page: previous page number
+        :param first: first item in previous select
+        :param last: last item in previous select
+        :param page_size: page size
+
+        :return: list of items for the page
+        """
+        source = self.get_source(kind, column, search_str)
+        columns = source[3]
+
+        if current_page <= 1:
+            return self.seek(source, None, True, page_size)
+        elif current_page == previous_page + 1 and last:
+            return self.seek(source, self.get_seek_values(columns, last), True, page_size)
+        elif current_page == previous_page - 1 and first:
+            return self.seek(source, self.get_seek_values(columns, first), False, page_size)
+
+        boundaries = self.get_page_boundaries(kind, column, search_str, page_size)
+        if current_page > len(boundaries):
+            return []
+        return self.seek(source, boundaries[current_page - 1], True, page_size, inclusive=True)
 
     def get_topic_page(self, mode, topic, search_str, current_page, previous_page, first, last, page_size):
         """ Dispatching function to get topic page
@@ -121,12 +392,7 @@ class Selector(object):
 
         :return: list of items for topic page
         """
-        if current_page == previous_page:
-            return self.get_page(topic, page_size)
-        elif current_page > previous_page:
-            return self.get_page(topic, page_size, last, None, True)
-        elif current_page < previous_page:
-            return self.get_page(topic, page_size, first, current_page, False)
+        return self.get_page_by_number(KEY_LIST, topic, None, current_page, previous_page, first, last, page_size)
 
     def get_abc_page(self, topic, search_str, current_page, previous_page, first, last, page_size=10):
         """ Get the list of items for the topic page with alphabetical search
@@ -141,12 +407,7 @@ class Selector(object):
 
         :return: list of items for topic page
         """
-        if current_page == previous_page:
-            return self.get_page_by_char(topic, search_str, page_size=page_size)
-        elif current_page > previous_page:
-            return self.get_page_by_char(topic, search_str, last, None, True, page_size=page_size)
-        elif current_page < previous_page:
-            return self.get_page_by_char(topic, search_str, first, current_page, False, page_size=page_size)
+        return self.get_page_by_number(KEY_ABC, topic, search_str, current_page, previous_page, first, last, page_size)
 
     def get_search_page(self, topic, search_str, current_page, previous_page, first, last, page_size):
         """ Get the list of items for the topic page with keyboard search
@@ -161,12 +422,20 @@ class Selector(object):
 
         :return: list of items for topic page
         """
-        if current_page == previous_page:
-            return self.get_page_by_pattern(topic, search_str, page_size=page_size)
-        elif current_page > previous_page:
-            return self.get_page_by_pattern(topic, search_str, last, True, page_size=page_size)
-        elif current_page < previous_page:
-            return self.get_page_by_pattern(topic, search_str, first, current_page, False, page_size=page_size)
+        return self.get_page_by_number(KEY_SEARCH, topic, search_str, current_page, previous_page, first, last, page_size)
+
+    def get_char_condition(self, ch):
+        """ Get condition filtering topic table by the first character(s)
+
+        :param ch: character
+
+        :return: tuple (SQL condition, parameters)
+        """
+        key = get_key(ch)
+        if key and len(key) == 1:
+            return ("first_char = ?", (key,))
+        low, high = self.get_prefix_range(ch)
+        return ("value_key >= ? AND value_key < ?", (low, high))
 
     def get_page_count(self, column, page_size):
         """ Get page count
@@ -176,12 +445,7 @@ class Selector(object):
 
         :return: page count
         """
-        query = f"""
-            SELECT COUNT(DISTINCT {column})
-            FROM {self.dbutil.table_name}
-            WHERE LENGTH({column}) > 0
-        """
-        return self.get_count(self.dbutil.run_parameterized_query(query, ()), page_size)
+        return self.get_source_page_count(KEY_LIST, column, None, page_size)
 
     def get_page(self, column, page_size, value="", page=None, next=True):
         """ Get values for the current page
@@ -194,16 +458,7 @@ class Selector(object):
 
         :return: list of values
         """
-        query = f"""
-            SELECT DISTINCT {column}
-            FROM {self.dbutil.table_name} 
-            WHERE LENGTH({column}) > 0 AND 
-            {column} {self.get_sign(next)} ?
-            ORDER BY {column} ASC 
-            LIMIT {page_size} {self.get_offset(page, next, page_size)}
-        """
-        g = self.get_list(self.dbutil.run_parameterized_query(query, (value,)))
-        return g
+        return self.get_page_by_value(KEY_LIST, column, None, value, next, page_size)
 
     def get_page_count_by_char(self, column, ch, page_size):
         """ Get page count filtered by the first character
@@ -214,14 +469,7 @@ class Selector(object):
 
         :return: page count
         """
-        query = f"""
-            SELECT COUNT(DISTINCT {column})
-            FROM {self.dbutil.table_name} 
-            WHERE LENGTH(TRIM({column})) > 2 AND 
-            LOWER(TRIM({column})) like ?
-            ORDER BY {column} ASC
-        """
-        return self.get_count(self.dbutil.run_parameterized_query(query, (ch.lower() + "%",)), page_size)
+        return self.get_source_page_count(KEY_ABC, column, ch, page_size)
 
     def get_page_by_char(self, column, ch, value="", page=None, next=True, page_size=10):
         """ Get values for the page filtered by the first character
@@ -235,16 +483,7 @@ class Selector(object):
 
         :return: list of values
         """
-        query = f"""
-            SELECT DISTINCT {column}
-            FROM {self.dbutil.table_name} 
-            WHERE LENGTH(TRIM({column})) > 2 AND 
-            LOWER(TRIM({column})) like ? AND 
-            {column} {self.get_sign(next)} ?
-            ORDER BY {column} ASC 
-            LIMIT {page_size} {self.get_offset(page, next, page_size)}
-        """
-        return self.get_list(self.dbutil.run_parameterized_query(query, (ch.lower() + "%", value)))
+        return self.get_page_by_value(KEY_ABC, column, ch, value, next, page_size)
 
     def get_page_count_by_pattern(self, column, pattern, page_size):
         """ Get page count filtered by the search pattern
@@ -255,14 +494,7 @@ class Selector(object):
 
         :return: page count
         """
-        query = f"""
-            SELECT COUNT(DISTINCT {column})
-            FROM {self.dbutil.table_name} 
-            WHERE LENGTH(LOWER(TRIM({column}))) > 0 AND 
-            LOWER(TRIM({column})) like ?
-            ORDER BY {column} ASC
-        """
-        return self.get_count(self.dbutil.run_parameterized_query(query, ("%" + pattern.lower() + "%",)), page_size)
+        return self.get_source_page_count(KEY_SEARCH, column, pattern, page_size)
 
     def get_page_by_pattern(self, column, pattern, value="", page=None, next=True, page_size=10):
         """ Get values for the page filtered by the string pattern
@@ -276,16 +508,26 @@ class Selector(object):
 
         :return: list of values
         """
-        query = f"""
-            SELECT DISTINCT {column}
-            FROM {self.dbutil.table_name} 
-            WHERE LENGTH(TRIM({column})) > 2 AND 
-            LOWER(TRIM({column})) like ? AND 
-            {column} {self.get_sign(next)} ?
-            ORDER BY {column} ASC 
-            LIMIT {page_size} {self.get_offset(page, next, page_size)}
+        return self.get_page_by_value(KEY_SEARCH, column, pattern, value, next, page_size)
+
+    def get_page_by_value(self, kind, column, search_str, value, next, page_size):
+        """ Get page of values located after or before the provided value
+
+        :param kind: page kind
+        :param column: topic column name
+        :param search_str: search string, character or selection (if any)
+        :param value: first or last value in the current page, empty - first page
+        :param next: True - next page, False - previous page
+        :param page_size: page size
+
+        :return: list of values
         """
-        return self.get_list(self.dbutil.run_parameterized_query(query, ("%" + pattern + "%", value)))
+        source = self.get_source(kind, column, search_str)
+        if value:
+            values = self.get_seek_values(source[3], value)
+        else:
+            values = None
+        return self.seek(source, values, next, page_size)
 
     def get_topic_detail_page(self, topic, selection, current_page, prev_page, first, last, page_size):
         """ Get topic details
@@ -300,12 +542,7 @@ class Selector(object):
 
         :return: list of items for topic page
         """
-        if current_page == prev_page:
-            return self.get_page_by_column(topic, selection, page_size=page_size)
-        elif current_page > prev_page:
-            return self.get_page_by_column(topic, selection, last, None, next=True, page_size=page_size)
-        elif current_page < prev_page:
-            return self.get_page_by_column(topic, selection, first, current_page, next=False, page_size=page_size)
+        return self.get_page_by_number(KEY_DETAIL, topic, selection, current_page, prev_page, first, last, page_size)
 
     def get_page_count_by_column(self, topic, param, page_size):
         """ Get page count filtered by the column
@@ -316,12 +553,7 @@ class Selector(object):
 
         :return: page count
         """
-        query = f"""
-            SELECT COUNT(DISTINCT folder)
-            FROM {self.dbutil.table_name}
-            WHERE {topic} = ?
-        """
-        return self.get_count(self.dbutil.run_parameterized_query(query, (param,)), page_size)
+        return self.get_source_page_count(KEY_DETAIL, topic, param, page_size)
 
     def get_page_by_column(self, topic, param, value='', page=None, next=True, page_size=10):
         """ Get values for the page filtered by the colum
@@ -335,15 +567,7 @@ class Selector(object):
 
         :return: list of values
         """
-        query = f"""
-            SELECT DISTINCT folder
-            FROM {self.dbutil.table_name}
-            WHERE {topic} = ?
-            AND folder {self.get_sign(next)} ?
-            ORDER BY folder ASC 
-            LIMIT {page_size} {self.get_offset(page, next, page_size)}
-        """
-        return self.get_list(self.dbutil.run_parameterized_query(query, (param, value)), True)
+        return self.get_page_by_value(KEY_DETAIL, topic, param, value, next, page_size)
 
     def get_filename_by_title(self, folder, title):
         """ Get filename by title
@@ -356,11 +580,11 @@ class Selector(object):
         query = f"""
             SELECT DISTINCT filename
             FROM {self.dbutil.table_name}
-            WHERE folder = ?
+            WHERE folder_key = ? AND folder = ?
             AND title = ?
             ORDER BY filename ASC LIMIT 1
         """
-        r = self.get_list(self.dbutil.run_parameterized_query(query, (folder, title)), True)
+        r = self.get_list(self.dbutil.run_parameterized_query(query, (get_key(folder), folder, title)), True)
         if r:
             return r[0]
         else:
@@ -32,6 +32,8 @@ import requests
 from subprocess import Popen, PIPE
 from zipfile import ZipFile
 from ui.component import Component
+from ui.compositor import Compositor
+from event.scheduler import Scheduler
 from ui.state import State
 from util.config import *
 from util.keys import *
@@ -42,6 +44,7 @@ from util.discogsutil import DiscogsUtil
 from util.collector import DbUtil, INFO, METADATA, MP4_METADATA
 from util.bluetoothutil import BluetoothUtil
 from util.imageutil import ImageUtil, EXT_MP4, EXT_M4A
+from util.imageloader import ImageLoader
 from util.switchutil import SwitchUtil
 from util.sambautil import SambaUtil
 from util.yastreamutil import YaStreamUtil
@@ -114,6 +117,7 @@ CURRENT_INDEX = "current index"
 INDEX = "index"
 UTF_8 = "utf-8-sig"
 FOLDER_BUNDLES = "bundles"
+PREFIX_WIDTHS = "prefix.widths"
 
 class Util(object):
     """ Utility class """
@@ -123,6 +127,10 @@ class Util(object):
 
         self.connected_to_internet = False
         self.font_cache = {}
+        self.font_keys = {}
+        self.language_fonts = {}
+        self.text_cache = None
+        self.text_size_cache = None
         self.voice_commands_cache = {}
         self.cd_titles = {}
         self.cd_track_names_cache = {}
@@ -138,6 +146,8 @@ class Util(object):
         self.screen_rect = self.config_class.screen_rect
         self.config[LABELS] = self.get_labels()
         self.pygame_screen = self.config_class.pygame_screen
+        self.scheduler = Scheduler(self.config[SCREEN_INFO][FRAME_RATE])
+        self.compositor = Compositor(self.config[SHOW_DAMAGE], self.scheduler.request_frame)
         self.CURRENT_WORKING_DIRECTORY = os.getcwd()
         self.read_storage()
                 
@@ -145,6 +155,7 @@ class Util(object):
             ssl._create_default_https_context = ssl._create_unverified_context
         self.podcasts_util = None
         self.db_util = None
+        self.db_util_lock = threading.Lock()
         self.bluetooth_util = None
         self.radio_browser = None
         self.default_radio_icon_path = os.path.join(os.getcwd(), FOLDER_ICONS, FILE_DEFAULT_STATION)
@@ -154,6 +165,9 @@ class Util(object):
 
         self.discogs_util = DiscogsUtil(self.k1)
         self.image_util = ImageUtil(self)
+        self.text_cache = self.image_util.memory_cache.get_cache("text")
+        self.text_size_cache = self.image_util.memory_cache.get_cache("text_size")
+        self.image_loader = ImageLoader(listener=self.scheduler.request_frame)
         self.file_util = FileUtil(self)
         if self.config[USE_SWITCH]:
             self.switch_util = SwitchUtil(self)
@@ -322,11 +336,15 @@ class Util(object):
         
         current_language = self.config[CURRENT][LANGUAGE]
         path = os.path.join(os.getcwd(), FOLDER_LANGUAGES, current_language)
-        language_specific_font = None
-        for file in os.listdir(path):
-            if file.lower().endswith(".ttf"):
-                language_specific_font = file
-                break
+        if current_language in self.language_fonts:
+            language_specific_font = self.language_fonts[current_language]
+        else:
+            language_specific_font = None
+            for file in os.listdir(path):
+                if file.lower().endswith(".ttf"):
+                    language_specific_font = file
+                    break
+            self.language_fonts[current_language] = language_specific_font
         
         if language_specific_font:
             key = language_specific_font + str(size)
@@ -341,8 +359,90 @@ class Util(object):
         
         font = pygame.font.Font(filename, size)
         self.font_cache[key] = font
+        self.font_keys[id(font)] = key
         return font
 
+    def get_text_key(self, font, *values):
+        """ Get the key of the rendered text. Only fonts from the font cache have keys
+        because the fonts are never released and their IDs cannot be reused.
+
+        :param font: font
+        :param values: text, color etc.
+
+        :return: key, None - text cannot be cached
+        """
+        font_key = self.font_keys.get(id(font))
+        if font_key == None:
+            return None
+        return (font_key,) + values
+
+    def get_text_size(self, font, text):
+        """ Get the size of the rendered text using cache
+
+        :param font: font
+        :param text: text
+
+        :return: tuple (width, height)
+        """
+        key = self.get_text_key(font, text)
+        if key == None or self.text_size_cache == None:
+            return font.size(text)
+
+        size = self.text_size_cache.get(key)
+        if size == None:
+            size = font.size(text)
+            self.text_size_cache[key] = size
+        return size
+
+    def render_text(self, font, text, color, antialias=True):
+        """ Render text using cache. The same surface is returned for the same text,
+        so the surface should not be modified.
+
+        :param font: font
+        :param text: text
+        :param color: text color
+        :param antialias: True - antialiased text
+
+        :return: surface with rendered text
+        """
+        try:
+            key = self.get_text_key(font, text, tuple(color), bool(antialias))
+        except TypeError:
+            key = None
+
+        if key == None or self.text_cache == None:
+            return font.render(text, antialias, color)
+
+        label = self.text_cache.get(key)
+        if label == None:
+            label = font.render(text, antialias, color)
+            self.text_cache[key] = label
+        return label
+
+    def get_prefix_width(self, font, text, n):
+        """ Get the width of the text prefix. Used for text truncation.
+        The widths of all prefixes of the text are kept in one table which is filled on demand.
+
+        :param font: font
+        :param text: text
+        :param n: number of characters in the prefix
+
+        :return: prefix width
+        """
+        key = self.get_text_key(font, text, PREFIX_WIDTHS)
+        if key == None or self.text_size_cache == None:
+            return font.size(text[0 : n])[0]
+
+        widths = self.text_size_cache.get(key)
+        if widths == None:
+            widths = [None] * (len(text) + 1)
+            self.text_size_cache[key] = widths
+
+        width = widths[n]
+        if width == None:
+            width = widths[n] = font.size(text[0 : n])[0]
+        return width
+
     def get_current_font_name(self):
         """ Return the current font name
 
@@ -1466,15 +1566,17 @@ class Util(object):
         return self.podcasts_util
 
     def get_db_util(self):
-        """ Get DB utility
+        """ Get DB utility. The utility is shared by the UI, web server and collection watcher threads. 
+        Queries run on the pool of read-only connections, updates are serialized by the single writer.
 
         :return: DB utility singleton
         """
-        if not self.db_util:
-            db_file = self.config[COLLECTION][DATABASE_FILE]
-            self.db_util = DbUtil(db_file)
-            if self.db_util.is_db_file_available():
-                self.db_util.connect()
+        with self.db_util_lock:
+            if not self.db_util:
+                db_file = self.config[COLLECTION][DATABASE_FILE]
+                self.db_util = DbUtil(db_file)
+                if self.db_util.is_db_file_available():
+                    self.db_util.connect()
 
         return self.db_util
 